@@ -0,0 +1,61 @@
+"""time_slot weekday_mask
+
+Revision ID: 0f5b8e2d7c14
+Revises: e7a4c0b19d52
+Create Date: 2026-10-17 15:21:09.866310
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = '0f5b8e2d7c14'
+down_revision: Union[str, None] = 'e7a4c0b19d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def weekdays_to_mask(weekdays) -> int:
+    # 마이그레이션은 애플리케이션 코드가 바뀌어도 같은 결과를 내야 하므로 복사해 둔다.
+    mask = 0
+    for weekday in weekdays or []:
+        mask |= 1 << int(weekday)
+    return mask
+
+
+def upgrade() -> None:
+    op.add_column('time_slots', sa.Column('weekday_mask', sa.Integer(), nullable=False, server_default='0'))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text('SELECT id, weekdays FROM time_slots WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE},
+        ).all()
+        if not rows:
+            break
+
+        params = []
+        for time_slot_id, weekdays in rows:
+            if isinstance(weekdays, str):
+                weekdays = json.loads(weekdays)
+            params.append({'id': time_slot_id, 'weekday_mask': weekdays_to_mask(weekdays)})
+
+        conn.execute(sa.text('UPDATE time_slots SET weekday_mask = :weekday_mask WHERE id = :id'), params)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_column('time_slots', 'weekday_mask')
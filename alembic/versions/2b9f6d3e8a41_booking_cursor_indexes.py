@@ -0,0 +1,76 @@
+"""booking cursor indexes
+
+Revision ID: 2b9f6d3e8a41
+Revises: 0f5b8e2d7c14
+Create Date: 2026-10-17 21:52:08.314027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = '2b9f6d3e8a41'
+down_revision: Union[str, None] = '0f5b8e2d7c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CURSOR_COLUMNS = [sa.text('"when" DESC'), sa.text('created_at DESC'), sa.text('id DESC')]
+
+# 커서 페이지네이션: ORDER BY when DESC, created_at DESC, id DESC 를 인덱스 순서대로 읽는다.
+NEW_INDEXES = [
+    ('ix_bookings_guest_id_when_created_at_id', 'bookings', ['guest_id', *CURSOR_COLUMNS]),
+    ('ix_bookings_calendar_id_when_created_at_id', 'bookings', ['calendar_id', *CURSOR_COLUMNS]),
+]
+
+OLD_INDEXES = [
+    ('ix_bookings_guest_id_when_created_at', 'bookings', ['guest_id', sa.text('"when" DESC'), sa.text('created_at DESC')]),
+    ('ix_bookings_calendar_id_when', 'bookings', ['calendar_id', sa.text('"when" DESC')]),
+]
+
+
+def is_postgresql() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def replace_indexes(create: list, drop: list) -> None:
+    # 새 인덱스를 먼저 만들고 예전 인덱스를 지워서, 중간에 인덱스 없이 조회하는 때가 없게 한다.
+    if is_postgresql():
+        # CREATE INDEX CONCURRENTLY 는 트랜잭션 안에서 실행할 수 없다.
+        with op.get_context().autocommit_block():
+            for name, table, columns in create:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+            for name, table, _ in drop:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        return
+
+    for name, table, columns in create:
+        op.create_index(name, table, columns, if_not_exists=True)
+    for name, table, _ in drop:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def normalize_sqlite_created_at() -> None:
+    # 서버 기본값(CURRENT_TIMESTAMP)으로 들어간 'YYYY-MM-DD HH:MM:SS' 를 SQLAlchemy 가 저장하는
+    # 'YYYY-MM-DD HH:MM:SS.ffffff' 형식으로 맞춘다. 커서는 created_at 을 문자열 그대로 비교한다.
+    op.execute(
+        "UPDATE bookings SET created_at = strftime('%Y-%m-%d %H:%M:%f', created_at) || '000' "
+        "WHERE length(created_at) = 19"
+    )
+
+
+def upgrade() -> None:
+    if not is_postgresql():
+        normalize_sqlite_created_at()
+    replace_indexes(NEW_INDEXES, OLD_INDEXES)
+
+
+def downgrade() -> None:
+    replace_indexes(OLD_INDEXES, NEW_INDEXES)
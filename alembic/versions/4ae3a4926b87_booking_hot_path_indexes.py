@@ -0,0 +1,63 @@
+"""booking hot path indexes
+
+Revision ID: 4ae3a4926b87
+Revises: b41f7909ce01
+Create Date: 2026-10-17 10:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = '4ae3a4926b87'
+down_revision: Union[str, None] = 'b41f7909ce01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    # guest_calendar_bookings: WHERE guest_id = ? ORDER BY when DESC, created_at DESC
+    ('ix_bookings_guest_id_when_created_at', 'bookings', ['guest_id', sa.text('"when" DESC'), sa.text('created_at DESC')]),
+    # create_booking 중복 확인: WHERE time_slot_id = ? AND when = ?
+    ('ix_bookings_time_slot_id_when', 'bookings', ['time_slot_id', 'when']),
+    # 호스트의 타임슬롯 조회, 예약의 time_slot.has(calendar_id = ?) 서브쿼리
+    ('ix_time_slots_calendar_id', 'time_slots', ['calendar_id']),
+    # 예약 목록의 첨부파일 selectinload: WHERE booking_id IN (...)
+    ('ix_booking_files_booking_id', 'booking_files', ['booking_id']),
+    # 호스트/사용자 조회: WHERE username = ?
+    ('ix_users_username', 'users', ['username']),
+]
+
+
+def is_postgresql() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    if is_postgresql():
+        # CREATE INDEX CONCURRENTLY 는 트랜잭션 안에서 실행할 수 없다.
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        return
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        return
+
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
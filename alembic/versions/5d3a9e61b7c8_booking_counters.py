@@ -0,0 +1,48 @@
+"""booking counters
+
+Revision ID: 5d3a9e61b7c8
+Revises: 2b9f6d3e8a41
+Create Date: 2026-10-17 16:40:52.214873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3a9e61b7c8'
+down_revision: Union[str, None] = '2b9f6d3e8a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('booking_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('booking_count', sa.Integer(), nullable=False),
+    sa.Column('cancelled_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('scope', 'owner_id', name='uq_booking_counters_scope_owner_id')
+    )
+
+    # 기존 예약으로 집계를 채운다.
+    for scope, owner_column in (('guest', 'guest_id'), ('calendar', 'calendar_id')):
+        op.execute(
+            "INSERT INTO booking_counters (scope, owner_id, booking_count, cancelled_count) "
+            f"SELECT '{scope}', {owner_column}, COUNT(*), "
+            "SUM(CASE WHEN attendance_status = 'cancelled' THEN 1 ELSE 0 END) "
+            f"FROM bookings GROUP BY {owner_column}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('booking_counters')
@@ -0,0 +1,53 @@
+"""google event mirror
+
+Revision ID: 7a2c4f18e9b3
+Revises: 5d3a9e61b7c8
+Create Date: 2026-10-17 17:52:08.431706
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2c4f18e9b3'
+down_revision: Union[str, None] = '5d3a9e61b7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('google_event_mirror',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('google_calendar_id', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=False),
+    sa.Column('event_id', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=False),
+    sa.Column('start', sa.JSON().with_variant(postgresql.JSONB(astext_type=Text()), 'postgresql'), nullable=False),
+    sa.Column('end', sa.JSON().with_variant(postgresql.JSONB(astext_type=Text()), 'postgresql'), nullable=False),
+    sa.Column('start_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+    sa.Column('end_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('google_calendar_id', 'event_id', name='uq_google_event_mirror_calendar_event')
+    )
+    op.create_index('ix_google_event_mirror_calendar_start_at', 'google_event_mirror', ['google_calendar_id', 'start_at'], unique=False)
+    op.create_table('google_calendar_sync_states',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('google_calendar_id', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=False),
+    sa.Column('sync_token', sa.Text(), nullable=True),
+    sa.Column('synced_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('google_calendar_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('google_calendar_sync_states')
+    op.drop_index('ix_google_event_mirror_calendar_start_at', table_name='google_event_mirror')
+    op.drop_table('google_event_mirror')
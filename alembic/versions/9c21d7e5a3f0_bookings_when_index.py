@@ -0,0 +1,41 @@
+"""bookings when index
+
+Revision ID: 9c21d7e5a3f0
+Revises: 4ae3a4926b87
+Create Date: 2026-10-17 11:02:17.503918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = '9c21d7e5a3f0'
+down_revision: Union[str, None] = '4ae3a4926b87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 월 단위 예약 조회: WHERE when >= :start AND when < :end
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index('ix_bookings_when', 'bookings', ['when'], postgresql_concurrently=True, if_not_exists=True)
+        return
+
+    op.create_index('ix_bookings_when', 'bookings', ['when'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_bookings_when', table_name='bookings', postgresql_concurrently=True, if_exists=True)
+        return
+
+    op.drop_index('ix_bookings_when', table_name='bookings', if_exists=True)
@@ -0,0 +1,42 @@
+"""google calendar channels
+
+Revision ID: c3e81d5a0f47
+Revises: 7a2c4f18e9b3
+Create Date: 2026-10-17 18:34:51.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e81d5a0f47'
+down_revision: Union[str, None] = '7a2c4f18e9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('google_calendar_channels',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('google_calendar_id', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=False),
+    sa.Column('channel_id', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('resource_id', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=False),
+    sa.Column('token', sqlmodel.sql.sqltypes.AutoString(length=128), nullable=False),
+    sa.Column('expires_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('channel_id')
+    )
+    op.create_index(op.f('ix_google_calendar_channels_google_calendar_id'), 'google_calendar_channels', ['google_calendar_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_google_calendar_channels_google_calendar_id'), table_name='google_calendar_channels')
+    op.drop_table('google_calendar_channels')
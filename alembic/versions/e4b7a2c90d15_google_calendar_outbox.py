@@ -0,0 +1,48 @@
+"""google calendar outbox
+
+Revision ID: e4b7a2c90d15
+Revises: c3e81d5a0f47
+Create Date: 2026-10-17 19:12:40.518237
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a2c90d15'
+down_revision: Union[str, None] = 'c3e81d5a0f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('google_calendar_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('google_calendar_id', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=False),
+    sa.Column('event_id', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=True),
+    sa.Column('dates', sa.JSON().with_variant(postgresql.JSONB(astext_type=Text()), 'postgresql'), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sqlalchemy_utc.sqltypes.UtcDateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_google_calendar_outbox_booking_id'), 'google_calendar_outbox', ['booking_id'], unique=False)
+    op.create_index('ix_google_calendar_outbox_status_available_at', 'google_calendar_outbox', ['status', 'available_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_google_calendar_outbox_status_available_at', table_name='google_calendar_outbox')
+    op.drop_index(op.f('ix_google_calendar_outbox_booking_id'), table_name='google_calendar_outbox')
+    op.drop_table('google_calendar_outbox')
@@ -0,0 +1,87 @@
+"""booking calendar_id
+
+Revision ID: e7a4c0b19d52
+Revises: 9c21d7e5a3f0
+Create Date: 2026-10-17 13:40:51.270114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+import sqlalchemy_utc
+import sqlmodel.sql.sqltypes
+from sqlmodel import Text
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4c0b19d52'
+down_revision: Union[str, None] = '9c21d7e5a3f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def is_postgresql() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def backfill_calendar_id() -> None:
+    """id 순으로 나눠서 time_slots.calendar_id 를 복사한다. 한 번에 잠그는 행 수를 제한한다."""
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        ids = conn.execute(
+            sa.text('SELECT id FROM bookings WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE},
+        ).scalars().all()
+        if not ids:
+            break
+
+        conn.execute(
+            sa.text(
+                'UPDATE bookings SET calendar_id = ('
+                '    SELECT time_slots.calendar_id FROM time_slots WHERE time_slots.id = bookings.time_slot_id'
+                ') '
+                'WHERE id >= :first_id AND id <= :last_id AND calendar_id IS NULL'
+            ),
+            {'first_id': ids[0], 'last_id': ids[-1]},
+        )
+        last_id = ids[-1]
+
+
+def upgrade() -> None:
+    op.add_column('bookings', sa.Column('calendar_id', sa.Integer(), nullable=True))
+
+    if is_postgresql():
+        # 묶음마다 바로 커밋해서 긴 트랜잭션 없이 채운다.
+        with op.get_context().autocommit_block():
+            backfill_calendar_id()
+    else:
+        backfill_calendar_id()
+
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.alter_column('calendar_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_bookings_calendar_id_calendars', 'calendars', ['calendar_id'], ['id'])
+
+    if is_postgresql():
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_bookings_calendar_id_when',
+                'bookings',
+                ['calendar_id', sa.text('"when" DESC')],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index('ix_bookings_calendar_id_when', 'bookings', ['calendar_id', sa.text('"when" DESC')], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_calendar_id_when', table_name='bookings', if_exists=True)
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_constraint('fk_bookings_calendar_id_calendars', type_='foreignkey')
+        batch_op.drop_column('calendar_id')
@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 
 import sentry_sdk
 from fastapi import FastAPI
@@ -11,10 +12,32 @@ from sentry_sdk.integrations.fastapi import FastApiIntegration
 
 from appserver.apps.account.endpoints import router as account_router
 from appserver.apps.calendar.endpoints import router as calendar_router
+from appserver.apps.calendar.booking_events import booking_event_bus
+from appserver.apps.calendar.outbox import create_outbox_worker
 from appserver.admin import include_admin_views, AdminAuthentication
-from .db import engine
+from appserver.libs.google.calendar.registry import google_calendar_services
+from .db import engine, ReadYourWritesMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Google Calendar 인증/discovery 클라이언트는 워커마다 한 번만 만든다.
+    google_calendar_services.warm_up()
+    # 예약과 함께 기록한 구글 캘린더 작업을 처리한다. 워커를 따로 띄우면 0 으로 끈다.
+    outbox_worker = None
+    if os.getenv("GOOGLE_CALENDAR_OUTBOX_WORKER", "1") != "0":
+        outbox_worker = create_outbox_worker()
+        outbox_worker.start()
+    # 예약 변경 알림. postgres 백엔드는 여기서 LISTEN 연결을 연다.
+    await booking_event_bus.start()
+    yield
+    await booking_event_bus.stop()
+    if outbox_worker is not None:
+        await outbox_worker.stop()
+    google_calendar_services.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 def include_routers(_app: FastAPI):
     _app.include_router(account_router)
@@ -32,6 +55,7 @@ def init_middleware(_app: FastAPI):
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    _app.add_middleware(ReadYourWritesMiddleware)
 
 
 def init_sentry(dsn: str | None = None):
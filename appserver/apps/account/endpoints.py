@@ -4,7 +4,9 @@ from sqlmodel import select, func, update, delete, true
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta, timezone
 
-from appserver.db import DbSessionDep
+from appserver.apps.calendar.counters import delete_bookings
+from appserver.apps.calendar.models import Booking
+from appserver.db import DbSessionDep, ReadDbSessionDep
 from .models import User
 from .exceptions import DuplicatedUsernameError, DuplicatedEmailError, PasswordMismatchError, UserNotFoundError
 from .schemas import LoginPayload, SignupPayload, UpdateUserPayload, UserDetailOut, UserOut
@@ -120,6 +122,8 @@ async def logout(user: CurrentUserDep) -> JSONResponse:
 
 @router.delete("/unregister", status_code=status.HTTP_204_NO_CONTENT)
 async def unregister(user: CurrentUserDep, session: DbSessionDep) -> None:
+    # 게스트로 한 예약도 함께 지운다. 예약 수 집계도 같은 트랜잭션에서 맞춘다.
+    await delete_bookings(session, Booking.guest_id == user.id)
     stmt = delete(User).where(User.username == user.username)
     await session.execute(stmt)
     await session.commit()
@@ -133,7 +137,7 @@ async def unregister(user: CurrentUserDep, session: DbSessionDep) -> None:
 )
 async def get_hosts(
     user: CurrentUserDep,
-    session: DbSessionDep,
+    session: ReadDbSessionDep,
 ) -> list[User]:
     stmt = select(User).where(User.is_active.is_(true())).where(User.is_host.is_(true()))
     result = await session.execute(stmt)
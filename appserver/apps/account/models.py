@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from pydantic import AwareDatetime, EmailStr
 from sqlmodel import SQLModel, Field, Relationship, func, String
 from sqlmodel.main import SQLModelConfig
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy_utc import UtcDateTime
 
@@ -18,6 +18,7 @@ class User(SQLModel, table=True):
     __tablename__ = "users"
     __table_args__ = (
         UniqueConstraint("email", name="uq_email"),
+        Index("ix_users_username", "username"),
     )
 
     id: int = Field(default=None, primary_key=True)
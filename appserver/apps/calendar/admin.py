@@ -10,7 +10,10 @@ from sqlalchemy.sql.expression import Select, select
 
 from appserver.libs.query import exact_match_list_json
 
+from fastapi import Request
+
 from appserver.db import engine
+from .loaders import with_booking_profile
 from .models import Booking, BookingFile, Calendar, TimeSlot
 
 
@@ -165,6 +168,12 @@ class BookingAdmin(ModelView, model=Booking):
         },
     }
 
+    def list_query(self, request: Request) -> Select:
+        return with_booking_profile(super().list_query(request), "admin")
+
+    def details_query(self, request: Request) -> Select:
+        return with_booking_profile(super().details_query(request), "admin")
+
 
 def file_formatter(booking_file: BookingFile, *args, **kwargs) -> Markup:
     file = booking_file.file
@@ -0,0 +1,231 @@
+"""예약 변경 알림 버스.
+
+예약을 바꾸는 엔드포인트가 커밋한 뒤 `publish_booking_event` 로 알리고, 호스트의 SSE 연결
+(`GET /booking-events`)이 구독해서 받는다. 호스트 대시보드가 `/bookings` 를 주기적으로 다시
+읽지 않아도 된다.
+
+- memory: 프로세스 안에서만 전달한다. 워커가 하나일 때 쓴다.
+- postgres: PostgreSQL LISTEN/NOTIFY 로 모든 워커의 구독자에게 전달한다.
+
+`BOOKING_EVENT_BUS` 환경 변수로 고른다. 알림은 저장하지 않으므로 연결이 끊긴 동안의 변경은
+다시 연결한 뒤 목록을 한 번 읽어 맞춘다.
+
+아웃박스 워커가 구글 캘린더에 반영하면 `google_synced` 를 보내고, 알림을 받은 워커는 그 캘린더의
+일정 캐시를 지운다. 워커가 여럿이거나 아웃박스 워커를 따로 띄우면 postgres 백엔드를 써야 모든
+워커의 캐시가 지워진다.
+"""
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from appserver.libs.google.calendar.cache import google_events_cache
+
+from .enums import BookingEventType
+from .models import Booking
+
+# 구독자마다 쌓아 두는 최대 알림 수. 넘치면 오래된 알림부터 버린다.
+MAX_QUEUE_SIZE = 100
+POSTGRES_CHANNEL = "booking_events"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BookingEvent:
+    """
+    >>> event = BookingEvent(type="created", booking_id=1, host_id=2, when="2024-12-03")
+    >>> event.to_json()
+    '{"type": "created", "booking_id": 1, "host_id": 2, "when": "2024-12-03", "google_calendar_id": null}'
+    >>> BookingEvent.from_json(event.to_json()) == event
+    True
+    """
+
+    type: str
+    booking_id: int
+    host_id: int
+    when: str
+    # google_synced 에만 있다. 받은 워커가 이 캘린더의 일정 캐시를 지운다.
+    google_calendar_id: str | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "BookingEvent":
+        return cls(**json.loads(payload))
+
+
+class BookingEventBus:
+    """알림 버스의 공통 부분. 이 워커에 도착한 알림을 호스트별 구독자와 리스너에게 나눠 준다.
+
+    백엔드는 `publish` 로 보낸 알림이 각 워커의 `deliver` 에 도착하게 한다.
+    """
+
+    def __init__(self, max_queue_size: int = MAX_QUEUE_SIZE):
+        self.max_queue_size = max_queue_size
+        self._subscribers: dict[int, set[asyncio.Queue[BookingEvent]]] = {}
+        self._listeners: list[Callable[[BookingEvent], None]] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, event: BookingEvent) -> None:
+        raise NotImplementedError
+
+    def add_listener(self, listener: Callable[[BookingEvent], None]) -> None:
+        """구독자와 상관없이 이 워커에 도착하는 모든 알림을 받는다."""
+        self._listeners.append(listener)
+
+    def deliver(self, event: BookingEvent) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("booking event listener failed: %s", event.type)
+        for queue in self._subscribers.get(event.host_id, ()):
+            if queue.full():
+                # 느린 구독자 때문에 다른 구독자가 막히지 않도록 오래된 알림을 버린다.
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def subscriber_count(self, host_id: int) -> int:
+        return len(self._subscribers.get(host_id, ()))
+
+    @asynccontextmanager
+    async def subscribe(self, host_id: int) -> AsyncIterator[asyncio.Queue[BookingEvent]]:
+        queue: asyncio.Queue[BookingEvent] = asyncio.Queue(self.max_queue_size)
+        self._subscribers.setdefault(host_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers[host_id]
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[host_id]
+
+
+class InMemoryBookingEventBus(BookingEventBus):
+    """같은 프로세스의 구독자에게 호스트별로 알림을 나눠 준다."""
+
+    async def publish(self, event: BookingEvent) -> None:
+        self.deliver(event)
+
+
+class PostgresBookingEventBus(BookingEventBus):
+    """NOTIFY 로 알리고, 워커마다 연결 하나로 LISTEN 해서 자기 구독자에게 나눠 준다.
+
+    asyncpg 드라이버(`postgresql+asyncpg://`)가 필요하다. LISTEN 연결이 끊기면
+    `reconnect_delay` 초 뒤 다시 연결한다.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str = POSTGRES_CHANNEL,
+        reconnect_delay: float = 5.0,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+    ):
+        super().__init__(max_queue_size)
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def publish(self, event: BookingEvent) -> None:
+        # 자기 워커의 구독자도 LISTEN 으로 받으므로 여기서 직접 전달하지 않는다.
+        async with self.engine.connect() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": event.to_json()},
+            )
+            await conn.commit()
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.deliver(BookingEvent.from_json(payload))
+        except (TypeError, ValueError):
+            logger.exception("booking event ignored: %s", payload)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    raw_connection = await conn.get_raw_connection()
+                    listener = raw_connection.driver_connection
+                    await listener.add_listener(self.channel, self._on_notification)
+                    try:
+                        while not listener.is_closed():
+                            await asyncio.sleep(self.reconnect_delay)
+                    finally:
+                        if not listener.is_closed():
+                            await listener.remove_listener(self.channel, self._on_notification)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("booking event listener connection failed")
+            await asyncio.sleep(self.reconnect_delay)
+
+
+async def publish_booking_event(
+    bus: BookingEventBus,
+    event_type: BookingEventType,
+    booking: Booking,
+    host_id: int,
+    google_calendar_id: str | None = None,
+) -> None:
+    """커밋한 뒤 호출한다. 알림을 보내지 못해도 예약 변경은 이미 끝났으므로 요청을 실패시키지 않는다."""
+    event = BookingEvent(
+        type=event_type.value,
+        booking_id=booking.id,
+        host_id=host_id,
+        when=booking.when.isoformat(),
+        google_calendar_id=google_calendar_id,
+    )
+    try:
+        await bus.publish(event)
+    except Exception:
+        logger.exception("booking event publish failed: %s", event.type)
+
+
+def create_booking_event_bus() -> BookingEventBus:
+    backend = os.getenv("BOOKING_EVENT_BUS", "memory")
+    if backend == "postgres":
+        from appserver.db import engine
+
+        return PostgresBookingEventBus(engine)
+    if backend != "memory":
+        raise ValueError(f"unknown BOOKING_EVENT_BUS: {backend}")
+    return InMemoryBookingEventBus()
+
+
+def invalidate_google_events(event: BookingEvent) -> None:
+    if event.type == BookingEventType.GOOGLE_SYNCED and event.google_calendar_id is not None:
+        google_events_cache.invalidate(event.google_calendar_id)
+
+
+booking_event_bus = create_booking_event_bus()
+booking_event_bus.add_listener(invalidate_google_events)
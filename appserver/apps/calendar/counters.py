@@ -0,0 +1,186 @@
+"""게스트/캘린더별 예약 수 집계.
+
+예약을 만들거나 취소하는 트랜잭션 안에서 `update_booking_counters` 로 함께 갱신하고,
+어긋난 값은 `reconcile_booking_counters` 로 실제 예약에서 다시 계산한다. ORM 으로 지운 예약은
+`models.decrement_booking_counters` 가, 한꺼번에 지우는 예약은 `delete_bookings` 가 집계에서 뺀다.
+
+    python -m appserver.apps.calendar.counters
+"""
+import asyncio
+
+from sqlalchemy import ColumnElement, case, delete, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from appserver.libs.query import upsert_insert
+
+from .enums import AttendanceStatus, BookingCounterScope
+from .models import Booking, BookingCounter, BookingFile, booking_counter_decrement
+
+
+def _owner_column(scope: BookingCounterScope):
+    if scope == BookingCounterScope.GUEST:
+        return Booking.guest_id
+    return Booking.calendar_id
+
+
+def _cancelled_count() -> ColumnElement[int]:
+    return func.coalesce(
+        func.sum(case((Booking.attendance_status == AttendanceStatus.CANCELLED.value, 1), else_=0)),
+        0,
+    )
+
+
+def booking_count_subquery(scope: BookingCounterScope, owner_id: int):
+    """목록 조회 쿼리에 붙일 예약 수 스칼라 서브쿼리. 집계 행이 없으면 NULL."""
+    return (
+        select(BookingCounter.booking_count)
+        .where(BookingCounter.scope == scope.value)
+        .where(BookingCounter.owner_id == owner_id)
+        .scalar_subquery()
+    )
+
+
+async def count_bookings(session: AsyncSession, scope: BookingCounterScope, owner_id: int) -> int:
+    stmt = select(func.count()).select_from(Booking).where(_owner_column(scope) == owner_id)
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none() or 0
+
+
+async def _upsert_counter(
+    session: AsyncSession,
+    scope: BookingCounterScope,
+    owner_id: int,
+    booking_delta: int,
+    cancelled_delta: int,
+) -> None:
+    owner_column = _owner_column(scope)
+    insert_stmt = upsert_insert(session, BookingCounter).values(
+        scope=scope.value,
+        owner_id=owner_id,
+        # 집계 행이 아직 없으면 (방금 flush 한 변경을 포함한) 실제 예약 수로 시작한다.
+        booking_count=(
+            select(func.count()).select_from(Booking).where(owner_column == owner_id).scalar_subquery()
+        ),
+        cancelled_count=(
+            select(_cancelled_count()).select_from(Booking).where(owner_column == owner_id).scalar_subquery()
+        ),
+    )
+    stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[BookingCounter.scope, BookingCounter.owner_id],
+        set_={
+            "booking_count": BookingCounter.booking_count + literal(booking_delta),
+            "cancelled_count": BookingCounter.cancelled_count + literal(cancelled_delta),
+            "updated_at": func.now(),
+        },
+    )
+    await session.execute(stmt)
+
+
+async def update_booking_counters(
+    session: AsyncSession,
+    *,
+    guest_id: int,
+    calendar_id: int,
+    booking_delta: int = 0,
+    cancelled_delta: int = 0,
+) -> None:
+    """예약 변경과 같은 트랜잭션에서 호출한다. 커밋은 호출한 쪽에서 한다."""
+    if not booking_delta and not cancelled_delta:
+        return
+
+    await session.flush()
+    await _upsert_counter(session, BookingCounterScope.GUEST, guest_id, booking_delta, cancelled_delta)
+    await _upsert_counter(session, BookingCounterScope.CALENDAR, calendar_id, booking_delta, cancelled_delta)
+
+
+async def delete_bookings(session: AsyncSession, *criteria: ColumnElement[bool]) -> int:
+    """조건에 맞는 예약을 첨부파일과 함께 지우고 집계에서 뺀다. 지운 예약 수를 반환한다.
+
+    커밋은 호출한 쪽에서 한다.
+    """
+    for scope in BookingCounterScope:
+        owner_column = _owner_column(scope)
+        stmt = (
+            select(owner_column, func.count(), _cancelled_count())
+            .select_from(Booking)
+            .where(*criteria)
+            .group_by(owner_column)
+        )
+        result = await session.execute(stmt)
+        for owner_id, booking_count, cancelled_count in result.all():
+            await session.execute(booking_counter_decrement(scope, owner_id, booking_count, cancelled_count))
+
+    booking_ids = select(Booking.id).where(*criteria)
+    await session.execute(delete(BookingFile).where(BookingFile.booking_id.in_(booking_ids)))
+    result = await session.execute(delete(Booking).where(*criteria))
+    return result.rowcount
+
+
+def cancelled_delta(before: AttendanceStatus | str, after: AttendanceStatus | str) -> int:
+    """
+    참석 상태 변경에 따른 취소 예약 수 변화량
+
+    >>> cancelled_delta(AttendanceStatus.SCHEDULED, AttendanceStatus.CANCELLED)
+    1
+    >>> cancelled_delta("cancelled", AttendanceStatus.ATTENDED)
+    -1
+    >>> cancelled_delta(AttendanceStatus.CANCELLED, "cancelled")
+    0
+    """
+    was_cancelled = before == AttendanceStatus.CANCELLED.value
+    is_cancelled = after == AttendanceStatus.CANCELLED.value
+    return int(is_cancelled) - int(was_cancelled)
+
+
+async def reconcile_booking_counters(session: AsyncSession) -> int:
+    """실제 예약에서 집계를 다시 계산해 덮어쓴다. 갱신한 집계 행 수를 반환한다."""
+    updated = 0
+    for scope in BookingCounterScope:
+        owner_column = _owner_column(scope)
+        stmt = (
+            select(owner_column, func.count(), _cancelled_count())
+            .select_from(Booking)
+            .group_by(owner_column)
+        )
+        result = await session.execute(stmt)
+        counts = {owner_id: (booking_count, cancelled_count) for owner_id, booking_count, cancelled_count in result.all()}
+
+        # 예약이 모두 사라진 집계 행은 0 으로 맞춘다.
+        stmt = select(BookingCounter.owner_id).where(BookingCounter.scope == scope.value)
+        result = await session.execute(stmt)
+        for owner_id in result.scalars().all():
+            counts.setdefault(owner_id, (0, 0))
+
+        for owner_id, (booking_count, cancelled_count) in counts.items():
+            insert_stmt = upsert_insert(session, BookingCounter).values(
+                scope=scope.value,
+                owner_id=owner_id,
+                booking_count=booking_count,
+                cancelled_count=cancelled_count,
+            )
+            stmt = insert_stmt.on_conflict_do_update(
+                index_elements=[BookingCounter.scope, BookingCounter.owner_id],
+                set_={
+                    "booking_count": insert_stmt.excluded.booking_count,
+                    "cancelled_count": insert_stmt.excluded.cancelled_count,
+                    "updated_at": func.now(),
+                },
+            )
+            await session.execute(stmt)
+            updated += 1
+
+    await session.commit()
+    return updated
+
+
+async def main() -> None:
+    from appserver.db import async_session_factory
+
+    async with async_session_factory() as session:
+        updated = await reconcile_booking_counters(session)
+    print(f"reconciled {updated} booking counters")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,5 +5,14 @@ from fastapi import Depends
 
 from appserver.libs.datetime.datetime import utcnow
 
+from .booking_events import BookingEventBus, booking_event_bus
+
 
 UtcNow = Annotated[datetime, Depends(utcnow)]
+
+
+def get_booking_event_bus() -> BookingEventBus:
+    return booking_event_bus
+
+
+BookingEventBusDep = Annotated[BookingEventBus, Depends(get_booking_event_bus)]
@@ -1,36 +1,55 @@
 import asyncio
-import calendar
-from typing import Annotated
-from datetime import datetime, timezone
-from fastapi import APIRouter, BackgroundTasks, File, UploadFile, status, Query, HTTPException
+import os
+from typing import Annotated, AsyncIterator
+from datetime import date, datetime, time, timezone
+from fastapi import APIRouter, BackgroundTasks, File, Header, Request, Response, UploadFile, status, Query, HTTPException
 from fastapi.responses import StreamingResponse
-from sqlmodel import select, and_, func, true, extract
+from sqlmodel import select, and_, func, true
+from sqlmodel.sql.expression import SelectOfScalar
+from sqlalchemy import Row, Select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from appserver.apps.account.models import User
 from appserver.apps.account.deps import CurrentUserDep, CurrentUserOptionalDep
-from appserver.db import DbSessionDep
+from appserver.db import DbSessionDep, ReadDbSessionDep, SessionFactoryDep
+from appserver.libs.datetime.calendar import get_month_range, weekdays_to_mask
+from appserver.libs.google.calendar.cache import google_events_cache
 from appserver.libs.google.calendar.deps import GoogleCalendarServiceDep
-
-from .enums import AttendanceStatus
+from appserver.libs.google.calendar.registry import google_calendar_services
+from appserver.libs.google.calendar.resilience import GoogleCalendarUnavailableError
+from appserver.libs.google.calendar.services import GoogleCalendarService
+from appserver.libs.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_gauges
+from appserver.libs.pagination import decode_cursor, encode_cursor, keyset_before, keyset_order_by
+from appserver.libs.sse import HEARTBEAT, SSE_HEADERS, format_event, parse_last_event_id
+
+from . import google_channels
+from .counters import booking_count_subquery, cancelled_delta, count_bookings, update_booking_counters
+from .booking_events import publish_booking_event
+from .enums import AttendanceStatus, BookingCounterScope, BookingEventType, OutboxAction
 from .exceptions import (
     BookingAlreadyExistsError,
     CalendarAlreadyExistsError,
     CalendarNotFoundError,
+    GoogleChannelNotFoundError,
     GuestPermissionError,
     HostNotFoundError,
+    InvalidCursorError,
     PastBookingError,
     SelfBookingError,
     TimeSlotNotFoundError,
     TimeSlotOverlapError,
 )
 
-from .deps import UtcNow
+from .deps import BookingEventBusDep, UtcNow
+from .google_events import convert_google_events
+from .google_sync import list_mirrored_events
+from .loaders import stream_bookings, with_booking_profile
 from .models import Booking, BookingFile, Calendar, TimeSlot
+from .outbox import enqueue_google_event, outbox_stats
 from .schemas import (
     BookingCreateIn,
+    BookingListOut,
     BookingOut,
     CalendarCreateIn,
     CalendarDetailOut,
@@ -41,6 +60,7 @@ from .schemas import (
     HostBookingStatusUpdateIn,
     HostBookingUpdateIn,
     PaginatedBookingOut,
+    PartialBookingsOut,
     SimpleBookingOut,
     TimeSlotCreateIn,
     TimeSlotOut,
@@ -49,15 +69,111 @@ from .schemas import (
 
 router = APIRouter()
 
+# 구글 캘린더 일정을 기다리는 최대 시간(초). 넘으면 예약만 응답한다.
+GOOGLE_EVENTS_DEADLINE = float(os.getenv("GOOGLE_EVENTS_DEADLINE", "3"))
+# 구글 캘린더 일정이 빠진 응답에 붙이는 헤더
+PARTIAL_BOOKINGS_HEADER = "X-Bookings-Partial"
+
+# 구글 캘린더 일정을 기다리는 동안 SSE 연결을 유지하려고 keep-alive 를 보내는 간격(초)
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+# 연결이 끊겼을 때 EventSource 가 다시 연결하기까지 기다리는 시간(밀리초)
+SSE_RETRY_MS = 3000
+
+_event_page_producers: set[asyncio.Task] = set()
+
 def check_overlap_sqlite(existing_weekdays: list[int], new_weekdays: list[int]) -> bool:
     return any(day in existing_weekdays for day in new_weekdays)
 
 
+BOOKING_CURSOR_COLUMNS = (Booking.when, Booking.created_at, Booking.id)
+
+
+def bookings_after_cursor_stmt(stmt: Select, cursor: str, page_size: int) -> Select:
+    """(when, created_at, id) 역순 keyset 페이지네이션. OFFSET 없이 커서 다음 행부터 읽는다.
+
+    한 행을 더 읽어서 다음 페이지가 있는지 확인한다.
+    """
+    if cursor:
+        try:
+            when, created_at, booking_id = decode_cursor(cursor)
+            values = (date.fromisoformat(when), datetime.fromisoformat(created_at), int(booking_id))
+        except (TypeError, ValueError) as exc:
+            raise InvalidCursorError() from exc
+        stmt = stmt.where(keyset_before(BOOKING_CURSOR_COLUMNS, values))
+
+    return stmt.order_by(*keyset_order_by(BOOKING_CURSOR_COLUMNS)).limit(page_size + 1)
+
+
+async def fetch_bookings_after_cursor(
+    session: AsyncSession,
+    stmt: Select,
+    cursor: str,
+    page_size: int,
+) -> tuple[list[Row], str | None]:
+    """`stmt` 의 첫 번째 컬럼은 `Booking` 이어야 하고, 나머지 컬럼은 행에 그대로 담겨 돌아온다."""
+    stmt = bookings_after_cursor_stmt(stmt, cursor, page_size)
+    result = await session.execute(stmt)
+    rows = list(result.unique().all())
+
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1][0]
+    return rows, encode_cursor(last.when, last.created_at, last.id)
+
+
+def host_month_bookings_stmt(calendar_id: int, year: int, month: int) -> SelectOfScalar[Booking]:
+    # extract('year'/'month', when) 는 인덱스를 쓰지 못하므로 반열린 날짜 구간으로 거른다.
+    start, end = get_month_range(year, month)
+    return (
+        select(Booking)
+        .where(Booking.calendar_id == calendar_id)
+        .where(Booking.when >= start)
+        .where(Booking.when < end)
+        .order_by(Booking.when.desc())
+    )
+
+
+async def list_month_events(
+    service: GoogleCalendarService,
+    google_calendar_id: str,
+    year: int,
+    month: int,
+    session: AsyncSession | None = None,
+) -> list[dict]:
+    """호스트 구글 캘린더의 월 단위 일정.
+
+    `session` 을 주면 `google_sync` 가 채운 미러에서 먼저 읽는다. 아직 동기화하지 않은
+    캘린더는 Google 에서 읽고, 예약이 바뀌면 `google_events_cache` 에서 무효화한다.
+    `GOOGLE_EVENTS_DEADLINE` 초 안에 읽지 못하면 `GoogleCalendarUnavailableError` 를 일으킨다.
+    """
+    if session is not None:
+        events = await list_mirrored_events(session, google_calendar_id, year, month)
+        if events is not None:
+            return events
+
+    start, end = get_month_range(year, month)
+    fetch = google_events_cache.get_or_fetch(
+        (google_calendar_id, year, month),
+        lambda: service.event_list(
+            time_min=datetime.combine(start, time.min).astimezone(timezone.utc),
+            time_max=datetime.combine(end, time.min).astimezone(timezone.utc),
+            google_calendar_id=google_calendar_id,
+        ),
+    )
+    # 기다리지 않더라도 읽던 결과는 캐시에 남도록 shield 로 감싼다.
+    try:
+        return await asyncio.wait_for(asyncio.shield(fetch), GOOGLE_EVENTS_DEADLINE)
+    except TimeoutError as exc:
+        raise GoogleCalendarUnavailableError("Google Calendar event list deadline exceeded") from exc
+
+
 @router.get("/calendar/{host_username}", status_code=status.HTTP_200_OK)
 async def host_calendar_detail(
     host_username: str,
     user: CurrentUserOptionalDep,
-    session: DbSessionDep
+    session: ReadDbSessionDep
 ) -> CalendarOut | CalendarDetailOut:
     stmt = select(User).where(User.username == host_username)
     result = await session.execute(stmt)
@@ -77,10 +193,111 @@ async def host_calendar_detail(
     return CalendarOut.model_validate(calendar)
 
 
+async def month_events_or_none(
+    service: GoogleCalendarService,
+    google_calendar_id: str,
+    year: int,
+    month: int,
+) -> list[dict] | None:
+    """Google 에서 읽은 월 단위 일정. 기한 안에 읽지 못했거나 장애 중이면 None."""
+    try:
+        return await list_month_events(service, google_calendar_id, year, month)
+    except GoogleCalendarUnavailableError:
+        return None
+
+
+async def start_month_events(
+    session: AsyncSession,
+    service: GoogleCalendarService,
+    google_calendar_id: str,
+    year: int,
+    month: int,
+) -> asyncio.Future[list[dict] | None]:
+    """호스트 구글 캘린더 일정을 읽기 시작한다. 예약을 조회하는 동안 기다렸다가 합친다.
+
+    미러가 있으면 세션으로 바로 읽고, 없으면 Google 호출을 태스크로 띄워 DB 조회와 동시에 진행한다.
+    세션은 동시에 쓸 수 없으므로 Google 호출에는 세션을 넘기지 않는다.
+    """
+    events = await list_mirrored_events(session, google_calendar_id, year, month)
+    if events is not None:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(events)
+        return future
+    return asyncio.create_task(month_events_or_none(service, google_calendar_id, year, month))
+
+
+def start_month_event_pages(
+    service: GoogleCalendarService,
+    google_calendar_id: str,
+    year: int,
+    month: int,
+) -> AsyncIterator[list[dict]]:
+    """호스트 구글 캘린더의 월 단위 일정을 읽기 시작하고, 페이지가 도착하는 대로 넘겨준다.
+
+    캐시에 있으면 한 페이지로 넘기고, 새로 읽으면 모두 읽은 뒤 캐시에 넣는다. 넘겨받는 쪽이
+    그만 읽어도 읽던 결과는 캐시에 남는다. `GOOGLE_EVENTS_DEADLINE` 초 안에 다 넘기지 못하면
+    `GoogleCalendarUnavailableError` 를 일으킨다.
+    """
+    start, end = get_month_range(year, month)
+    queue: asyncio.Queue[list[dict] | Exception | None] = asyncio.Queue()
+    streamed = False
+
+    async def _fetch() -> list[dict]:
+        nonlocal streamed
+        # 캐시가 오래돼 백그라운드에서 다시 읽을 때도 불리지만, 그때는 이미 캐시 값을 넘겼다.
+        streamed = True
+        events = []
+        async for page in service.event_list(
+            time_min=datetime.combine(start, time.min).astimezone(timezone.utc),
+            time_max=datetime.combine(end, time.min).astimezone(timezone.utc),
+            google_calendar_id=google_calendar_id,
+        ).pages():
+            events.extend(page)
+            queue.put_nowait(page)
+        return events
+
+    async def _produce() -> None:
+        try:
+            events = await google_events_cache.get_or_fetch((google_calendar_id, year, month), _fetch)
+            if not streamed:
+                queue.put_nowait(events)
+        except Exception as exc:
+            queue.put_nowait(exc)
+        queue.put_nowait(None)
+
+    producer = asyncio.create_task(_produce())
+    # 넘겨받는 쪽이 먼저 끝나도 캐시를 채울 때까지 태스크를 붙잡아 둔다.
+    _event_page_producers.add(producer)
+    producer.add_done_callback(_event_page_producers.discard)
+    deadline = asyncio.get_running_loop().time() + GOOGLE_EVENTS_DEADLINE
+
+    async def _pages() -> AsyncIterator[list[dict]]:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+            except TimeoutError as exc:
+                raise GoogleCalendarUnavailableError("Google Calendar event list deadline exceeded") from exc
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    return _pages()
+
+
 @router.get(
     "/calendar/{host_username}/bookings",
     status_code=status.HTTP_200_OK,
-    response_model=list[SimpleBookingOut | GoogleCalendarEventOut],
+    # 본문을 직접 만든 JSON 으로 보내므로 response_model 로 검증하지 않는다. 스키마는 문서에만 싣는다.
+    response_class=Response,
+    responses={
+        status.HTTP_200_OK: {
+            "model": list[SimpleBookingOut | GoogleCalendarEventOut],
+            "content": {"application/json": {}},
+        },
+    },
 )
 async def host_calendar_bookings(
     host_username: str,
@@ -88,7 +305,7 @@ async def host_calendar_bookings(
     year: Annotated[int, Query(ge=2024, le=2025)],
     month: Annotated[int, Query(ge=1, le=12)],
     service: GoogleCalendarServiceDep,
-) -> list[SimpleBookingOut | GoogleCalendarEventOut]:
+) -> Response:
     stmt = select(User).where(User.username == host_username)
     result = await session.execute(stmt)
     host = result.scalar_one_or_none()
@@ -96,26 +313,61 @@ async def host_calendar_bookings(
     if host is None or host.calendar is None:
         raise HostNotFoundError()
 
-    stmt = (
-        select(Booking)
-        .where(Booking.time_slot.has(TimeSlot.calendar_id == host.calendar.id))
-        .where(extract('year', Booking.when) == year)
-        .where(extract('month', Booking.when) == month)
-        .order_by(Booking.when.desc())
-    )
+    # 응답 시간이 두 조회의 합이 아니라 느린 쪽에 맞춰지도록 Google 일정을 먼저 띄운다.
+    pending_events = await start_month_events(session, service, host.calendar.google_calendar_id, year, month)
+    try:
+        stmt = with_booking_profile(host_month_bookings_stmt(host.calendar.id, year, month), "simple")
+        result = await session.execute(stmt)
+        bookings = result.unique().scalars().all()
+    except BaseException:
+        pending_events.cancel()
+        raise
+
+    events = await pending_events
+    headers = {}
+    if events is None:
+        # Google 이 느리거나 장애 중이면 기다리지 않고 예약만 응답한다.
+        headers[PARTIAL_BOOKINGS_HEADER] = "google_calendar"
+        events = []
+
+    # 한 달 치 일정을 모델로 검증/직렬화하지 않도록 JSON 을 바로 만든다. 구글 일정의 모양이
+    # `GoogleCalendarEventOut` 과 같은지는 테스트가 확인한다.
+    items = [SimpleBookingOut.model_validate(booking).model_dump_json() for booking in bookings]
+    items.extend(slot.to_json() for slot in convert_google_events(events))
+    return Response(f"[{','.join(items)}]", media_type="application/json", headers=headers)
+
+
+async def _single_page(events: list[dict]) -> AsyncIterator[list[dict]]:
+    yield events
+
+
+async def open_host_month_bookings(
+    session: AsyncSession,
+    service: GoogleCalendarService,
+    host_username: str,
+    year: int,
+    month: int,
+) -> tuple[SelectOfScalar[Booking], AsyncIterator[list[dict]]]:
+    """스트림 응답용. 호스트의 월 예약 쿼리와 구글 캘린더 일정 페이지를 넘겨줄 이터레이터를 만든다.
+
+    응답을 보내는 동안에는 이 세션을 쓸 수 없으므로 미러는 미리 읽는다. 미러가 없으면
+    예약을 읽고 보내는 동안 Google 일정을 읽는다. 예약은 응답을 보내면서 `stream_bookings` 로 읽는다.
+    """
+    stmt = select(User).where(User.username == host_username)
     result = await session.execute(stmt)
-    bookings = result.unique().scalars().all()
+    host = result.scalar_one_or_none()
 
-    last_day = calendar.monthrange(year, month)[1]
-    events = await service.event_list(
-        time_min=datetime(year, month, 1).astimezone(timezone.utc),
-        time_max=datetime(year, month, last_day).astimezone(timezone.utc),
-        google_calendar_id=host.calendar.google_calendar_id,
-    )
-    for event in events:
-        bookings.append(GoogleCalendarEventOut.model_validate(event))
+    if host is None or host.calendar is None:
+        raise HostNotFoundError()
 
-    return bookings
+    google_calendar_id = host.calendar.google_calendar_id
+    mirrored_events = await list_mirrored_events(session, google_calendar_id, year, month)
+    if mirrored_events is not None:
+        event_pages = _single_page(mirrored_events)
+    else:
+        event_pages = start_month_event_pages(service, google_calendar_id, year, month)
+
+    return host_month_bookings_stmt(host.calendar.id, year, month), event_pages
 
 
 @router.get(
@@ -125,39 +377,25 @@ async def host_calendar_bookings(
 async def host_calendar_bookings_stream(
     host_username: str,
     session: DbSessionDep,
+    session_factory: SessionFactoryDep,
     year: Annotated[int, Query(ge=2024, le=2025)],
     month: Annotated[int, Query(ge=1, le=12)],
     service: GoogleCalendarServiceDep,
 ) -> StreamingResponse:
-    stmt = select(User).where(User.username == host_username)
-    result = await session.execute(stmt)
-    host = result.scalar_one_or_none()
+    bookings_stmt, event_pages = await open_host_month_bookings(session, service, host_username, year, month)
 
-    if host is None or host.calendar is None:
-        raise HostNotFoundError()
-
-    stmt = (
-        select(Booking)
-        .where(Booking.time_slot.has(TimeSlot.calendar_id == host.calendar.id))
-        .where(extract('year', Booking.when) == year)
-        .where(extract('month', Booking.when) == month)
-        .order_by(Booking.when.desc())
-    )
-    result = await session.execute(stmt)
-    bookings = result.unique().scalars().all()
     async def _stream_bookings():
-        for booking in bookings:
-            yield f"{SimpleBookingOut.model_validate(booking).model_dump_json()}\n"
-
-        await asyncio.sleep(3)
-        last_day = calendar.monthrange(year, month)[1]
-        events = await service.event_list(
-            time_min=datetime(year, month, 1).astimezone(timezone.utc),
-            time_max=datetime(year, month, last_day).astimezone(timezone.utc),
-            google_calendar_id=host.calendar.google_calendar_id,
-        )
-        for event in events:
-            yield f"{GoogleCalendarEventOut.model_validate(event).model_dump_json()}\n"
+        async with session_factory() as stream_session:
+            async for bookings in stream_bookings(stream_session, bookings_stmt, "simple"):
+                yield "".join(
+                    f"{SimpleBookingOut.model_validate(booking).model_dump_json()}\n" for booking in bookings
+                )
+
+        try:
+            async for page in event_pages:
+                yield "".join(f"{slot.to_json()}\n" for slot in convert_google_events(page))
+        except GoogleCalendarUnavailableError:
+            yield f"{PartialBookingsOut().model_dump_json()}\n"
 
     return StreamingResponse(
         _stream_bookings(),
@@ -166,6 +404,88 @@ async def host_calendar_bookings_stream(
     )
 
 
+@router.get(
+    "/calendar/{host_username}/bookings/events",
+    status_code=status.HTTP_200_OK,
+)
+async def host_calendar_bookings_events(
+    host_username: str,
+    session: DbSessionDep,
+    session_factory: SessionFactoryDep,
+    year: Annotated[int, Query(ge=2024, le=2025)],
+    month: Annotated[int, Query(ge=1, le=12)],
+    service: GoogleCalendarServiceDep,
+    request: Request,
+    last_event_id: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    """예약과 구글 캘린더 일정을 Server-Sent Events 로 보낸다.
+
+    - 예약을 먼저 보내고, 구글 캘린더 일정은 페이지가 도착하는 대로 보낸다.
+    - 메시지의 id 는 스트림 안의 순번이다. `Last-Event-ID` 로 재연결하면 그 다음부터 보낸다.
+    - 구글 캘린더 일정을 가져오지 못하면 `partial` 이벤트를 보낸다.
+    - 끝나면 `{"type": "complete"}` 메시지를 보낸다.
+    - 기다리는 동안 `SSE_HEARTBEAT_INTERVAL` 초마다 keep-alive 주석을 보내고, 클라이언트가 끊었으면 멈춘다.
+    """
+    bookings_stmt, event_pages = await open_host_month_bookings(session, service, host_username, year, month)
+    resume_after = parse_last_event_id(last_event_id)
+
+    async def _stream_events():
+        position = 0
+        yield format_event(retry=SSE_RETRY_MS)
+
+        async with session_factory() as stream_session:
+            async for bookings in stream_bookings(stream_session, bookings_stmt, "simple"):
+                messages = []
+                for booking in bookings:
+                    position += 1
+                    if position > resume_after:
+                        messages.append(format_event(
+                            SimpleBookingOut.model_validate(booking).model_dump_json(),
+                            id=str(position),
+                        ))
+                if messages:
+                    yield "".join(messages)
+                if await request.is_disconnected():
+                    return
+
+        pages = aiter(event_pages)
+        next_page = asyncio.ensure_future(anext(pages))
+        try:
+            while True:
+                if await request.is_disconnected():
+                    return
+                done, _ = await asyncio.wait({next_page}, timeout=SSE_HEARTBEAT_INTERVAL)
+                if not done:
+                    yield HEARTBEAT
+                    continue
+                try:
+                    page = next_page.result()
+                except StopAsyncIteration:
+                    break
+                except GoogleCalendarUnavailableError:
+                    yield format_event(PartialBookingsOut().model_dump_json(), event="partial")
+                    break
+                messages = []
+                for slot in convert_google_events(page):
+                    position += 1
+                    if position > resume_after:
+                        messages.append(format_event(slot.to_json(), id=str(position)))
+                if messages:
+                    yield "".join(messages)
+                next_page = asyncio.ensure_future(anext(pages))
+        finally:
+            next_page.cancel()
+
+        yield format_event('{"type":"complete"}')
+
+    return StreamingResponse(
+        _stream_events(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        status_code=status.HTTP_200_OK,
+    )
+
+
 @router.get(
     "/guest-calendar/bookings",
     status_code=status.HTTP_200_OK,
@@ -173,25 +493,38 @@ async def host_calendar_bookings_stream(
 )
 async def guest_calendar_bookings(
     user: CurrentUserDep,
-    session: DbSessionDep,
-    page: Annotated[int, Query(ge=1)],
+    session: ReadDbSessionDep,
     page_size: Annotated[int, Query(ge=1, le=50)],
+    page: Annotated[int, Query(ge=1)] = 1,
+    cursor: Annotated[str | None, Query(description="이전 응답의 next_cursor. 빈 값이면 처음부터")] = None,
 ) -> PaginatedBookingOut:
-    stmt = (
-        select(Booking)
-        .options(selectinload(Booking.files))
-        .where(Booking.guest_id == user.id)
-        .order_by(Booking.when.desc(), Booking.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-    )
-    result = await session.execute(stmt)
-    count_stmt = select(func.count()).select_from(Booking).where(Booking.guest_id == user.id)
-    count_result = await session.execute(count_stmt)
-    
+    # 전체 예약 수는 집계 테이블에서 목록과 같은 쿼리로 읽는다.
+    stmt = with_booking_profile(
+        select(Booking, booking_count_subquery(BookingCounterScope.GUEST, user.id).label("total_count")),
+        "detail",
+    ).where(Booking.guest_id == user.id)
+    next_cursor = None
+    if cursor is None:
+        stmt = (
+            stmt
+            .order_by(Booking.when.desc(), Booking.created_at.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        result = await session.execute(stmt)
+        rows = result.unique().all()
+    else:
+        rows, next_cursor = await fetch_bookings_after_cursor(session, stmt, cursor, page_size)
+
+    total_count = rows[0].total_count if rows else None
+    if total_count is None:
+        # 집계 행이 아직 없거나 빈 페이지라서 읽지 못했으면 직접 센다.
+        total_count = await count_bookings(session, BookingCounterScope.GUEST, user.id)
+
     return PaginatedBookingOut(
-        bookings=result.unique().scalars().all(),
-        total_count=count_result.scalar_one_or_none() or 0,
+        bookings=[booking for booking, _ in rows],
+        total_count=total_count,
+        next_cursor=next_cursor,
     )
 
 
@@ -203,7 +536,9 @@ async def guest_calendar_bookings(
 async def create_calendar(
     user: CurrentUserDep,
     session: DbSessionDep,
+    session_factory: SessionFactoryDep,
     payload: CalendarCreateIn,
+    background_tasks: BackgroundTasks,
 ) -> CalendarDetailOut:
     if not user.is_host:
         raise GuestPermissionError()
@@ -219,6 +554,15 @@ async def create_calendar(
         await session.commit()
     except IntegrityError as exc:
         raise CalendarAlreadyExistsError() from exc
+
+    if google_channels.GOOGLE_CALENDAR_WEBHOOK_URL:
+        background_tasks.add_task(
+            google_channels.switch_calendar_channels,
+            session_factory,
+            google_calendar_services.get,
+            None,
+            calendar.google_calendar_id,
+        )
     return calendar
 
 
@@ -230,7 +574,9 @@ async def create_calendar(
 async def update_calendar(
     user: CurrentUserDep,
     session: DbSessionDep,
-    payload: CalendarUpdateIn
+    session_factory: SessionFactoryDep,
+    payload: CalendarUpdateIn,
+    background_tasks: BackgroundTasks,
 ) -> CalendarDetailOut:
     # 호스트가 아니면 캘린더를 수정할 수 없다.
     if not user.is_host:
@@ -247,12 +593,28 @@ async def update_calendar(
     if payload.description is not None:
         user.calendar.description = payload.description
     # 구글 캘린더 ID 값이 있으면 변경하고
+    previous_google_calendar_id = user.calendar.google_calendar_id
     if payload.google_calendar_id is not None:
         user.calendar.google_calendar_id = payload.google_calendar_id
 
     # 데이터베이스에 반영한다.
     await session.commit()
 
+    # 구글 캘린더가 바뀌었으면 이전 캘린더의 일정 캐시를 지우고, 알림을 받는 중이면 채널을 바꾼다.
+    if previous_google_calendar_id != user.calendar.google_calendar_id:
+        google_events_cache.invalidate(previous_google_calendar_id)
+    if (
+        google_channels.GOOGLE_CALENDAR_WEBHOOK_URL
+        and previous_google_calendar_id != user.calendar.google_calendar_id
+    ):
+        background_tasks.add_task(
+            google_channels.switch_calendar_channels,
+            session_factory,
+            google_calendar_services.get,
+            previous_google_calendar_id,
+            user.calendar.google_calendar_id,
+        )
+
     return user.calendar
 
 
@@ -269,46 +631,30 @@ async def create_time_slot(
     if not user.is_host:
         raise GuestPermissionError()
 
-    # 데이터베이스 엔진 확인
-    engine: Engine = session.bind
-    is_sqlite = engine.dialect.name == "sqlite"
-
-    if is_sqlite:
-        # 이미 존재하는 타임슬롯과 겹치는지 확인
-        stmt = select(TimeSlot).where(
-            and_(
-                TimeSlot.calendar_id == user.calendar.id,
-                TimeSlot.start_time < payload.end_time,
-                TimeSlot.end_time > payload.start_time
-            )
-        )
-        result = await session.execute(stmt)
-        existing_time_slots = result.scalars().all()
-
-        for existing_time_slot in existing_time_slots:
-            if any(day in existing_time_slot.weekdays for day in payload.weekdays):
-                raise TimeSlotOverlapError()
-    else:
-        # PostgreSQL: SQL에서 교집합 확인
-        stmt = select(TimeSlot).where(
+    # 이미 존재하는 타임슬롯과 요일, 시간대가 겹치는지 확인
+    weekday_mask = weekdays_to_mask(payload.weekdays)
+    stmt = (
+        select(TimeSlot.id)
+        .where(
             and_(
                 TimeSlot.calendar_id == user.calendar.id,
-                func.jsonb_array_elements_text(TimeSlot.weekdays).in_(payload.weekdays),
+                TimeSlot.weekday_mask.op("&")(weekday_mask) != 0,
                 TimeSlot.start_time < payload.end_time,
                 TimeSlot.end_time > payload.start_time
             )
         )
-        result = await session.execute(stmt)
-        existing_time_slot = result.scalar_one_or_none()
-
-        if existing_time_slot:
-            raise TimeSlotOverlapError()
+        .limit(1)
+    )
+    result = await session.execute(stmt)
+    if result.scalar_one_or_none() is not None:
+        raise TimeSlotOverlapError()
 
     time_slot = TimeSlot(
         calendar_id=user.calendar.id,
         start_time=payload.start_time,
         end_time=payload.end_time,
         weekdays=payload.weekdays,
+        weekday_mask=weekday_mask,
     )
     session.add(time_slot)
     await session.commit()
@@ -325,8 +671,7 @@ async def create_booking(
     user: CurrentUserDep,
     session: DbSessionDep,
     payload: BookingCreateIn,
-    service: GoogleCalendarServiceDep,
-    background_tasks: BackgroundTasks,
+    bus: BookingEventBusDep,
 ) -> BookingOut:
     stmt = (
         select(User)
@@ -353,7 +698,7 @@ async def create_booking(
     time_slot = result.scalar_one_or_none()
     if time_slot is None:
         raise TimeSlotNotFoundError()
-    if payload.when.weekday() not in time_slot.weekdays:
+    if not time_slot.is_available_on(payload.when):
         raise TimeSlotNotFoundError()
 
     stmt = (
@@ -373,54 +718,92 @@ async def create_booking(
         topic=payload.topic,
         description=payload.description,
         time_slot_id=payload.time_slot_id,
+        calendar_id=host.calendar.id,
     )
     session.add(booking)
+    await update_booking_counters(
+        session,
+        guest_id=booking.guest_id,
+        calendar_id=booking.calendar_id,
+        booking_delta=1,
+    )
+    # 구글 캘린더 일정은 같은 트랜잭션에 기록한 작업으로 아웃박스 워커가 만든다.
+    await enqueue_google_event(session, OutboxAction.CREATE, booking, host.calendar.google_calendar_id)
     await session.commit()
     await session.refresh(booking, ["files", "time_slot"])
+    await publish_booking_event(bus, BookingEventType.CREATED, booking, host.id)
 
-    start_datetime = datetime.combine(booking.when, time_slot.start_time)
-    end_datetime = datetime.combine(booking.when, time_slot.end_time)
+    return booking
 
-    async def _apply_event_id():
-        event = await service.create_event(
-            start_datetime=start_datetime.astimezone(timezone.utc),
-            end_datetime=end_datetime.astimezone(timezone.utc),
-            summary=booking.topic,
-            description=booking.description,
-            google_calendar_id=host.calendar.google_calendar_id,
-        )
-        booking.google_event_id = event["id"]
-        await session.commit()
 
-    background_tasks.add_task(_apply_event_id)
-    
-    return booking
+@router.get(
+    "/booking-events",
+    status_code=status.HTTP_200_OK,
+)
+async def host_booking_events(
+    user: CurrentUserDep,
+    bus: BookingEventBusDep,
+    request: Request,
+) -> StreamingResponse:
+    """호스트 캘린더의 예약 변경을 Server-Sent Events 로 보낸다.
+
+    메시지는 `BookingEvent` 이다. 연결한 뒤의 변경만 보내므로 연결하거나 다시 연결하면
+    `/bookings` 를 한 번 읽는다. 알림이 없으면 `SSE_HEARTBEAT_INTERVAL` 초마다 keep-alive 를
+    보내고, 클라이언트가 끊었으면 구독을 끝낸다.
+    """
+    if not user.is_host or user.calendar is None:
+        raise HostNotFoundError()
+    host_id = user.id
+
+    async def _stream_events():
+        yield format_event(retry=SSE_RETRY_MS)
+        async with bus.subscribe(host_id) as queue:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_INTERVAL)
+                except TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                yield format_event(event.to_json())
+
+    return StreamingResponse(
+        _stream_events(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        status_code=status.HTTP_200_OK,
+    )
 
 
 @router.get(
     "/bookings",
     status_code=status.HTTP_200_OK,
-    response_model=list[BookingOut],
+    response_model=list[BookingOut] | BookingListOut,
 )
 async def get_host_bookings_by_month(
     user: CurrentUserDep,
     session: DbSessionDep,
-    page: Annotated[int, Query(ge=1)],
     page_size: Annotated[int, Query(ge=1, le=50)],
-) -> list[BookingOut]:
+    page: Annotated[int, Query(ge=1)] = 1,
+    cursor: Annotated[str | None, Query(description="이전 응답의 next_cursor. 빈 값이면 처음부터")] = None,
+) -> list[BookingOut] | BookingListOut:
     if not user.is_host or user.calendar is None:
         raise HostNotFoundError()
     
+    stmt = with_booking_profile(select(Booking), "detail").where(Booking.calendar_id == user.calendar.id)
+
+    if cursor is not None:
+        rows, next_cursor = await fetch_bookings_after_cursor(session, stmt, cursor, page_size)
+        return BookingListOut(bookings=[booking for booking, in rows], next_cursor=next_cursor)
+
     stmt = (
-        select(Booking)
-        .where(Booking.time_slot.has(TimeSlot.calendar_id == user.calendar.id))
+        stmt
         .order_by(Booking.when.desc())
         .offset((page - 1) * page_size)
         .limit(page_size)
     )
     result = await session.execute(stmt)
 
-    return result.scalars().all()    
+    return result.unique().scalars().all()
 
 
 @router.get(
@@ -433,16 +816,11 @@ async def get_booking_by_id(
     session: DbSessionDep,
     booking_id: int
 ) -> BookingOut:
-    stmt = select(Booking).where(Booking.id == booking_id)
+    stmt = with_booking_profile(select(Booking), "detail").where(Booking.id == booking_id)
     if user.is_host and user.calendar is not None:
-        stmt = (
-            stmt
-            .join(Booking.time_slot)
-            .options(selectinload(Booking.files))
-            .where((TimeSlot.calendar_id == user.calendar.id) | (Booking.guest_id == user.id))
-        )
+        stmt = stmt.where((Booking.calendar_id == user.calendar.id) | (Booking.guest_id == user.id))
     else:
-        stmt = stmt.where(Booking.guest_id == user.id).options(selectinload(Booking.files))
+        stmt = stmt.where(Booking.guest_id == user.id)
 
     result = await session.execute(stmt)
     booking = result.unique().scalar_one_or_none()
@@ -462,17 +840,15 @@ async def host_update_booking(
     booking_id: int,
     now: UtcNow,
     payload: HostBookingUpdateIn,
-    service: GoogleCalendarServiceDep,
-    background_tasks: BackgroundTasks,
+    bus: BookingEventBusDep,
 ) -> BookingOut:
     if not user.is_host or user.calendar is None:
         raise HostNotFoundError()
 
     stmt = (
-        select(Booking)
-        .join(Booking.time_slot)
+        with_booking_profile(select(Booking), "detail")
         .where(Booking.id == booking_id)
-        .where(TimeSlot.calendar_id == user.calendar.id)
+        .where(Booking.calendar_id == user.calendar.id)
     )
     result = await session.execute(stmt)
     booking = result.scalar_one_or_none()
@@ -481,7 +857,8 @@ async def host_update_booking(
     
     if booking.when < now.date():
         raise PastBookingError()
-        
+
+    previous_when = booking.when
     if payload.time_slot_id is not None:
         stmt = (
             select(TimeSlot)
@@ -494,31 +871,24 @@ async def host_update_booking(
             raise TimeSlotNotFoundError()
         
         booking.time_slot_id = time_slot.id
+        booking.calendar_id = time_slot.calendar_id
 
     if payload.when is not None:
-        if payload.when.weekday() not in booking.time_slot.weekdays:
+        if not booking.time_slot.is_available_on(payload.when):
             raise TimeSlotNotFoundError()
         booking.when = payload.when
 
+    await enqueue_google_event(
+        session,
+        OutboxAction.UPDATE,
+        booking,
+        user.calendar.google_calendar_id,
+        previous_when,
+    )
     await session.commit()
     await session.refresh(booking)
- 
-    start_datetime = datetime.combine(booking.when, booking.time_slot.start_time)
-    end_datetime = datetime.combine(booking.when, booking.time_slot.end_time)
-
-    if booking.google_event_id:
-        async def _update_google_calendar_event():
-            await service.update_event(
-                event_id=booking.google_event_id,
-                start_datetime=start_datetime.astimezone(timezone.utc),
-                end_datetime=end_datetime.astimezone(timezone.utc),
-                summary=booking.topic,
-                description=booking.description,
-                google_calendar_id=user.calendar.google_calendar_id,
-            )
-            
-        background_tasks.add_task(_update_google_calendar_event)
-   
+    await publish_booking_event(bus, BookingEventType.UPDATED, booking, user.id)
+
     return booking
 
 
@@ -533,11 +903,10 @@ async def guest_update_booking(
     booking_id: int,
     now: UtcNow,
     payload: GuestBookingUpdateIn,
-    service: GoogleCalendarServiceDep,
-    background_tasks: BackgroundTasks,
+    bus: BookingEventBusDep,
 ) -> BookingOut:
     stmt = (
-        select(Booking)
+        with_booking_profile(select(Booking), "detail")
         .where(Booking.id == booking_id)
         .where(Booking.guest_id == user.id)
     )
@@ -549,45 +918,40 @@ async def guest_update_booking(
     if booking.when <= now.date():
         raise PastBookingError()
 
+    previous_when = booking.when
     if payload.time_slot_id is not None:
         stmt = (
             select(TimeSlot)
             .where(TimeSlot.id == payload.time_slot_id)
-            .where(TimeSlot.calendar_id == booking.time_slot.calendar_id)
+            .where(TimeSlot.calendar_id == booking.calendar_id)
         )
         result = await session.execute(stmt)
         time_slot = result.scalar_one_or_none()
         if time_slot is None:
             raise TimeSlotNotFoundError()
         booking.time_slot_id = time_slot.id
+        booking.calendar_id = time_slot.calendar_id
 
     if payload.topic is not None:
         booking.topic = payload.topic
     if payload.description is not None:
         booking.description = payload.description
     if payload.when is not None:
-        if payload.when.weekday() not in booking.time_slot.weekdays:
+        if not booking.time_slot.is_available_on(payload.when):
             raise TimeSlotNotFoundError()
         booking.when = payload.when
+    host_id = booking.time_slot.calendar.host_id
+    await enqueue_google_event(
+        session,
+        OutboxAction.UPDATE,
+        booking,
+        booking.time_slot.calendar.google_calendar_id,
+        previous_when,
+    )
     await session.commit()
     await session.refresh(booking)
+    await publish_booking_event(bus, BookingEventType.UPDATED, booking, host_id)
 
-    if booking.google_event_id:
-        start_datetime = datetime.combine(booking.when, booking.time_slot.start_time)
-        end_datetime = datetime.combine(booking.when, booking.time_slot.end_time)
-
-        async def _update_google_calendar_event():
-            await service.update_event(
-                event_id=booking.google_event_id,
-                start_datetime=start_datetime.astimezone(timezone.utc),
-                end_datetime=end_datetime.astimezone(timezone.utc),
-                summary=booking.topic,
-                description=booking.description,
-                google_calendar_id=booking.time_slot.calendar.google_calendar_id,
-            )
-            
-        background_tasks.add_task(_update_google_calendar_event)
-    
     return booking
 
 
@@ -602,15 +966,15 @@ async def update_booking_status(
     booking_id: int,
     payload: HostBookingStatusUpdateIn,
     now: UtcNow,
+    bus: BookingEventBusDep,
 ) -> BookingOut:
     if not user.is_host or user.calendar is None:
         raise HostNotFoundError()
 
     stmt = (
-        select(Booking)
-        .join(Booking.time_slot)
+        with_booking_profile(select(Booking), "detail")
         .where(Booking.id == booking_id)
-        .where(TimeSlot.calendar_id == user.calendar.id)
+        .where(Booking.calendar_id == user.calendar.id)
     )
     result = await session.execute(stmt)
     booking = result.scalar_one_or_none()
@@ -620,9 +984,17 @@ async def update_booking_status(
     if booking.when < now.date():
         raise PastBookingError()
     
+    delta = cancelled_delta(booking.attendance_status, payload.attendance_status)
     booking.attendance_status = payload.attendance_status
+    await update_booking_counters(
+        session,
+        guest_id=booking.guest_id,
+        calendar_id=booking.calendar_id,
+        cancelled_delta=delta,
+    )
     await session.commit()
     await session.refresh(booking)
+    await publish_booking_event(bus, BookingEventType.STATUS_CHANGED, booking, user.id)
     return booking
 
 
@@ -635,11 +1007,10 @@ async def cancel_guest_booking(
     session: DbSessionDep,
     booking_id: int,
     now: UtcNow,
-    service: GoogleCalendarServiceDep,
-    background_tasks: BackgroundTasks,
+    bus: BookingEventBusDep,
 ) -> None:
     stmt = (
-        select(Booking)
+        with_booking_profile(select(Booking), "detail")
         .where(Booking.id == booking_id)
         .where(Booking.guest_id == user.id)
     )
@@ -653,15 +1024,22 @@ async def cancel_guest_booking(
 
     if booking.attendance_status != AttendanceStatus.CANCELLED.value:
         booking.attendance_status = AttendanceStatus.CANCELLED.value
+        await update_booking_counters(
+            session,
+            guest_id=booking.guest_id,
+            calendar_id=booking.calendar_id,
+            cancelled_delta=1,
+        )
+        host_id = booking.time_slot.calendar.host_id
+        await enqueue_google_event(
+            session,
+            OutboxAction.DELETE,
+            booking,
+            booking.time_slot.calendar.google_calendar_id,
+        )
         await session.commit()
-        await session.refresh(booking)
-
-    if booking.google_event_id:
-        async def _cancel_google_calendar_event():
-            await service.delete_event(booking.google_event_id, booking.time_slot.calendar.google_calendar_id)
-            
-        background_tasks.add_task(_cancel_google_calendar_event)
- 
+        await publish_booking_event(bus, BookingEventType.CANCELLED, booking, host_id)
+
     return None
 
 
@@ -678,7 +1056,7 @@ async def upload_booking_files(
     now: UtcNow,
 ) -> BookingOut:
     stmt = (
-        select(Booking)
+        with_booking_profile(select(Booking), "detail")
         .where(Booking.id == booking_id)
         .where(Booking.guest_id == user.id)
     )
@@ -704,7 +1082,7 @@ async def upload_booking_files(
 )
 async def get_host_timeslots(
     host_username: str,
-    session: DbSessionDep,
+    session: ReadDbSessionDep,
 ) -> list[TimeSlotOut]:
     stmt = (
         select(User)
@@ -720,3 +1098,47 @@ async def get_host_timeslots(
     stmt = select(TimeSlot).where(TimeSlot.calendar_id == host.calendar.id)
     result = await session.execute(stmt)
     return result.scalars().all()
+
+
+@router.post(
+    "/google-calendar/notifications",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def google_calendar_notification(
+    session: DbSessionDep,
+    session_factory: SessionFactoryDep,
+    background_tasks: BackgroundTasks,
+    channel_id: Annotated[str, Header(alias="X-Goog-Channel-ID")],
+    resource_state: Annotated[str, Header(alias="X-Goog-Resource-State")],
+    channel_token: Annotated[str | None, Header(alias="X-Goog-Channel-Token")] = None,
+) -> None:
+    """Google `events.watch` 채널 알림. 알림에는 바뀐 내용이 없으므로 그 캘린더만 다시 읽게 한다."""
+    channel = await google_channels.find_channel(session, channel_id, channel_token)
+    if channel is None:
+        raise GoogleChannelNotFoundError()
+
+    # 채널을 연 직후 한 번 오는 확인 알림
+    if resource_state == "sync":
+        return None
+
+    google_events_cache.invalidate(channel.google_calendar_id)
+    background_tasks.add_task(
+        google_channels.sync_on_notification,
+        session_factory,
+        google_calendar_services.get,
+        channel.google_calendar_id,
+    )
+    return None
+
+
+@router.get(
+    "/google-calendar/outbox/metrics",
+    status_code=status.HTTP_200_OK,
+)
+async def google_calendar_outbox_metrics(session: DbSessionDep) -> Response:
+    """아웃박스 지표를 Prometheus 텍스트 형식으로 보낸다.
+
+    DB 에서 바로 세므로 어느 워커가 받아도, 아웃박스 워커를 따로 띄워도 같은 값이다.
+    """
+    stats = await outbox_stats(session, datetime.now(timezone.utc))
+    return Response(render_gauges(stats.gauges()), media_type=METRICS_CONTENT_TYPE)
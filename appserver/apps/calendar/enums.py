@@ -15,3 +15,47 @@ class AttendanceStatus(enum.StrEnum):
     CANCELLED = enum.auto()
     SAME_DAY_CANCEL = enum.auto()
     LATE = enum.auto()
+
+
+class BookingCounterScope(enum.StrEnum):
+    """예약 수 집계 대상
+    - GUEST: 게스트별 예약 수
+    - CALENDAR: 캘린더(호스트)별 예약 수
+    """
+    GUEST = enum.auto()
+    CALENDAR = enum.auto()
+
+
+class OutboxAction(enum.StrEnum):
+    """구글 캘린더에 반영할 작업
+    - CREATE: 일정 생성
+    - UPDATE: 일정 수정
+    - DELETE: 일정 삭제
+    """
+    CREATE = enum.auto()
+    UPDATE = enum.auto()
+    DELETE = enum.auto()
+
+
+class OutboxStatus(enum.StrEnum):
+    """아웃박스 작업 상태
+    - PENDING: 처리 대기(재시도 포함)
+    - FAILED: 재시도 횟수를 넘겨 포기함
+    """
+    PENDING = enum.auto()
+    FAILED = enum.auto()
+
+
+class BookingEventType(enum.StrEnum):
+    """호스트에게 알리는 예약 변경 종류
+    - CREATED: 새 예약
+    - UPDATED: 날짜/시간대/내용 변경
+    - STATUS_CHANGED: 참석 상태 변경
+    - CANCELLED: 게스트가 취소
+    - GOOGLE_SYNCED: 아웃박스 워커가 구글 캘린더에 반영함
+    """
+    CREATED = enum.auto()
+    UPDATED = enum.auto()
+    STATUS_CHANGED = enum.auto()
+    CANCELLED = enum.auto()
+    GOOGLE_SYNCED = enum.auto()
@@ -80,3 +80,19 @@ class InvalidYearMonthError(HTTPException):
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="유효하지 않은 년도 또는 월입니다.",
         )
+
+
+class InvalidCursorError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="유효하지 않은 커서입니다.",
+        )
+
+
+class GoogleChannelNotFoundError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="알림 채널이 없습니다.",
+        )
@@ -0,0 +1,239 @@
+"""구글 캘린더 변경 알림(`events.watch`) 채널 관리.
+
+`GOOGLE_CALENDAR_WEBHOOK_URL` 이 설정되어 있을 때만 채널을 연다. 알림이 오면 그 캘린더의
+일정 캐시를 지우고, 미러를 쓰는 캘린더면 증분 동기화를 한다. 채널은 만료되므로 주기적으로
+새 채널로 바꾼다.
+
+    python -m appserver.apps.calendar.google_channels --interval 3600
+"""
+import argparse
+import asyncio
+import logging
+import os
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from googleapiclient.errors import HttpError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
+
+from appserver.libs.google.calendar.resilience import GoogleCalendarUnavailableError
+from appserver.libs.google.calendar.services import GoogleCalendarService
+
+from .google_sync import sync_google_calendar
+from .models import Calendar, GoogleCalendarChannel, GoogleCalendarSyncState
+
+GOOGLE_CALENDAR_WEBHOOK_URL = os.getenv("GOOGLE_CALENDAR_WEBHOOK_URL")
+CHANNEL_TTL = int(os.getenv("GOOGLE_CALENDAR_CHANNEL_TTL", str(7 * 24 * 60 * 60)))
+RENEW_BEFORE = timedelta(days=1)
+
+logger = logging.getLogger(__name__)
+
+# 동기화 중에 또 알림이 오면 끝난 뒤 한 번 더 동기화한다.
+_pending_syncs: dict[str, bool] = {}
+
+
+def channel_expires_at(expiration: str | None, now: datetime) -> datetime:
+    """
+    Google 이 알려준 만료 시각(밀리초 Unix 시각). 없으면 요청한 유효 기간으로 계산한다.
+
+    >>> now = datetime(2024, 12, 3, tzinfo=timezone.utc)
+    >>> channel_expires_at("1733788800000", now)
+    datetime.datetime(2024, 12, 10, 0, 0, tzinfo=datetime.timezone.utc)
+    >>> channel_expires_at(None, now) == now + timedelta(seconds=CHANNEL_TTL)
+    True
+    """
+    if expiration:
+        return datetime.fromtimestamp(int(expiration) / 1000, tz=timezone.utc)
+    return now + timedelta(seconds=CHANNEL_TTL)
+
+
+async def open_channel(
+    session: AsyncSession,
+    service: GoogleCalendarService,
+    google_calendar_id: str,
+    address: str,
+) -> GoogleCalendarChannel:
+    channel_id = str(uuid.uuid4())
+    token = secrets.token_urlsafe(32)
+    response = await service.watch_events(
+        channel_id,
+        address,
+        token,
+        google_calendar_id=google_calendar_id,
+        ttl=CHANNEL_TTL,
+    )
+    channel = GoogleCalendarChannel(
+        google_calendar_id=google_calendar_id,
+        channel_id=channel_id,
+        resource_id=response["resourceId"],
+        token=token,
+        expires_at=channel_expires_at(response.get("expiration"), datetime.now(timezone.utc)),
+    )
+    session.add(channel)
+    await session.commit()
+    return channel
+
+
+async def close_channel(session: AsyncSession, service: GoogleCalendarService, channel: GoogleCalendarChannel) -> bool:
+    """채널을 닫고 기록을 지운다. Google 이 채널을 닫지 못하면 기록을 남겨서 다음 갱신 때 다시 닫는다."""
+    try:
+        await service.stop_channel(channel.channel_id, channel.resource_id)
+    except (HttpError, GoogleCalendarUnavailableError):
+        logger.exception("failed to stop google calendar channel %s", channel.channel_id)
+        return False
+
+    await session.delete(channel)
+    await session.commit()
+    return True
+
+
+async def switch_calendar_channels(
+    session_factory: async_sessionmaker[AsyncSession],
+    get_service: Callable[[str], GoogleCalendarService],
+    previous_google_calendar_id: str | None,
+    google_calendar_id: str,
+    address: str | None = None,
+) -> None:
+    """캘린더의 구글 캘린더 ID 가 바뀌면 이전 채널을 닫고 새 캘린더 채널을 연다.
+
+    응답을 보낸 뒤 백그라운드에서 실행하므로 요청 세션 대신 세션을 새로 연다.
+    """
+    address = address or GOOGLE_CALENDAR_WEBHOOK_URL
+    if not address or previous_google_calendar_id == google_calendar_id:
+        return
+
+    async with session_factory() as session:
+        await _switch_calendar_channels(session, get_service, previous_google_calendar_id, google_calendar_id, address)
+
+
+async def _switch_calendar_channels(
+    session: AsyncSession,
+    get_service: Callable[[str], GoogleCalendarService],
+    previous_google_calendar_id: str | None,
+    google_calendar_id: str,
+    address: str,
+) -> None:
+    if previous_google_calendar_id is not None:
+        stmt = select(Calendar.id).where(Calendar.google_calendar_id == previous_google_calendar_id).limit(1)
+        result = await session.execute(stmt)
+        # 다른 호스트가 같은 구글 캘린더를 쓰고 있으면 채널을 남겨 둔다.
+        if result.scalar_one_or_none() is None:
+            stmt = select(GoogleCalendarChannel).where(
+                GoogleCalendarChannel.google_calendar_id == previous_google_calendar_id
+            )
+            result = await session.execute(stmt)
+            for channel in result.scalars().all():
+                await close_channel(session, get_service(channel.google_calendar_id), channel)
+
+    stmt = select(GoogleCalendarChannel.id).where(GoogleCalendarChannel.google_calendar_id == google_calendar_id)
+    result = await session.execute(stmt)
+    if result.first() is None:
+        await open_channel(session, get_service(google_calendar_id), google_calendar_id, address)
+
+
+async def find_channel(session: AsyncSession, channel_id: str, token: str | None) -> GoogleCalendarChannel | None:
+    stmt = select(GoogleCalendarChannel).where(GoogleCalendarChannel.channel_id == channel_id)
+    result = await session.execute(stmt)
+    channel = result.scalar_one_or_none()
+    if channel is None or token is None or not secrets.compare_digest(channel.token, token):
+        return None
+    return channel
+
+
+async def sync_on_notification(
+    session_factory: async_sessionmaker[AsyncSession],
+    get_service: Callable[[str], GoogleCalendarService],
+    google_calendar_id: str,
+) -> None:
+    """미러를 쓰는 캘린더만 증분 동기화한다. 같은 캘린더의 동기화는 워커 안에서 겹치지 않는다.
+
+    알림에 응답한 뒤 백그라운드에서 실행하므로 요청 세션 대신 세션을 새로 연다.
+    """
+    if google_calendar_id in _pending_syncs:
+        _pending_syncs[google_calendar_id] = True
+        return
+
+    async with session_factory() as session:
+        stmt = select(GoogleCalendarSyncState.id).where(
+            GoogleCalendarSyncState.google_calendar_id == google_calendar_id
+        )
+        result = await session.execute(stmt)
+        if result.scalar_one_or_none() is None:
+            return
+
+        _pending_syncs[google_calendar_id] = True
+        try:
+            while _pending_syncs[google_calendar_id]:
+                _pending_syncs[google_calendar_id] = False
+                await sync_google_calendar(session, get_service(google_calendar_id), google_calendar_id)
+        finally:
+            del _pending_syncs[google_calendar_id]
+
+
+async def renew_channels(
+    session: AsyncSession,
+    get_service: Callable[[str], GoogleCalendarService],
+    address: str,
+    now: datetime,
+    renew_before: timedelta = RENEW_BEFORE,
+) -> int:
+    """채널이 없거나 곧 만료되는 캘린더에 새 채널을 열고, 오래됐거나 쓰지 않는 채널을 닫는다.
+
+    새로 연 채널 수를 반환한다.
+    """
+    result = await session.execute(select(Calendar.google_calendar_id).distinct())
+    google_calendar_ids = set(result.scalars().all())
+    result = await session.execute(select(GoogleCalendarChannel))
+    channels = result.scalars().all()
+
+    live = {
+        channel.google_calendar_id
+        for channel in channels
+        if channel.google_calendar_id in google_calendar_ids and channel.expires_at > now + renew_before
+    }
+    opened = 0
+    # 새 채널을 먼저 열어서 알림이 끊기는 구간이 없게 한다. 한 캘린더가 실패해도 나머지는 계속한다.
+    for google_calendar_id in sorted(google_calendar_ids - live):
+        try:
+            await open_channel(session, get_service(google_calendar_id), google_calendar_id, address)
+        except (HttpError, GoogleCalendarUnavailableError):
+            logger.exception("failed to open google calendar channel for %s", google_calendar_id)
+            continue
+        opened += 1
+
+    for channel in channels:
+        if channel.google_calendar_id not in google_calendar_ids or channel.expires_at <= now + renew_before:
+            await close_channel(session, get_service(channel.google_calendar_id), channel)
+    return opened
+
+
+async def main(interval: float) -> None:
+    from appserver.db import async_session_factory
+    from appserver.libs.google.calendar.registry import google_calendar_services
+
+    if not GOOGLE_CALENDAR_WEBHOOK_URL:
+        print("GOOGLE_CALENDAR_WEBHOOK_URL is not set")
+        return
+
+    while True:
+        async with async_session_factory() as session:
+            opened = await renew_channels(
+                session,
+                google_calendar_services.get,
+                GOOGLE_CALENDAR_WEBHOOK_URL,
+                datetime.now(timezone.utc),
+            )
+        print(f"opened {opened} google calendar channels")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interval", type=float, default=3600, help="0 이면 한 번만 갱신한다")
+    args = parser.parse_args()
+    asyncio.run(main(args.interval))
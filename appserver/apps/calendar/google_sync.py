@@ -0,0 +1,209 @@
+"""호스트 구글 캘린더 일정을 `google_event_mirror` 로 증분 동기화한다.
+
+처음에는 전체 목록을 읽고, 이후에는 Google 이 준 `nextSyncToken` 으로 바뀐 일정만 읽는다.
+토큰이 만료되면(410) 그 캘린더의 미러를 비우고 전체 동기화를 다시 한다. 마지막 동기화가
+`MIRROR_MAX_AGE` 초보다 오래됐으면 동기화 워커나 알림이 멈춘 것으로 보고 미러를 쓰지 않는다.
+
+    python -m appserver.apps.calendar.google_sync --interval 60
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from appserver.libs.datetime.calendar import get_month_range
+from appserver.libs.google.calendar.schemas import CalendarEvent
+from appserver.libs.google.calendar.services import GoogleCalendarService, SyncTokenExpiredError
+from appserver.libs.query import upsert_insert
+
+from .models import Calendar, GoogleCalendarSyncState, GoogleEventMirror
+
+# 미러를 믿는 최대 시간(초). 주기 동기화 간격보다 넉넉하게 잡는다.
+MIRROR_MAX_AGE = float(os.getenv("GOOGLE_EVENT_MIRROR_MAX_AGE", "900"))
+
+logger = logging.getLogger(__name__)
+
+
+def parse_event_time(value: dict) -> datetime:
+    """
+    Google 일정의 start/end 를 UTC 일시로 바꾼다. 종일 일정(date)은 UTC 자정으로 본다.
+
+    >>> parse_event_time({"dateTime": "2024-12-03T10:00:00+09:00"})
+    datetime.datetime(2024, 12, 3, 1, 0, tzinfo=datetime.timezone.utc)
+    >>> parse_event_time({"date": "2024-12-03"})
+    datetime.datetime(2024, 12, 3, 0, 0, tzinfo=datetime.timezone.utc)
+    """
+    if value.get("date"):
+        return datetime.combine(date.fromisoformat(value["date"]), time.min, tzinfo=timezone.utc)
+    return datetime.fromisoformat(value["dateTime"]).astimezone(timezone.utc)
+
+
+async def _apply_events(session: AsyncSession, google_calendar_id: str, events: list[CalendarEvent]) -> int:
+    cancelled = [event["id"] for event in events if event.get("status") == "cancelled"]
+    if cancelled:
+        await session.execute(
+            delete(GoogleEventMirror)
+            .where(GoogleEventMirror.google_calendar_id == google_calendar_id)
+            .where(GoogleEventMirror.event_id.in_(cancelled))
+        )
+
+    for event in events:
+        if event.get("status") == "cancelled" or "start" not in event or "end" not in event:
+            continue
+        insert_stmt = upsert_insert(session, GoogleEventMirror).values(
+            google_calendar_id=google_calendar_id,
+            event_id=event["id"],
+            start=event["start"],
+            end=event["end"],
+            start_at=parse_event_time(event["start"]),
+            end_at=parse_event_time(event["end"]),
+        )
+        await session.execute(insert_stmt.on_conflict_do_update(
+            index_elements=[GoogleEventMirror.google_calendar_id, GoogleEventMirror.event_id],
+            set_={
+                "start": insert_stmt.excluded.start,
+                "end": insert_stmt.excluded.end,
+                "start_at": insert_stmt.excluded.start_at,
+                "end_at": insert_stmt.excluded.end_at,
+                "updated_at": func.now(),
+            },
+        ))
+    return len(events)
+
+
+async def _get_sync_state(session: AsyncSession, google_calendar_id: str) -> GoogleCalendarSyncState:
+    """캘린더의 동기화 위치. 없으면 만든다.
+
+    알림으로 시작한 동기화와 주기 동기화가 처음 만날 때 동시에 만들 수 있으므로
+    충돌하면 무시하는 INSERT 로 만들고 다시 읽는다.
+    """
+    insert_stmt = upsert_insert(session, GoogleCalendarSyncState).values(google_calendar_id=google_calendar_id)
+    await session.execute(
+        insert_stmt.on_conflict_do_nothing(index_elements=[GoogleCalendarSyncState.google_calendar_id])
+    )
+    stmt = select(GoogleCalendarSyncState).where(GoogleCalendarSyncState.google_calendar_id == google_calendar_id)
+    result = await session.execute(stmt)
+    return result.scalar_one()
+
+
+async def sync_google_calendar(
+    session: AsyncSession,
+    service: GoogleCalendarService,
+    google_calendar_id: str,
+) -> int:
+    """캘린더 하나를 동기화하고 커밋한다. 반영한 일정(취소 포함) 수를 반환한다."""
+    state = await _get_sync_state(session, google_calendar_id)
+    sync_token = state.sync_token
+
+    try:
+        changed, next_sync_token = await _sync_pages(session, service, google_calendar_id, sync_token)
+    except SyncTokenExpiredError:
+        await session.rollback()
+        state = await _get_sync_state(session, google_calendar_id)
+        await session.execute(
+            delete(GoogleEventMirror).where(GoogleEventMirror.google_calendar_id == google_calendar_id)
+        )
+        changed, next_sync_token = await _sync_pages(session, service, google_calendar_id, None)
+
+    state.sync_token = next_sync_token
+    state.synced_at = datetime.now(timezone.utc)
+    await session.commit()
+    return changed
+
+
+async def _sync_pages(
+    session: AsyncSession,
+    service: GoogleCalendarService,
+    google_calendar_id: str,
+    sync_token: str | None,
+) -> tuple[int, str | None]:
+    changed = 0
+    page_token = None
+    while True:
+        page = await service.sync_events(google_calendar_id, sync_token=sync_token, page_token=page_token)
+        changed += await _apply_events(session, google_calendar_id, page.get("items", []))
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return changed, page.get("nextSyncToken")
+
+
+async def list_mirrored_events(
+    session: AsyncSession,
+    google_calendar_id: str,
+    year: int,
+    month: int,
+    now: datetime | None = None,
+) -> list[dict] | None:
+    """미러에서 월 단위 일정을 읽는다.
+
+    아직 동기화하지 않았거나 마지막 동기화가 `MIRROR_MAX_AGE` 초보다 오래된 캘린더면 None.
+    부르는 쪽은 Google 에서 직접 읽는다.
+    """
+    stmt = (
+        select(GoogleCalendarSyncState.synced_at)
+        .where(GoogleCalendarSyncState.google_calendar_id == google_calendar_id)
+        .where(GoogleCalendarSyncState.sync_token.is_not(None))
+    )
+    result = await session.execute(stmt)
+    synced_at = result.scalar_one_or_none()
+    now = now or datetime.now(timezone.utc)
+    if synced_at is None or now - synced_at > timedelta(seconds=MIRROR_MAX_AGE):
+        return None
+
+    start, end = get_month_range(year, month)
+    stmt = (
+        select(GoogleEventMirror)
+        .where(GoogleEventMirror.google_calendar_id == google_calendar_id)
+        .where(GoogleEventMirror.start_at < datetime.combine(end, time.min).astimezone(timezone.utc))
+        .where(GoogleEventMirror.end_at > datetime.combine(start, time.min).astimezone(timezone.utc))
+        .order_by(GoogleEventMirror.start_at)
+    )
+    result = await session.execute(stmt)
+    return [
+        {"id": event.event_id, "start": event.start, "end": event.end}
+        for event in result.scalars().all()
+    ]
+
+
+async def sync_all_calendars() -> int:
+    from appserver.db import async_session_factory
+    from appserver.libs.google.calendar.registry import google_calendar_services
+
+    async with async_session_factory() as session:
+        result = await session.execute(select(Calendar.google_calendar_id).distinct())
+        google_calendar_ids = result.scalars().all()
+
+    changed = 0
+    for google_calendar_id in google_calendar_ids:
+        async with async_session_factory() as session:
+            try:
+                changed += await sync_google_calendar(
+                    session,
+                    google_calendar_services.get(google_calendar_id),
+                    google_calendar_id,
+                )
+            except Exception:
+                # 한 캘린더가 실패해도 나머지 캘린더는 동기화한다.
+                logger.exception("google calendar sync failed: %s", google_calendar_id)
+    return changed
+
+
+async def main(interval: float) -> None:
+    while True:
+        changed = await sync_all_calendars()
+        print(f"synced {changed} google calendar events")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interval", type=float, default=60, help="0 이면 한 번만 동기화한다")
+    args = parser.parse_args()
+    asyncio.run(main(args.interval))
@@ -0,0 +1,74 @@
+"""예약 조회 로딩 프로필.
+
+모델의 관계는 기본으로 selectin 로딩만 하고, 엔드포인트가 응답 스키마에 맞는 프로필을 골라
+`with_booking_profile(stmt, "simple")` 처럼 적용한다. 프로필에 없는 관계를 건드리면 쿼리를
+몰래 보내는 대신 예외가 난다(raiseload).
+
+- simple: `SimpleBookingOut` (id, when, time_slot)
+- detail: `BookingOut` (time_slot → calendar → host, files)
+- admin: 관리자 화면 (time_slot, guest, files)
+
+프로필은 모두 다대일 관계만 joinedload 하므로 `stream_bookings` 로 나눠 읽을 수 있다.
+컬렉션을 joinedload 하는 프로필은 한 예약의 행이 여러 배치에 걸쳐 yield_per 와 함께 쓸 수 없다.
+"""
+from typing import AsyncIterator, Literal, Sequence, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.sql import Select
+
+from .models import Booking, Calendar, TimeSlot
+
+BookingLoadProfile = Literal["simple", "detail", "admin"]
+
+SelectT = TypeVar("SelectT", bound=Select)
+
+# 스트리밍 응답에서 한 번에 읽어 메모리에 두는 예약 수
+STREAM_BATCH_SIZE = 100
+
+
+BOOKING_LOAD_PROFILES: dict[BookingLoadProfile, tuple[ORMOption, ...]] = {
+    "simple": (
+        load_only(Booking.id, Booking.when, Booking.time_slot_id, Booking.calendar_id, raiseload=True),
+        joinedload(Booking.time_slot).raiseload(TimeSlot.calendar),
+        raiseload(Booking.guest),
+        raiseload(Booking.files),
+    ),
+    "detail": (
+        joinedload(Booking.time_slot).joinedload(TimeSlot.calendar).joinedload(Calendar.host),
+        selectinload(Booking.files),
+        raiseload(Booking.guest),
+    ),
+    "admin": (
+        selectinload(Booking.time_slot),
+        selectinload(Booking.guest),
+        selectinload(Booking.files),
+    ),
+}
+
+
+def with_booking_profile(stmt: SelectT, profile: BookingLoadProfile) -> SelectT:
+    return stmt.options(*BOOKING_LOAD_PROFILES[profile])
+
+
+async def stream_bookings(
+    session: AsyncSession,
+    stmt: Select,
+    profile: BookingLoadProfile,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[Sequence[Booking]]:
+    """서버 측 커서(yield_per)로 `batch_size` 개씩 읽어 넘긴다.
+
+    넘긴 배치의 예약은 세션에서 떼어 내므로 세션에는 한 배치만 남는다. 떼어 낸 예약은
+    이미 읽은 속성만 쓸 수 있다.
+    """
+    stmt = with_booking_profile(stmt, profile).execution_options(yield_per=batch_size)
+    result = await session.stream(stmt)
+    try:
+        async for bookings in result.scalars().partitions():
+            yield bookings
+            for booking in bookings:
+                session.expunge(booking)
+    finally:
+        await result.close()
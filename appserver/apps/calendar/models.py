@@ -7,15 +7,22 @@ from fastapi_storages.integrations.sqlalchemy import FileType
 from sqlalchemy.dialects.postgresql import JSONB
 from pydantic import AwareDatetime, computed_field
 from sqlalchemy_utc import UtcDateTime
+from sqlalchemy import Index, Update, UniqueConstraint, event, inspect, select, update
 from sqlmodel import SQLModel, Field, Relationship, Text, JSON, func, String, Column
 from sqlmodel.main import SQLModelConfig
 
-from .enums import AttendanceStatus
+from appserver.libs.datetime.calendar import weekday_bit, weekdays_to_mask
+
+from .enums import AttendanceStatus, BookingCounterScope, OutboxAction, OutboxStatus
 
 if TYPE_CHECKING:
     from appserver.apps.account.models import User
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Calendar(SQLModel, table=True):
     __tablename__ = "calendars"
 
@@ -30,7 +37,7 @@ class Calendar(SQLModel, table=True):
     host_id: int = Field(foreign_key="users.id", unique=True)
     host: "User" = Relationship(
         back_populates="calendar",
-        sa_relationship_kwargs={"uselist": False, "single_parent": True, "lazy": "joined"},
+        sa_relationship_kwargs={"uselist": False, "single_parent": True, "lazy": "selectin"},
     )
 
     time_slots: list["TimeSlot"] = Relationship(
@@ -62,6 +69,9 @@ class Calendar(SQLModel, table=True):
 
 class TimeSlot(SQLModel, table=True):
     __tablename__ = "time_slots"
+    __table_args__ = (
+        Index("ix_time_slots_calendar_id", "calendar_id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     start_time: time
@@ -70,11 +80,13 @@ class TimeSlot(SQLModel, table=True):
         sa_type=JSON().with_variant(JSONB(astext_type=Text()), "postgresql"),
         description="예약 가능한 요일들"
     )
+    # weekdays 의 비트마스크 사본 (월요일=1 ~ 일요일=64). 겹침 확인을 `weekday_mask & :mask` 로 한다.
+    weekday_mask: int = Field(default=0, description="예약 가능한 요일 비트마스크")
 
     calendar_id: int = Field(foreign_key="calendars.id")
     calendar: Calendar = Relationship(
         back_populates="time_slots",
-        sa_relationship_kwargs={"lazy": "joined"},
+        sa_relationship_kwargs={"lazy": "selectin"},
     )
 
     bookings: list["Booking"] = Relationship(
@@ -103,9 +115,20 @@ class TimeSlot(SQLModel, table=True):
     def __str__(self):
         return f"{self.calendar}. {self.start_time} - {self.end_time} {self.weekdays}"
 
+    def is_available_on(self, when: date) -> bool:
+        return bool(self.weekday_mask & weekday_bit(when.weekday()))
+
+
+@event.listens_for(TimeSlot, "before_insert")
+@event.listens_for(TimeSlot, "before_update")
+def sync_time_slot_weekday_mask(mapper, connection, target: TimeSlot) -> None:
+    target.weekday_mask = weekdays_to_mask(target.weekdays or [])
+
 
 
 class Booking(SQLModel, table=True):
+    """관계는 기본으로 selectin 로딩한다. 엔드포인트에서는 `loaders` 의 프로필로 필요한 만큼만 읽는다."""
+
     __tablename__ = "bookings"
 
     id: int = Field(default=None, primary_key=True)
@@ -122,18 +145,21 @@ class Booking(SQLModel, table=True):
     time_slot_id: int = Field(foreign_key="time_slots.id")
     time_slot: TimeSlot = Relationship(
         back_populates="bookings",
-        sa_relationship_kwargs={"lazy": "joined"},
+        sa_relationship_kwargs={"lazy": "selectin"},
     )
 
+    # time_slot.calendar_id 의 비정규화 사본. 호스트의 예약 목록을 인덱스 하나로 조회한다.
+    calendar_id: int = Field(foreign_key="calendars.id", description="캘린더 ID")
+
     guest_id: int = Field(foreign_key="users.id")
     guest: "User" = Relationship(
         back_populates="bookings",
-        sa_relationship_kwargs={"lazy": "joined"},
+        sa_relationship_kwargs={"lazy": "selectin"},
     )
 
     files: list["BookingFile"] = Relationship(
         back_populates="booking",
-        sa_relationship_kwargs={"lazy": "joined"},
+        sa_relationship_kwargs={"lazy": "selectin"},
     )
 
     google_event_id: str | None = Field(
@@ -144,8 +170,10 @@ class Booking(SQLModel, table=True):
         sa_type=String,
     )
 
+    # 커서 페이지네이션이 created_at 을 저장된 문자열 그대로 비교하므로 ORM 에서 값을 넣는다.
+    # SQLite 의 CURRENT_TIMESTAMP 는 초 단위까지만 저장해서 마이크로초를 붙이는 SQLAlchemy 와 형식이 다르다.
     created_at: AwareDatetime = Field(
-        default=None,
+        default_factory=_utcnow,
         nullable=False,
         sa_type=UtcDateTime,
         sa_column_kwargs={
@@ -171,8 +199,117 @@ class Booking(SQLModel, table=True):
         return self.time_slot.calendar.host
 
 
+# 게스트 예약 목록: guest_id 로 거르고 (when, created_at, id) 역순 정렬. id 까지 넣어야 커서
+# 페이지네이션의 마지막 정렬 키를 따로 정렬하지 않는다.
+Index(
+    "ix_bookings_guest_id_when_created_at_id",
+    Booking.__table__.c.guest_id,
+    Booking.__table__.c.when.desc(),
+    Booking.__table__.c.created_at.desc(),
+    Booking.__table__.c.id.desc(),
+)
+# 월 단위 예약 조회: when 반열린 구간
+Index(
+    "ix_bookings_when",
+    Booking.__table__.c.when,
+)
+# 호스트 예약 목록: calendar_id 로 거르고 (when, created_at, id) 역순 정렬
+Index(
+    "ix_bookings_calendar_id_when_created_at_id",
+    Booking.__table__.c.calendar_id,
+    Booking.__table__.c.when.desc(),
+    Booking.__table__.c.created_at.desc(),
+    Booking.__table__.c.id.desc(),
+)
+# 예약 중복 확인: time_slot_id, when 일치
+Index(
+    "ix_bookings_time_slot_id_when",
+    Booking.__table__.c.time_slot_id,
+    Booking.__table__.c.when,
+)
+
+
+@event.listens_for(Booking, "before_insert")
+@event.listens_for(Booking, "before_update")
+def sync_booking_calendar_id(mapper, connection, target: Booking) -> None:
+    """calendar_id 를 직접 지정하지 않은 채 타임슬롯이 정해지거나 바뀌면 타임슬롯의 캘린더로 맞춘다."""
+    state = inspect(target)
+    if state.attrs.calendar_id.history.added:
+        return
+    if target.calendar_id is not None and not state.attrs.time_slot_id.history.has_changes():
+        return
+
+    time_slot = target.__dict__.get("time_slot")
+    if time_slot is not None and time_slot.id in (None, target.time_slot_id) and time_slot.calendar_id is not None:
+        target.calendar_id = time_slot.calendar_id
+    else:
+        target.calendar_id = (
+            select(TimeSlot.calendar_id)
+            .where(TimeSlot.id == target.time_slot_id)
+            .scalar_subquery()
+        )
+
+
+class BookingCounter(SQLModel, table=True):
+    """게스트/캘린더별 예약 수. 목록 조회 때마다 COUNT(*) 를 하지 않도록 예약 생성/취소 시 함께 갱신한다."""
+
+    __tablename__ = "booking_counters"
+    __table_args__ = (
+        UniqueConstraint("scope", "owner_id", name="uq_booking_counters_scope_owner_id"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+    scope: BookingCounterScope = Field(description="집계 대상 종류", sa_type=String)
+    owner_id: int = Field(description="게스트 ID 또는 캘린더 ID")
+    booking_count: int = Field(default=0, description="전체 예약 수")
+    cancelled_count: int = Field(default=0, description="취소된 예약 수")
+
+    updated_at: AwareDatetime = Field(
+        default=None,
+        nullable=False,
+        sa_type=UtcDateTime,
+        sa_column_kwargs={
+            "server_default": func.now(),
+            "onupdate": lambda: datetime.now(timezone.utc),
+        },
+    )
+
+
+def booking_counter_decrement(
+    scope: BookingCounterScope,
+    owner_id: int,
+    booking_count: int,
+    cancelled_count: int,
+) -> Update:
+    """지운 예약만큼 집계를 줄인다. 집계 행이 없으면 다음 갱신 때 실제 예약 수로 만든다."""
+    return (
+        update(BookingCounter)
+        .where(BookingCounter.scope == scope.value)
+        .where(BookingCounter.owner_id == owner_id)
+        .values(
+            booking_count=BookingCounter.booking_count - booking_count,
+            cancelled_count=BookingCounter.cancelled_count - cancelled_count,
+            updated_at=func.now(),
+        )
+    )
+
+
+@event.listens_for(Booking, "after_delete")
+def decrement_booking_counters(mapper, connection, target: Booking) -> None:
+    """관리자 화면처럼 ORM 으로 지운 예약을 같은 트랜잭션에서 집계에서 뺀다."""
+    cancelled = int(target.attendance_status == AttendanceStatus.CANCELLED.value)
+    for scope, owner_id in (
+        (BookingCounterScope.GUEST, target.guest_id),
+        (BookingCounterScope.CALENDAR, target.calendar_id),
+    ):
+        connection.execute(booking_counter_decrement(scope, owner_id, 1, cancelled))
+
+
 class BookingFile(SQLModel, table=True):
     __tablename__ = "booking_files"
+    __table_args__ = (
+        Index("ix_booking_files_booking_id", "booking_id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     booking_id: int = Field(foreign_key="bookings.id")
@@ -194,3 +331,95 @@ class BookingFile(SQLModel, table=True):
 
     def __str__(self):
         return self.file.name
+
+
+class GoogleEventMirror(SQLModel, table=True):
+    """호스트 구글 캘린더 일정의 로컬 사본. `google_sync` 가 증분 동기화(syncToken)로 채운다."""
+
+    __tablename__ = "google_event_mirror"
+    __table_args__ = (
+        UniqueConstraint("google_calendar_id", "event_id", name="uq_google_event_mirror_calendar_event"),
+        Index("ix_google_event_mirror_calendar_start_at", "google_calendar_id", "start_at"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+    google_calendar_id: str = Field(max_length=1024, description="Google Calendar ID")
+    event_id: str = Field(max_length=1024, description="Google Calendar Event ID")
+    start: dict = Field(sa_type=JSON().with_variant(JSONB(astext_type=Text()), "postgresql"))
+    end: dict = Field(sa_type=JSON().with_variant(JSONB(astext_type=Text()), "postgresql"))
+    # 월 단위 조회용. 종일 일정은 UTC 자정으로 맞춘다.
+    start_at: AwareDatetime = Field(sa_type=UtcDateTime, description="일정 시작 일시")
+    end_at: AwareDatetime = Field(sa_type=UtcDateTime, description="일정 종료 일시")
+
+    updated_at: AwareDatetime = Field(
+        default=None,
+        nullable=False,
+        sa_type=UtcDateTime,
+        sa_column_kwargs={
+            "server_default": func.now(),
+            "onupdate": lambda: datetime.now(timezone.utc),
+        },
+    )
+
+
+class GoogleCalendarSyncState(SQLModel, table=True):
+    """캘린더별 증분 동기화 위치. sync_token 이 있으면 미러가 채워진 것으로 본다."""
+
+    __tablename__ = "google_calendar_sync_states"
+
+    id: int = Field(default=None, primary_key=True)
+    google_calendar_id: str = Field(max_length=1024, unique=True, description="Google Calendar ID")
+    sync_token: str | None = Field(default=None, sa_type=Text, nullable=True, description="다음 증분 동기화 토큰")
+    synced_at: AwareDatetime | None = Field(default=None, sa_type=UtcDateTime, nullable=True)
+
+
+class GoogleCalendarChannel(SQLModel, table=True):
+    """Google `events.watch` 알림 채널. 만료 전에 `google_channels` 가 새 채널로 바꾼다."""
+
+    __tablename__ = "google_calendar_channels"
+
+    id: int = Field(default=None, primary_key=True)
+    google_calendar_id: str = Field(max_length=1024, index=True, description="Google Calendar ID")
+    channel_id: str = Field(max_length=64, unique=True, description="채널을 열 때 정한 ID")
+    resource_id: str = Field(max_length=1024, description="Google 이 알려준 감시 대상 ID")
+    token: str = Field(max_length=128, description="알림 요청을 확인할 비밀 값")
+    expires_at: AwareDatetime = Field(sa_type=UtcDateTime, description="채널 만료 일시")
+
+    created_at: AwareDatetime = Field(
+        default=None,
+        nullable=False,
+        sa_type=UtcDateTime,
+        sa_column_kwargs={
+            "server_default": func.now(),
+        },
+    )
+
+
+class GoogleCalendarOutbox(SQLModel, table=True):
+    """예약 변경과 같은 트랜잭션에 기록하는 구글 캘린더 반영 작업. `outbox` 워커가 처리한다.
+
+    일정 내용은 처리하는 시점의 예약에서 읽으므로, 같은 예약의 작업은 먼저 들어온 것부터 처리한다.
+    """
+
+    __tablename__ = "google_calendar_outbox"
+    __table_args__ = (
+        Index("ix_google_calendar_outbox_status_available_at", "status", "available_at"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+    booking_id: int = Field(index=True, description="예약 ID. 예약이 지워져도 작업은 남는다.")
+    action: OutboxAction = Field(description="작업 종류", sa_type=String)
+    google_calendar_id: str = Field(max_length=1024, description="Google Calendar ID")
+    # 생성은 미리 정한 ID 로 만들어 재시도해도 중복되지 않게 하고, 삭제는 예약이 없어도 지울 수 있게 한다.
+    event_id: str | None = Field(default=None, max_length=1024, description="Google Calendar Event ID")
+    dates: list[str] = Field(
+        default_factory=list,
+        sa_type=JSON().with_variant(JSONB(astext_type=Text()), "postgresql"),
+        description="일정 캐시를 지울 날짜",
+    )
+    status: OutboxStatus = Field(default=OutboxStatus.PENDING, description="작업 상태", sa_type=String)
+    attempts: int = Field(default=0, description="실패한 횟수")
+    available_at: AwareDatetime = Field(default_factory=_utcnow, sa_type=UtcDateTime, description="다음 처리 가능 일시")
+    last_error: str | None = Field(default=None, sa_type=Text, nullable=True)
+
+    created_at: AwareDatetime = Field(default_factory=_utcnow, sa_type=UtcDateTime)
@@ -0,0 +1,429 @@
+"""구글 캘린더 반영 작업(transactional outbox).
+
+예약을 바꾸는 트랜잭션에서 `enqueue_google_event` 로 작업을 함께 기록하고, 워커가 따로 처리한다.
+워커는 가져온 작업을 Google batch 요청으로 모아 보낸다. 실패하면 지수 백오프로 다시 시도하고, `MAX_ATTEMPTS` 번 넘게 실패하면 FAILED 로 남긴다.
+앱 lifespan 에서 `OutboxWorker` 를 띄우거나 따로 실행한다. 대기 중인 작업 수, 포기한 작업 수,
+대기 시간은 `GET /google-calendar/outbox/metrics` 로 수집한다.
+
+    python -m appserver.apps.calendar.outbox
+"""
+import asyncio
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
+
+from appserver.libs.google.calendar.batch import MAX_BATCH_SIZE, BatchResult, GoogleCalendarBatch
+from appserver.libs.google.calendar.cache import google_events_cache
+from appserver.libs.google.calendar.services import GoogleCalendarService
+from appserver.libs.metrics import Gauge
+
+from .booking_events import BookingEventBus, publish_booking_event
+from .enums import BookingEventType, OutboxAction, OutboxStatus
+from .models import Booking, Calendar, GoogleCalendarOutbox
+
+MAX_ATTEMPTS = int(os.getenv("GOOGLE_CALENDAR_OUTBOX_MAX_ATTEMPTS", "8"))
+# 처리 중인 작업을 다른 워커가 가져가지 않도록 미뤄 두는 시간. 워커가 죽으면 이 시간 뒤에 다시 처리된다.
+LEASE = timedelta(minutes=5)
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts: int, base: float = 2.0, cap: float = 600.0) -> timedelta:
+    """
+    실패 횟수에 따른 다음 시도까지의 대기 시간
+
+    >>> [retry_delay(attempts).total_seconds() for attempts in (1, 2, 3, 10)]
+    [2.0, 4.0, 8.0, 600.0]
+    """
+    return timedelta(seconds=min(cap, base ** attempts))
+
+
+async def enqueue_google_event(
+    session: AsyncSession,
+    action: OutboxAction,
+    booking: Booking,
+    google_calendar_id: str,
+    *dates: date | None,
+) -> GoogleCalendarOutbox:
+    """예약 변경과 같은 트랜잭션에서 호출한다. 커밋은 호출한 쪽에서 한다.
+
+    `dates` 는 처리한 뒤 일정 캐시를 지울 날짜(변경 전 날짜 등)이다. 예약 날짜는 자동으로 포함한다.
+    """
+    if booking.id is None:
+        await session.flush()
+
+    if action == OutboxAction.CREATE:
+        # Google 일정 ID 는 base32hex(0-9, a-v) 문자만 쓸 수 있다.
+        event_id = uuid.uuid4().hex
+    else:
+        event_id = booking.google_event_id
+
+    entry = GoogleCalendarOutbox(
+        booking_id=booking.id,
+        action=action.value,
+        google_calendar_id=google_calendar_id,
+        event_id=event_id,
+        dates=sorted({d.isoformat() for d in (booking.when, *dates) if d is not None}),
+    )
+    session.add(entry)
+    return entry
+
+
+async def claim_entries(session: AsyncSession, now: datetime, limit: int) -> list[int]:
+    """처리할 작업을 골라 `LEASE` 만큼 미뤄 두고 ID 를 반환한다."""
+    stmt = (
+        select(GoogleCalendarOutbox)
+        .where(GoogleCalendarOutbox.status == OutboxStatus.PENDING.value)
+        .where(GoogleCalendarOutbox.available_at <= now)
+        .order_by(GoogleCalendarOutbox.id)
+        .limit(limit)
+    )
+    if session.get_bind().dialect.name == "postgresql":
+        stmt = stmt.with_for_update(skip_locked=True)
+    result = await session.execute(stmt)
+    entries = result.scalars().all()
+    for entry in entries:
+        entry.available_at = now + LEASE
+    await session.commit()
+    return [entry.id for entry in entries]
+
+
+async def _has_earlier_entry(session: AsyncSession, entry: GoogleCalendarOutbox) -> bool:
+    stmt = (
+        select(GoogleCalendarOutbox.id)
+        .where(GoogleCalendarOutbox.booking_id == entry.booking_id)
+        .where(GoogleCalendarOutbox.status == OutboxStatus.PENDING.value)
+        .where(GoogleCalendarOutbox.id < entry.id)
+        .limit(1)
+    )
+    result = await session.execute(stmt)
+    return result.first() is not None
+
+
+def _request_for(service: GoogleCalendarService, entry: GoogleCalendarOutbox, booking: Booking | None) -> Any | None:
+    """작업을 Google 요청으로 바꾼다. 보낼 것이 없으면(예약이 없거나 이미 반영했으면) None."""
+    if entry.action == OutboxAction.DELETE:
+        event_id = booking.google_event_id if booking is not None else entry.event_id
+        if event_id is None:
+            return None
+        return service.delete_event_request(event_id, entry.google_calendar_id)
+
+    if booking is None:
+        return None
+
+    start_datetime = datetime.combine(booking.when, booking.time_slot.start_time).astimezone(timezone.utc)
+    end_datetime = datetime.combine(booking.when, booking.time_slot.end_time).astimezone(timezone.utc)
+
+    if entry.action == OutboxAction.CREATE:
+        if booking.google_event_id is not None:
+            return None
+        return service.insert_event_request(
+            booking.topic,
+            start_datetime,
+            end_datetime,
+            google_calendar_id=entry.google_calendar_id,
+            event_id=entry.event_id,
+            description=booking.description,
+        )
+
+    if booking.google_event_id is None:
+        return None
+    return service.update_event_request(
+        booking.google_event_id,
+        start_datetime,
+        end_datetime,
+        entry.google_calendar_id,
+        summary=booking.topic,
+        description=booking.description,
+    )
+
+
+def _apply_result(entry: GoogleCalendarOutbox, booking: Booking | None, result: BatchResult) -> None:
+    """Google 응답을 예약에 반영한다. 다시 시도해야 하는 실패면 그 오류를 일으킨다."""
+    if result.ok:
+        if entry.action == OutboxAction.CREATE:
+            booking.google_event_id = result.response["id"]
+        return
+
+    status = result.error.resp.status
+    # 이미 지워진 일정
+    if entry.action == OutboxAction.DELETE and status in (404, 410):
+        return
+    # 앞선 시도에서 이미 만들어졌다.
+    if entry.action == OutboxAction.CREATE and status == 409:
+        booking.google_event_id = entry.event_id
+        return
+    raise result.error
+
+
+def _record_failure(entry: GoogleCalendarOutbox, exc: Exception, now: datetime) -> None:
+    entry.attempts += 1
+    entry.last_error = repr(exc)
+    if entry.attempts >= MAX_ATTEMPTS:
+        entry.status = OutboxStatus.FAILED.value
+    else:
+        entry.available_at = now + retry_delay(entry.attempts)
+    logger.warning(
+        "google calendar outbox #%s failed (%s/%s): %r",
+        entry.id,
+        entry.attempts,
+        MAX_ATTEMPTS,
+        exc,
+    )
+
+
+async def _send_batches(
+    batches: dict[int, GoogleCalendarBatch],
+    concurrency: int,
+) -> tuple[dict[str, BatchResult], dict[str, Exception]]:
+    """서비스마다 모은 batch 를 보낸다. batch 요청 자체가 실패해 결과가 없는 항목은 그 오류를 돌려준다."""
+    semaphore = asyncio.Semaphore(concurrency)
+    results: dict[str, BatchResult] = {}
+    errors: dict[str, Exception] = {}
+
+    async def _send(batch: GoogleCalendarBatch, keys: list[str]) -> None:
+        async with semaphore:
+            try:
+                await batch.execute()
+            except Exception as exc:
+                for key in keys:
+                    if key not in batch.results:
+                        errors[key] = exc
+            results.update(batch.results)
+
+    await asyncio.gather(*[_send(batch, batch.keys()) for batch in batches.values()])
+    return results, errors
+
+
+async def _process_wave(
+    session: AsyncSession,
+    get_service: Callable[[str], GoogleCalendarService],
+    entry_ids: list[int],
+    now: datetime,
+    concurrency: int,
+) -> tuple[list[tuple[Booking, str]], list[GoogleCalendarOutbox]]:
+    """앞선 작업이 없는 작업을 한 번에 보내고 커밋한다. (끝낸 예약과 캘린더, 앞선 작업이 남은 작업)"""
+    blocked: list[GoogleCalendarOutbox] = []
+    ready: list[tuple[GoogleCalendarOutbox, Booking | None]] = []
+    batches: dict[int, GoogleCalendarBatch] = {}
+    for entry_id in entry_ids:
+        entry = await session.get(GoogleCalendarOutbox, entry_id)
+        if entry is None or entry.status != OutboxStatus.PENDING:
+            continue
+        # 같은 예약의 앞선 작업(예: 아직 만들지 못한 일정)이 끝날 때까지 기다린다.
+        # batch 안의 요청은 순서대로 처리된다는 보장이 없으므로 같은 batch 에 넣지 않는다.
+        if await _has_earlier_entry(session, entry):
+            blocked.append(entry)
+            continue
+        booking = await session.get(Booking, entry.booking_id)
+        try:
+            service = get_service(entry.google_calendar_id)
+            request = _request_for(service, entry, booking)
+        except Exception as exc:
+            _record_failure(entry, exc, now)
+            continue
+        if request is not None:
+            if id(service) not in batches:
+                batches[id(service)] = service.batch()
+            batches[id(service)].add(str(entry.id), request)
+        ready.append((entry, booking))
+
+    results, errors = await _send_batches(batches, concurrency)
+
+    finished: list[tuple[Booking, str]] = []
+    for entry, booking in ready:
+        key = str(entry.id)
+        try:
+            if key in errors:
+                raise errors[key]
+            if key in results:
+                _apply_result(entry, booking, results[key])
+        except Exception as exc:
+            _record_failure(entry, exc, now)
+            continue
+        google_events_cache.invalidate_dates(
+            entry.google_calendar_id,
+            *[date.fromisoformat(value) for value in entry.dates],
+        )
+        if booking is not None:
+            finished.append((booking, entry.google_calendar_id))
+        await session.delete(entry)
+    # Google 에 반영한 뒤에만 예약을 바꾸므로, 커밋하지 못해도 다음 시도에서 같은 결과(409, 404 등)로 끝난다.
+    await session.commit()
+    return finished, blocked
+
+
+async def process_entries(
+    session: AsyncSession,
+    get_service: Callable[[str], GoogleCalendarService],
+    entry_ids: list[int],
+    now: datetime,
+    bus: BookingEventBus | None = None,
+    concurrency: int = 4,
+) -> int:
+    """작업을 구글 캘린더 서비스마다 batch 요청으로 모아 보내고, 끝낸 작업 수를 반환한다.
+
+    같은 예약의 작업이 여럿이면 앞선 작업을 보낸 다음 batch 로 보낸다. 다른 작업을 기다리는
+    작업은 미룬다. `bus` 를 주면 반영한 작업마다 `google_synced` 를 보내 다른 워커도 일정 캐시를
+    지우게 한다.
+    """
+    done = 0
+    while entry_ids:
+        finished, blocked = await _process_wave(session, get_service, entry_ids, now, concurrency)
+        done += len(finished)
+        if bus is not None:
+            for booking, google_calendar_id in finished:
+                await _publish_synced(session, bus, booking, google_calendar_id)
+        if not finished:
+            for entry in blocked:
+                entry.available_at = now + retry_delay(1)
+            await session.commit()
+            break
+        entry_ids = [entry.id for entry in blocked]
+    return done
+
+
+async def _publish_synced(
+    session: AsyncSession,
+    bus: BookingEventBus,
+    booking: Booking,
+    google_calendar_id: str,
+) -> None:
+    calendar = await session.get(Calendar, booking.calendar_id)
+    await publish_booking_event(
+        bus,
+        BookingEventType.GOOGLE_SYNCED,
+        booking,
+        calendar.host_id,
+        google_calendar_id=google_calendar_id,
+    )
+
+
+@dataclass
+class OutboxStats:
+    depth: int
+    failed: int
+    lag_seconds: float
+
+    def gauges(self) -> list[Gauge]:
+        return [
+            Gauge("google_calendar_outbox_depth", "구글 캘린더에 반영을 기다리는 작업 수", self.depth),
+            Gauge("google_calendar_outbox_failed", "다시 시도하지 않고 포기한 작업 수", self.failed),
+            Gauge("google_calendar_outbox_lag_seconds", "가장 오래 기다린 작업의 대기 시간(초)", self.lag_seconds),
+        ]
+
+
+async def outbox_stats(session: AsyncSession, now: datetime) -> OutboxStats:
+    """대기 중인 작업 수, 포기한 작업 수, 가장 오래 기다린 작업의 대기 시간(초)"""
+    stmt = (
+        select(GoogleCalendarOutbox.status, func.count(), func.min(GoogleCalendarOutbox.created_at))
+        .group_by(GoogleCalendarOutbox.status)
+    )
+    result = await session.execute(stmt)
+    rows = {status: (count, oldest) for status, count, oldest in result.all()}
+    depth, oldest = rows.get(OutboxStatus.PENDING.value, (0, None))
+    failed, _ = rows.get(OutboxStatus.FAILED.value, (0, None))
+    lag_seconds = (now - oldest).total_seconds() if oldest is not None else 0.0
+    return OutboxStats(depth=depth, failed=failed, lag_seconds=max(lag_seconds, 0.0))
+
+
+class OutboxWorker:
+    """아웃박스를 주기적으로 비운다.
+
+    한 번에 `batch_size` 개를 가져와 batch 요청으로 보내고, batch 요청은 `concurrency` 개까지
+    동시에 보낸다.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        get_service: Callable[[str], GoogleCalendarService],
+        concurrency: int = 4,
+        batch_size: int = MAX_BATCH_SIZE,
+        poll_interval: float = 1.0,
+        stats_interval: float = 60.0,
+        bus: BookingEventBus | None = None,
+    ):
+        self.session_factory = session_factory
+        self.get_service = get_service
+        self.bus = bus
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.stats_interval = stats_interval
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """처리할 수 있는 작업을 한 번 가져와 처리하고, 끝낸 작업 수를 반환한다."""
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            entry_ids = await claim_entries(session, now, self.batch_size)
+            if not entry_ids:
+                return 0
+            return await process_entries(session, self.get_service, entry_ids, now, self.bus, self.concurrency)
+
+    async def log_stats(self) -> OutboxStats:
+        async with self.session_factory() as session:
+            stats = await outbox_stats(session, datetime.now(timezone.utc))
+        logger.info(
+            "google calendar outbox depth=%s failed=%s lag=%.1fs",
+            stats.depth,
+            stats.failed,
+            stats.lag_seconds,
+        )
+        return stats
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_stats_at = loop.time()
+        while True:
+            try:
+                if loop.time() >= next_stats_at:
+                    await self.log_stats()
+                    next_stats_at = loop.time() + self.stats_interval
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("google calendar outbox worker error")
+                processed = 0
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def create_outbox_worker() -> OutboxWorker:
+    from appserver.db import async_session_factory
+    from appserver.libs.google.calendar.registry import google_calendar_services
+
+    from .booking_events import booking_event_bus
+
+    return OutboxWorker(
+        async_session_factory,
+        google_calendar_services.get,
+        concurrency=int(os.getenv("GOOGLE_CALENDAR_OUTBOX_CONCURRENCY", "4")),
+        poll_interval=float(os.getenv("GOOGLE_CALENDAR_OUTBOX_POLL_INTERVAL", "1")),
+        bus=booking_event_bus,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(create_outbox_worker().run())
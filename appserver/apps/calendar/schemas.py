@@ -115,6 +115,12 @@ class BookingOut(SQLModel):
 class PaginatedBookingOut(SQLModel):
     bookings: list[BookingOut]
     total_count: int
+    next_cursor: str | None = Field(default=None, description="다음 페이지 커서")
+
+
+class BookingListOut(SQLModel):
+    bookings: list[BookingOut]
+    next_cursor: str | None = Field(default=None, description="다음 페이지 커서")
 
 
 class SimpleBookingOut(SQLModel):
@@ -178,4 +184,10 @@ class GoogleCalendarEventOut(SQLModel):
         if start_date := self.start.get("date"):
             return date.fromisoformat(start_date)
         return datetime.fromisoformat(self.start.get("dateTime")).date()
+
+
+class PartialBookingsOut(SQLModel):
+    """스트림 끝에 붙이는 표시. 구글 캘린더 일정을 가져오지 못해 예약만 보냈다."""
+    partial: bool = True
+    missing: str = "google_calendar"
     
\ No newline at end of file
@@ -1,6 +1,19 @@
-from typing import Annotated
+import itertools
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Annotated, Any
 
 from fastapi import Depends
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
@@ -9,17 +22,244 @@ from sqlalchemy.ext.asyncio import (
 )
 
 
-def create_engine(dsn: str):
-    return create_async_engine(
-        dsn,
-        echo=False,
+class DatabaseSettings(BaseSettings):
+    """데이터베이스 연결 설정. `DB_` 접두사가 붙은 환경 변수로 덮어쓴다."""
+
+    model_config = SettingsConfigDict(env_prefix="DB_")
+
+    dsn: str = "sqlite+aiosqlite:///./local.db"
+    echo: bool = False
+
+    # 커넥션 풀 설정 (SQLite 에는 적용하지 않음)
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+
+    # SQLite 성능 설정. 켜면 연결마다 PRAGMA 를 실행한다.
+    sqlite_tuning: bool = False
+    sqlite_busy_timeout: int = 5000  # 밀리초
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # 바이트
+    sqlite_cache_size: int = -64000  # 음수는 KiB 단위
+
+    # 읽기 전용 복제본. 쉼표로 여러 DSN 을 구분한다.
+    replica_dsns: str = ""
+    # 사용자가 쓰기를 한 뒤 이 시간(초) 동안은 읽기도 주 DB 에서 한다.
+    read_your_writes_seconds: float = 5.0
+    # 연결에 실패한 복제본은 이 시간(초) 동안 건너뛴다.
+    replica_retry_seconds: float = 5.0
+
+    # asyncpg(PostgreSQL) 전용 설정
+    application_name: str = "appserver"
+    command_timeout: float = 60.0
+    statement_cache_size: int = 100
+
+
+def get_engine_options(dsn: str, settings: DatabaseSettings) -> dict[str, Any]:
+    """DSN 의 드라이버에 맞는 `create_async_engine` 인자를 만든다.
+
+    >>> settings = DatabaseSettings(dsn="sqlite+aiosqlite:///:memory:")
+    >>> get_engine_options(settings.dsn, settings)
+    {'echo': False}
+    >>> settings = DatabaseSettings(dsn="postgresql+asyncpg://u:p@localhost/db", pool_size=20)
+    >>> options = get_engine_options(settings.dsn, settings)
+    >>> options["pool_size"], options["max_overflow"], options["pool_pre_ping"]
+    (20, 10, True)
+    >>> options["connect_args"]["server_settings"]
+    {'application_name': 'appserver'}
+    """
+    url = make_url(dsn)
+    options: dict[str, Any] = {"echo": settings.echo}
+
+    # SQLite 는 파일/메모리 DB 라서 풀 크기나 재연결 설정이 의미가 없다.
+    if url.get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
     )
 
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "server_settings": {"application_name": settings.application_name},
+            "command_timeout": settings.command_timeout,
+            "statement_cache_size": settings.statement_cache_size,
+        }
+
+    return options
+
+
+def get_sqlite_pragmas(settings: DatabaseSettings) -> list[str]:
+    """SQLite 연결마다 실행할 PRAGMA 목록.
+
+    >>> get_sqlite_pragmas(DatabaseSettings(sqlite_busy_timeout=1000, sqlite_mmap_size=0))
+    ['PRAGMA journal_mode=WAL', 'PRAGMA synchronous=NORMAL', 'PRAGMA busy_timeout=1000', 'PRAGMA mmap_size=0', 'PRAGMA cache_size=-64000']
+    """
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+        f"PRAGMA cache_size={int(settings.sqlite_cache_size)}",
+    ]
+
+
+def install_sqlite_pragmas(async_engine: AsyncEngine, settings: DatabaseSettings) -> None:
+    pragmas = get_sqlite_pragmas(settings)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def create_engine(dsn: str | None = None, settings: DatabaseSettings | None = None) -> AsyncEngine:
+    settings = settings or DatabaseSettings()
+    dsn = dsn or settings.dsn
+    async_engine = create_async_engine(dsn, **get_engine_options(dsn, settings))
+
+    if settings.sqlite_tuning and async_engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(async_engine, settings)
+
+    return async_engine
+
+
+def get_replica_dsns(settings: DatabaseSettings) -> list[str]:
+    """
+    >>> get_replica_dsns(DatabaseSettings(replica_dsns=""))
+    []
+    >>> get_replica_dsns(DatabaseSettings(replica_dsns="postgresql+asyncpg://r1/db, postgresql+asyncpg://r2/db"))
+    ['postgresql+asyncpg://r1/db', 'postgresql+asyncpg://r2/db']
+    """
+    return [dsn.strip() for dsn in settings.replica_dsns.split(",") if dsn.strip()]
+
+
+READ_YOUR_WRITES_COOKIE = "read_your_writes"
+
+
+def parse_read_your_writes_cookie(value: str | None) -> float:
+    """쿠키에 담긴 만료 시각(epoch 초)을 읽는다. 값이 없거나 잘못되면 0 이다.
+
+    >>> parse_read_your_writes_cookie("1733212800.500")
+    1733212800.5
+    >>> parse_read_your_writes_cookie(None), parse_read_your_writes_cookie("nan"), parse_read_your_writes_cookie("x")
+    (0.0, 0.0, 0.0)
+    """
+    try:
+        until = float(value or 0)
+    except ValueError:
+        return 0.0
+    return until if math.isfinite(until) else 0.0
+
+
+@dataclass
+class ReadYourWrites:
+    """요청 하나의 read-your-writes 상태.
+
+    쓰기를 커밋하면 만료 시각을 쿠키로 내려보내고, 클라이언트가 다음 요청에 그 쿠키를
+    들고 오면 어느 워커가 받든 만료 시각까지는 읽기도 주 DB 에서 한다.
+    """
+
+    until: float = 0.0
+    wrote: bool = False
+
+    def mark(self, window: float, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        self.until = max(self.until, now + window)
+        self.wrote = True
+
+    def is_recent(self, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        return self.until > now
+
+
+current_read_your_writes: ContextVar[ReadYourWrites | None] = ContextVar("current_read_your_writes", default=None)
+
+
+class ReadYourWritesMiddleware:
+    """요청의 read-your-writes 쿠키를 `current_read_your_writes` 에 설정하고,
+    요청 중에 쓰기를 커밋했으면 응답에 새 쿠키를 붙인다.
+    """
+
+    def __init__(self, app: ASGIApp, window: float | None = None):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        state = ReadYourWrites(
+            until=parse_read_your_writes_cookie(HTTPConnection(scope).cookies.get(READ_YOUR_WRITES_COOKIE))
+        )
+        window = settings.read_your_writes_seconds if self.window is None else self.window
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.wrote:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={state.until:.3f}; Max-Age={math.ceil(window)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        token = current_read_your_writes.set(state)
+        try:
+            await self.app(scope, receive, send_with_cookie if scope["type"] == "http" else send)
+        finally:
+            current_read_your_writes.reset(token)
+
+
+class PrimarySession(Session):
+    """주 DB 세션. 쓰기가 커밋되면 read-your-writes 기록을 남긴다."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flag_flushed_writes(session: Session, flush_context) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _flag_executed_writes(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _remember_client_write(session: Session) -> None:
+    if not session.info.pop("has_writes", False):
+        return
+
+    state = current_read_your_writes.get()
+    if state is not None:
+        state.mark(settings.read_your_writes_seconds)
+
 
 def create_session(async_engine: AsyncEngine | None = None):
     if async_engine is None:
         async_engine = create_engine()
 
+    return async_sessionmaker(
+        async_engine,
+        expire_on_commit=False,
+        autoflush=False,
+        class_=AsyncSession,
+        sync_session_class=PrimarySession,
+    )
+
+
+def create_read_session(async_engine: AsyncEngine):
     return async_sessionmaker(
         async_engine,
         expire_on_commit=False,
@@ -35,8 +275,64 @@ async def use_session():
 DbSessionDep = Annotated[AsyncSession, Depends(use_session)]
 
 
-DSN = "sqlite+aiosqlite:///./local.db"
+def use_session_factory() -> async_sessionmaker[AsyncSession]:
+    """의존성으로 받은 세션은 응답을 보내기 전에 닫힌다. 스트리밍 응답은 이 팩토리로 세션을 따로 연다."""
+    return async_session_factory
+
+SessionFactoryDep = Annotated[async_sessionmaker[AsyncSession], Depends(use_session_factory)]
+
+
+async def open_read_session() -> AsyncSession:
+    """복제본 세션을 연다. 복제본이 없거나, 최근에 쓰기를 했거나, 모든 복제본에
+    연결할 수 없으면 주 DB 세션을 연다.
+
+    연결에 실패한 복제본은 `replica_retry_seconds` 동안 건너뛰어서, 복제본이 죽어 있는
+    동안 요청마다 연결 시도를 기다리지 않게 한다.
+    """
+    state = current_read_your_writes.get()
+    if replica_session_factories and not (state is not None and state.is_recent()):
+        start = next(_replica_counter)
+        for offset in range(len(replica_session_factories)):
+            factory = replica_session_factories[(start + offset) % len(replica_session_factories)]
+            if _replica_unavailable_until.get(factory, 0.0) > time.monotonic():
+                continue
+
+            session = factory()
+            try:
+                await session.connection()
+            except (DBAPIError, OSError):
+                await session.close()
+                _replica_unavailable_until[factory] = time.monotonic() + settings.replica_retry_seconds
+                continue
+
+            _replica_unavailable_until.pop(factory, None)
+            return session
+
+    return async_session_factory()
+
 
-engine = create_engine(DSN)
+async def use_read_session():
+    session = await open_read_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+ReadDbSessionDep = Annotated[AsyncSession, Depends(use_read_session)]
+
+
+settings = DatabaseSettings()
+
+DSN = settings.dsn
+
+engine = create_engine(DSN, settings)
 
 async_session_factory = create_session(engine)
+
+replica_engines = [create_engine(dsn, settings) for dsn in get_replica_dsns(settings)]
+
+replica_session_factories = [create_read_session(replica_engine) for replica_engine in replica_engines]
+
+_replica_counter = itertools.count()
+
+_replica_unavailable_until: dict[async_sessionmaker[AsyncSession], float] = {}
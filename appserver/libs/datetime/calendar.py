@@ -35,6 +35,53 @@ def get_last_day_of_month(year, month):
     return result.day
 
 
+def get_month_range(year, month):
+    """
+    월의 첫날과 다음 달 첫날을 반열린 구간 [start, end) 으로 가져옴
+    `start <= 컬럼 < end` 로 비교하면 컬럼의 인덱스를 사용할 수 있다.
+
+    >>> get_month_range(2024, 2)
+    (datetime.date(2024, 2, 1), datetime.date(2024, 3, 1))
+    >>> get_month_range(2024, 12)
+    (datetime.date(2024, 12, 1), datetime.date(2025, 1, 1))
+    """
+    start = date(year, month, 1)
+    if month == 12:
+        end = date(year + 1, 1, 1)
+    else:
+        end = date(year, month + 1, 1)
+    return start, end
+
+
+def weekday_bit(weekday: int) -> int:
+    """
+    요일(월요일=0 ~ 일요일=6)의 비트 값
+
+    >>> weekday_bit(0)
+    1
+    >>> weekday_bit(6)
+    64
+    """
+    return 1 << weekday
+
+
+def weekdays_to_mask(weekdays) -> int:
+    """
+    요일 목록을 비트마스크로 변환. `mask & weekday_bit(요일)` 로 포함 여부를 확인한다.
+
+    >>> weekdays_to_mask([])
+    0
+    >>> weekdays_to_mask([0, 2, 2])
+    5
+    >>> weekdays_to_mask(range(7))
+    127
+    """
+    mask = 0
+    for weekday in weekdays:
+        mask |= weekday_bit(weekday)
+    return mask
+
+
 def get_range_days_of_month(year, month):
     """월의 일수를 가져옴
 
@@ -0,0 +1,161 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
+
+from googleapiclient.errors import HttpError
+
+from .resilience import RETRYABLE_STATUSES, backoff_delay
+
+if TYPE_CHECKING:
+    from .services import GoogleCalendarService
+
+# Google Calendar API 가 한 batch 요청에 받는 최대 요청 수
+MAX_BATCH_SIZE = 50
+
+
+@dataclass
+class BatchResult:
+    key: str
+    response: Any = None
+    error: HttpError | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def retryable(self) -> bool:
+        return self.error is not None and self.error.resp.status in RETRYABLE_STATUSES
+
+
+class GoogleCalendarBatch:
+    """여러 일정 변경을 모아 Google batch 요청으로 보낸다. `max_batch_size` 개씩 나눠 보낸다.
+
+    결과는 키로 찾는다. 수정/삭제는 `event_id`(`Booking.google_event_id`)가, 생성은
+    호출한 쪽이 준 키가 결과의 키가 된다. 한 건이 실패해도 나머지는 그대로 반영된다.
+
+    429/5xx 로 실패한 항목만 모아 서비스의 `max_retries` 번까지 다시 보낸다. 다시 보내도 일정이
+    중복되지 않도록 생성 요청은 일정 ID 를 정해야 한다(이미 만들어졌으면 409).
+
+        async with service.batch() as batch:
+            for booking in bookings:
+                batch.delete_event(booking.google_event_id)
+        failed = [key for key, result in batch.results.items() if not result.ok]
+    """
+
+    def __init__(self, service: "GoogleCalendarService", max_batch_size: int = MAX_BATCH_SIZE):
+        if not 0 < max_batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"max_batch_size must be between 1 and {MAX_BATCH_SIZE}")
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.results: dict[str, BatchResult] = {}
+        self._requests: list[tuple[str, Any]] = []
+        self._keys: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def keys(self) -> list[str]:
+        """보낼 요청의 키"""
+        return [key for key, _ in self._requests]
+
+    def add(self, key: str, request: Any) -> None:
+        if key in self._keys:
+            raise ValueError(f"duplicate batch key: {key}")
+        if _is_insert_without_id(request):
+            raise ValueError(f"batched insert needs an event id: {key}")
+        self._keys.add(key)
+        self._requests.append((key, request))
+
+    def create_event(
+        self,
+        key: str,
+        summary: str,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        *,
+        event_id: str,
+        google_calendar_id: Optional[str] = None,
+        **event_options: Any,
+    ) -> None:
+        self.add(key, self.service.insert_event_request(
+            summary,
+            start_datetime,
+            end_datetime,
+            google_calendar_id=google_calendar_id,
+            event_id=event_id,
+            **event_options,
+        ))
+
+    def update_event(
+        self,
+        event_id: str,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        google_calendar_id: Optional[str] = None,
+        **event_options: Any,
+    ) -> None:
+        self.add(event_id, self.service.update_event_request(
+            event_id,
+            start_datetime,
+            end_datetime,
+            google_calendar_id,
+            **event_options,
+        ))
+
+    def delete_event(self, event_id: str, google_calendar_id: Optional[str] = None) -> None:
+        self.add(event_id, self.service.delete_event_request(event_id, google_calendar_id))
+
+    async def execute(self) -> dict[str, BatchResult]:
+        requests, self._requests = self._requests, []
+        chunks = [
+            requests[start:start + self.max_batch_size]
+            for start in range(0, len(requests), self.max_batch_size)
+        ]
+        # 한 묶음이 실패해도 나머지 묶음의 결과는 모두 받은 뒤 실패를 알린다.
+        outcomes = await asyncio.gather(
+            *[self._execute_chunk(chunk) for chunk in chunks],
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return self.results
+
+    async def _execute_chunk(self, chunk: list[tuple[str, Any]]) -> None:
+        attempt = 0
+        while True:
+            attempt += 1
+            # batch 요청 자체가 실패하면 서비스가 통째로 다시 보낸다. 생성 요청은 ID 를 정했으므로 안전하다.
+            await self._send_chunk(chunk)
+            chunk = [(key, request) for key, request in chunk if self.results[key].retryable]
+            if not chunk or attempt > self.service.max_retries:
+                return
+            await asyncio.sleep(backoff_delay(attempt))
+
+    async def _send_chunk(self, chunk: list[tuple[str, Any]]) -> None:
+        keys = {str(index): key for index, (key, _) in enumerate(chunk)}
+
+        def _callback(request_id: str, response: Any, exception: HttpError | None) -> None:
+            key = keys[request_id]
+            self.results[key] = BatchResult(key=key, response=response, error=exception)
+
+        batch_request = self.service.service.new_batch_http_request(callback=_callback)
+        for request_id, (_, request) in enumerate(chunk):
+            batch_request.add(request, request_id=str(request_id))
+        await self.service.execute(batch_request)
+
+    async def __aenter__(self) -> "GoogleCalendarBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.execute()
+
+
+def _is_insert_without_id(request: Any) -> bool:
+    if getattr(request, "methodId", None) != "calendar.events.insert":
+        return False
+    return not json.loads(getattr(request, "body", None) or "{}").get("id")
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Awaitable, Callable, Iterable
+
+from .schemas import CalendarEvent
+
+EventListKey = tuple[str, int, int]
+
+
+@dataclass
+class _Entry:
+    events: list[CalendarEvent]
+    fetched_at: float
+    refreshing: asyncio.Task | None = field(default=None, repr=False)
+
+
+class EventListCache:
+    """(google_calendar_id, year, month) 단위 Google 일정 목록 캐시.
+
+    - `ttl` 초 동안은 캐시를 그대로 쓴다.
+    - 그 뒤 `stale_ttl` 초 동안은 캐시를 바로 돌려주고 백그라운드에서 새로 읽는다.
+    - 그보다 오래됐거나 없으면 읽어 올 때까지 기다린다. 같은 키를 동시에 읽지 않는다.
+    - 최대 `max_entries` 개까지 보관하고, 가장 오래 쓰지 않은 항목부터 버린다.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        stale_ttl: float = 300,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[EventListKey, _Entry] = OrderedDict()
+        # 진행 중인 조회와 그 조회를 시작할 때의 캘린더 버전
+        self._pending: dict[EventListKey, tuple[int, asyncio.Future]] = {}
+        # 무효화하면 캘린더 버전을 올린다. 그 전에 시작한 조회는 결과를 저장하지 않고,
+        # 무효화한 뒤에 온 요청이 그 조회를 함께 기다리지도 않는다.
+        self._versions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_fetch(
+        self,
+        key: EventListKey,
+        fetch: Callable[[], Awaitable[list[CalendarEvent]]],
+    ) -> list[CalendarEvent]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self.clock() - entry.fetched_at
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                if age >= self.ttl and entry.refreshing is None:
+                    entry.refreshing = asyncio.create_task(self._refresh(key, fetch))
+                return entry.events
+
+        version = self._versions.get(key[0], 0)
+        pending = self._pending.get(key)
+        if pending is not None and pending[0] == version:
+            return await asyncio.shield(pending[1])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = (version, future)
+        try:
+            events = await self._fetch_and_store(key, fetch, version)
+        except Exception as exc:
+            future.set_exception(exc)
+            # 기다리는 쪽이 없어도 "exception was never retrieved" 경고가 나지 않게 한다.
+            future.exception()
+            raise
+        else:
+            future.set_result(events)
+            return events
+        finally:
+            if not future.done():
+                future.cancel()
+            # 무효화된 뒤 새 조회가 자리를 차지했으면 그 조회는 남겨 둔다.
+            if self._pending.get(key, (None, None))[1] is future:
+                del self._pending[key]
+
+    async def _fetch_and_store(
+        self,
+        key: EventListKey,
+        fetch: Callable[[], Awaitable[list[CalendarEvent]]],
+        version: int,
+    ) -> list[CalendarEvent]:
+        events = await fetch()
+        if self._versions.get(key[0], 0) == version:
+            self._store(key, events)
+        return events
+
+    async def _refresh(self, key: EventListKey, fetch: Callable[[], Awaitable[list[CalendarEvent]]]) -> None:
+        try:
+            await self._fetch_and_store(key, fetch, self._versions.get(key[0], 0))
+        except Exception:
+            # 새로 읽지 못하면 남은 stale 기간 동안 기존 값을 계속 쓴다.
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = None
+
+    def _store(self, key: EventListKey, events: list[CalendarEvent]) -> None:
+        self._entries[key] = _Entry(events=events, fetched_at=self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, google_calendar_id: str, months: Iterable[tuple[int, int]] | None = None) -> None:
+        """캘린더의 지정한 달(없으면 전체) 캐시를 지운다."""
+        self._versions[google_calendar_id] = self._versions.get(google_calendar_id, 0) + 1
+        if months is None:
+            keys = [key for key in self._entries if key[0] == google_calendar_id]
+        else:
+            keys = [(google_calendar_id, year, month) for year, month in months]
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def invalidate_dates(self, google_calendar_id: str, *dates: date | None) -> None:
+        self.invalidate(google_calendar_id, {(d.year, d.month) for d in dates if d is not None})
+
+    def clear(self) -> None:
+        for google_calendar_id in {key[0] for key in [*self._entries, *self._pending]}:
+            self._versions[google_calendar_id] = self._versions.get(google_calendar_id, 0) + 1
+        self._entries.clear()
+
+
+google_events_cache = EventListCache(
+    ttl=float(os.getenv("GOOGLE_EVENTS_CACHE_TTL", "60")),
+    stale_ttl=float(os.getenv("GOOGLE_EVENTS_CACHE_STALE_TTL", "300")),
+    max_entries=int(os.getenv("GOOGLE_EVENTS_CACHE_MAX_ENTRIES", "256")),
+)
@@ -0,0 +1,49 @@
+from typing import TYPE_CHECKING, Any, AsyncIterator, Generator
+
+from .schemas import CalendarEvent
+
+if TYPE_CHECKING:
+    from .services import GoogleCalendarService
+
+# 예약 화면(GoogleCalendarEventOut)에 필요한 필드만 받는다. 참석자, 알림, 회의 정보 등은 받지 않는다.
+EVENT_LIST_FIELDS = "nextPageToken,items(id,status,summary,start,end)"
+# Google Calendar API 의 events.list 가 한 페이지에 돌려주는 최대 일정 수
+MAX_PAGE_SIZE = 2500
+
+
+class EventListing:
+    """일정 목록. `nextPageToken` 을 따라 필요할 때 다음 페이지를 읽는다.
+
+    페이지가 도착하는 대로 쓰거나, 모든 페이지를 모아 한 번에 받을 수 있다.
+
+        async for page in service.event_list(time_min, time_max).pages():
+            ...
+        async for event in service.event_list(time_min, time_max):
+            ...
+        events = await service.event_list(time_min, time_max)
+    """
+
+    def __init__(self, service: "GoogleCalendarService", params: dict[str, Any]):
+        self.service = service
+        self.params = params
+
+    async def pages(self) -> AsyncIterator[list[CalendarEvent]]:
+        page_token = None
+        while True:
+            params = {**self.params, "pageToken": page_token} if page_token else self.params
+            result = await self.service.execute(self.service.service.events().list(**params))
+            yield result.get("items", [])
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return
+
+    async def __aiter__(self) -> AsyncIterator[CalendarEvent]:
+        async for page in self.pages():
+            for event in page:
+                yield event
+
+    async def all(self) -> list[CalendarEvent]:
+        return [event async for event in self]
+
+    def __await__(self) -> Generator[Any, None, list[CalendarEvent]]:
+        return self.all().__await__()
@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .resilience import CircuitBreaker
+from .services import (
+    GOOGLE_CALENDAR_API_ENDPOINT,
+    GOOGLE_SERVICE_ACCOUNT_CREDENTIAL_PATH,
+    GoogleCalendarService,
+    build_calendar_client,
+    load_calendar_discovery_document,
+)
+
+
+class GoogleCalendarServiceRegistry:
+    """워커 프로세스마다 인증 정보와 discovery 클라이언트를 한 번만 만들어 재사용한다.
+
+    앱의 lifespan 에서 `warm_up` 으로 미리 만들고, 종료할 때 `close` 한다.
+    lifespan 없이 쓰이면(테스트 등) 처음 요청할 때 만든다.
+
+    Google API 호출은 `max_workers` 개로 제한한 스레드 풀에서 실행한다.
+    """
+
+    def __init__(
+        self,
+        credentials_path: Path = GOOGLE_SERVICE_ACCOUNT_CREDENTIAL_PATH,
+        default_google_calendar_id: str | None = None,
+        max_workers: int = 8,
+        timeout: float = 10.0,
+        max_retries: int = 2,
+        api_endpoint: str | None = GOOGLE_CALENDAR_API_ENDPOINT,
+    ):
+        self.credentials_path = credentials_path
+        self.default_google_calendar_id = default_google_calendar_id
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        # 설정하면 Google 대신 대역 서버(tests/support/fake_google_calendar.py)를 부른다.
+        self.api_endpoint = api_endpoint
+        # 모든 캘린더가 같은 Google API 를 부르므로 차단기는 하나를 같이 쓴다.
+        self.circuit_breaker = CircuitBreaker()
+        self._client: Any | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._services: dict[str, GoogleCalendarService] = {}
+
+    def get_client(self) -> Any:
+        if self._client is None:
+            self._client = build_calendar_client(
+                self.credentials_path,
+                load_calendar_discovery_document(self.api_endpoint),
+                api_endpoint=self.api_endpoint,
+            )
+        return self._client
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="google-calendar",
+            )
+        return self._executor
+
+    def get(self, google_calendar_id: str | None = None) -> GoogleCalendarService:
+        google_calendar_id = google_calendar_id or self.default_google_calendar_id
+        if google_calendar_id is None:
+            raise ValueError("GOOGLE_CALENDAR_ID is not set")
+
+        service = self._services.get(google_calendar_id)
+        if service is None:
+            service = GoogleCalendarService(
+                google_calendar_id,
+                credentials_path=self.credentials_path,
+                service=self.get_client(),
+                executor=self.get_executor(),
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                circuit_breaker=self.circuit_breaker,
+            )
+            self._services[google_calendar_id] = service
+        return service
+
+    def warm_up(self) -> bool:
+        """인증 파일이 없으면 건너뛰고 False 를 반환한다. 이때는 요청 시점에 오류가 난다."""
+        if not self.api_endpoint and not self.credentials_path.exists():
+            return False
+        self.get_client()
+        return True
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._client is not None:
+            self._client.close()
+        self._executor = None
+        self._client = None
+        self._services.clear()
+
+
+google_calendar_services = GoogleCalendarServiceRegistry(
+    default_google_calendar_id=os.getenv("GOOGLE_CALENDAR_ID"),
+    max_workers=int(os.getenv("GOOGLE_CALENDAR_MAX_WORKERS", "8")),
+    timeout=float(os.getenv("GOOGLE_CALENDAR_TIMEOUT", "10")),
+    max_retries=int(os.getenv("GOOGLE_CALENDAR_MAX_RETRIES", "2")),
+)
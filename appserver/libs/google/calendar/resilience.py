@@ -0,0 +1,101 @@
+import random
+import time
+from typing import Callable
+
+# 잠시 뒤 다시 시도하면 성공할 수 있는 응답
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class GoogleCalendarUnavailableError(Exception):
+    """Google Calendar 가 제때 응답하지 않았거나 회로가 열려 있어 호출하지 않았다."""
+
+
+class CircuitOpenError(GoogleCalendarUnavailableError):
+    pass
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = 0.2,
+    cap: float = 2.0,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    """
+    재시도 전 대기 시간(초). 여러 요청이 한꺼번에 다시 몰리지 않도록 0 과 상한 사이에서 고른다.
+
+    >>> backoff_delay(1, rand=lambda: 1.0)
+    0.2
+    >>> backoff_delay(3, rand=lambda: 0.5)
+    0.4
+    >>> backoff_delay(10, rand=lambda: 1.0)
+    2.0
+    """
+    return rand() * min(cap, base * 2 ** (attempt - 1))
+
+
+class CircuitBreaker:
+    """연속으로 `failure_threshold` 번 실패하면 `reset_timeout` 초 동안 호출을 막는다.
+
+    그 뒤에는 한 번만 시험 삼아 호출하게 하고, 성공하면 닫고 실패하면 다시 연다.
+
+    >>> now = [0.0]
+    >>> breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+    >>> breaker.record_failure(); breaker.record_failure()
+    >>> breaker.allow()
+    False
+    >>> now[0] = 31
+    >>> breaker.allow(), breaker.allow()
+    (True, False)
+    >>> breaker.record_success()
+    >>> breaker.state
+    'closed'
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """시험 호출이 결과 없이 취소되면 다음 호출이 다시 시험할 수 있게 한다."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            self._opened_at = self.clock()
+        self._probing = False
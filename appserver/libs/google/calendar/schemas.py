@@ -91,3 +91,15 @@ class CalendarEvent(SQLModel):
     updated: str  # ISO 8601
 
 
+class EventListPage(TypedDict, total=False):
+    items: list[CalendarEvent]
+    nextPageToken: str
+    nextSyncToken: str
+
+
+class WatchChannel(TypedDict, total=False):
+    id: str
+    resourceId: str
+    resourceUri: str
+    token: str
+    expiration: str  # 밀리초 단위 Unix 시각
@@ -1,38 +1,184 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import Executor
 from pathlib import Path
 from datetime import datetime
 from typing import Any, Literal, Optional
 
+import httplib2
+from google.auth.credentials import AnonymousCredentials
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 
-from .schemas import CalendarEvent, Reminder
+from .batch import MAX_BATCH_SIZE, GoogleCalendarBatch
+from .listing import EVENT_LIST_FIELDS, MAX_PAGE_SIZE, EventListing
+from .resilience import (
+    RETRYABLE_STATUSES,
+    CircuitBreaker,
+    CircuitOpenError,
+    GoogleCalendarUnavailableError,
+    backoff_delay,
+)
+from .schemas import CalendarEvent, EventListPage, Reminder, WatchChannel
 
 
 BASE_DIR = Path(__file__).parent.parent.parent.parent.parent
 
 GOOGLE_SERVICE_ACCOUNT_CREDENTIAL_PATH = BASE_DIR / "calendar-booking-service-account-credentials.json"
 
+GOOGLE_CALENDAR_SCOPES = [
+    "https://www.googleapis.com/auth/calendar",
+    "https://www.googleapis.com/auth/calendar.events",
+]
+
+
+# 설정하면 Google 대신 이 주소(예: tests/support/fake_google_calendar.py 의 http://127.0.0.1:8089/)로 호출하고 인증하지 않는다.
+GOOGLE_CALENDAR_API_ENDPOINT = os.getenv("GOOGLE_CALENDAR_API_ENDPOINT") or None
+
+
+def load_calendar_discovery_document(root_url: str | None = None) -> str:
+    """google-api-python-client 에 포함된 Calendar v3 discovery 문서. 네트워크로 받지 않는다.
+
+    `root_url` 을 주면 일반 요청과 batch 요청이 모두 그 주소로 가도록 바꾼다.
+    """
+    document = get_static_doc("calendar", "v3")
+    if document is None:
+        raise RuntimeError("Calendar v3 discovery document is not bundled")
+    if root_url:
+        description = json.loads(document)
+        description["rootUrl"] = root_url.rstrip("/") + "/"
+        description["baseUrl"] = description["rootUrl"] + description["servicePath"]
+        document = json.dumps(description)
+    return document
+
+
+def build_calendar_client(
+    credentials_path: Path,
+    discovery_document: str | None = None,
+    api_endpoint: str | None = GOOGLE_CALENDAR_API_ENDPOINT,
+) -> Any:
+    if api_endpoint:
+        credentials = AnonymousCredentials()
+    else:
+        credentials = service_account.Credentials.from_service_account_file(
+            credentials_path.as_posix(),
+            scopes=GOOGLE_CALENDAR_SCOPES,
+        )
+    return build_from_document(
+        discovery_document or load_calendar_discovery_document(api_endpoint),
+        credentials=credentials,
+    )
+
+
+class SyncTokenExpiredError(Exception):
+    """Google 이 syncToken 을 더 이상 받지 않는다(410 Gone). 전체 동기화를 다시 해야 한다."""
+
 
 class GoogleCalendarService:
     def __init__(
         self,
         default_google_calendar_id: str,
         credentials_path: Optional[Path] = GOOGLE_SERVICE_ACCOUNT_CREDENTIAL_PATH,
+        service: Any | None = None,
+        executor: Executor | None = None,
+        *,
+        timeout: float = 10.0,
+        max_retries: int = 2,
+        circuit_breaker: CircuitBreaker | None = None,
     ):
         self.credentials_path = credentials_path
         self.default_google_calendar_id = default_google_calendar_id
-        self.service = self._get_authenticated_service(credentials_path)
+        # 이미 만든 discovery 클라이언트를 받으면 인증/빌드를 다시 하지 않는다.
+        self.service = service if service is not None else self._get_authenticated_service(credentials_path)
+        # None 이면 이벤트 루프의 기본 스레드 풀을 쓴다.
+        self.executor = executor
+        # 호출 한 번(재시도 한 번)의 제한 시간(초)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        # 여러 캘린더의 서비스가 같은 차단기를 나눠 쓰면 Google 장애를 한 번에 감지한다.
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._local = threading.local()
 
     def _get_authenticated_service(self, credentials_path: Path) -> Any:
-        credentials = service_account.Credentials.from_service_account_file(
-            credentials_path.as_posix(),
-            scopes=[
-                "https://www.googleapis.com/auth/calendar",
-                "https://www.googleapis.com/auth/calendar.events",
-            ],
-        )
-        return build("calendar", "v3", credentials=credentials)
+        return build_calendar_client(credentials_path)
+
+    def _thread_http(self) -> AuthorizedHttp | None:
+        """httplib2 연결은 스레드 간에 공유할 수 없으므로 스레드마다 따로 만든다."""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            credentials = getattr(getattr(self.service, "_http", None), "credentials", None)
+            if credentials is None:
+                return None
+            base_http = build_http()
+            # 제한 시간이 지나 포기한 호출이 스레드를 계속 붙잡지 않게 한다.
+            base_http.timeout = self.timeout
+            http = self._local.http = AuthorizedHttp(credentials, http=base_http)
+        return http
+
+    def _execute_sync(self, request: Any) -> Any:
+        http = self._thread_http()
+        if http is None:
+            return request.execute()
+        return request.execute(http=http)
+
+    async def execute(self, request: Any) -> Any:
+        """googleapiclient 의 동기 `execute()` 를 스레드 풀에서 실행해 이벤트 루프를 막지 않는다.
+
+        호출마다 `timeout` 초 제한을 두고, 429/5xx, 시간 초과, 연결 오류(DNS, TLS, 연결 거부 등)는
+        지터를 준 백오프로 `max_retries` 번까지 다시 시도한다. 그래도 실패하거나 회로가 열려 있으면
+        `GoogleCalendarUnavailableError` 를 일으킨다. 그 밖의 HttpError 는 그대로 올린다.
+        """
+        if not self.circuit_breaker.allow():
+            raise CircuitOpenError("Google Calendar circuit is open")
+
+        try:
+            return await self._execute_with_retries(request)
+        except (HttpError, GoogleCalendarUnavailableError):
+            # 결과를 이미 회로 차단기에 기록했다.
+            raise
+        except asyncio.CancelledError:
+            self.circuit_breaker.release_probe()
+            raise
+        except BaseException:
+            # 예상하지 못한 오류도 실패로 센다. 시험 호출이 이렇게 끝나도 회로가 닫히지 않은 채
+            # 멈추지 않고, 다시 열렸다가 `reset_timeout` 뒤 다시 시험한다.
+            self.circuit_breaker.record_failure()
+            raise
+
+    async def _execute_with_retries(self, request: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(self.executor, self._execute_sync, request),
+                    self.timeout,
+                )
+            except HttpError as error:
+                if error.resp.status not in RETRYABLE_STATUSES:
+                    # 요청 자체의 문제(404, 409 등)는 Google 이 정상적으로 응답한 것이다.
+                    self.circuit_breaker.record_success()
+                    raise
+                failure: Exception = error
+            except (TimeoutError, OSError, httplib2.HttpLib2Error) as error:
+                # 응답을 받지 못했다. ConnectionError, ssl.SSLError 는 OSError 이고
+                # httplib2.ServerNotFoundError 는 HttpLib2Error 이다.
+                failure = error
+            else:
+                self.circuit_breaker.record_success()
+                return result
+
+            if attempt > self.max_retries:
+                self.circuit_breaker.record_failure()
+                raise GoogleCalendarUnavailableError(repr(failure)) from failure
+            await asyncio.sleep(backoff_delay(attempt))
 
     def make_event_body(
         self,
@@ -72,6 +218,51 @@ class GoogleCalendarService:
 
         return event
 
+    def insert_event_request(
+        self,
+        summary: str,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        *,
+        google_calendar_id: Optional[str] = None,
+        event_id: Optional[str] = None,
+        **event_options: Any,
+    ) -> Any:
+        """`event_id` 를 정하면 재시도해도 일정이 중복으로 생기지 않는다(이미 있으면 409)."""
+        event = self.make_event_body(start_datetime, end_datetime, summary=summary, **event_options)
+        if event_id:
+            event["id"] = event_id
+        return self.service.events().insert(
+            calendarId=google_calendar_id or self.default_google_calendar_id,
+            body=event,
+            conferenceDataVersion=1,
+        )
+
+    def update_event_request(
+        self,
+        event_id: str,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        google_calendar_id: Optional[str] = None,
+        **event_options: Any,
+    ) -> Any:
+        event = self.make_event_body(start_datetime, end_datetime, **event_options)
+        return self.service.events().update(
+            calendarId=google_calendar_id or self.default_google_calendar_id,
+            eventId=event_id,
+            body=event,
+        )
+
+    def delete_event_request(self, event_id: str, google_calendar_id: Optional[str] = None) -> Any:
+        return self.service.events().delete(
+            calendarId=google_calendar_id or self.default_google_calendar_id,
+            eventId=event_id,
+        )
+
+    def batch(self, max_batch_size: int = MAX_BATCH_SIZE) -> GoogleCalendarBatch:
+        """일정 생성/수정/삭제를 모아 batch 요청으로 보낸다. `GoogleCalendarBatch` 참고."""
+        return GoogleCalendarBatch(self, max_batch_size)
+
     async def create_event(
         self,
         summary: str,
@@ -86,10 +277,11 @@ class GoogleCalendarService:
         timezone: Optional[str] = "Asia/Seoul",
         send_update: Literal["all", "externalOnly", "none"] = "all",
     ) -> CalendarEvent | None:
-        event = self.make_event_body(
+        request = self.insert_event_request(
+            summary,
             start_datetime,
             end_datetime,
-            summary=summary,
+            google_calendar_id=google_calendar_id,
             conference=conference,
             location=location,
             description=description,
@@ -97,18 +289,8 @@ class GoogleCalendarService:
             timezone=timezone,
             send_update=send_update,
         )
-
-        calendar_id = google_calendar_id or self.default_google_calendar_id
         try:
-            event = (
-                self.service.events()
-                .insert(
-                    calendarId=calendar_id,
-                    body=event,
-                    conferenceDataVersion=1,
-                )
-                .execute()
-            )
+            event = await self.execute(request)
         except HttpError as e:
             print("create_calendar_event error", e)
             return None
@@ -117,37 +299,98 @@ class GoogleCalendarService:
             return event
         return None
 
-    async def event_list(
+    def event_list(
         self,
         time_min: datetime,
         time_max: datetime,
         google_calendar_id: Optional[str] = None,
-    ) -> list[CalendarEvent]:
+        *,
+        fields: Optional[str] = EVENT_LIST_FIELDS,
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> EventListing:
+        """기간 안의 일정. 기다리면 모든 페이지를 모은 목록을, 순회하면 페이지가 도착하는 대로 일정을 준다.
+
+        `fields` 는 Google 의 partial response 마스크다. None 이면 일정 전체를 받는다.
+        """
         google_calendar_id = google_calendar_id or self.default_google_calendar_id
+        params: dict[str, Any] = {
+            "calendarId": google_calendar_id,
+            "timeMin": time_min.isoformat(),
+            "timeMax": time_max.isoformat(),
+            "singleEvents": True,
+            "orderBy": "startTime",
+            "maxResults": page_size,
+        }
+        if fields:
+            params["fields"] = fields
+        return EventListing(self, params)
 
-        events_result = (
-            self.service.events()
-            .list(
-                calendarId=google_calendar_id,
-                timeMin=time_min.isoformat(),
-                timeMax=time_max.isoformat(),
-                singleEvents=True,
-                orderBy="startTime",
-            )
-            .execute()
-        )
-        return events_result.get("items", [])
+    async def sync_events(
+        self,
+        google_calendar_id: Optional[str] = None,
+        *,
+        sync_token: Optional[str] = None,
+        page_token: Optional[str] = None,
+    ) -> EventListPage:
+        """일정 목록 한 페이지. `sync_token` 을 주면 그 이후 바뀐 일정(취소 포함)만 받는다.
+
+        마지막 페이지에만 `nextSyncToken` 이 있고, 그 전 페이지에는 `nextPageToken` 이 있다.
+        """
+        google_calendar_id = google_calendar_id or self.default_google_calendar_id
+        params: dict[str, Any] = {
+            "calendarId": google_calendar_id,
+            "singleEvents": True,
+            "maxResults": MAX_PAGE_SIZE,
+        }
+        if sync_token:
+            params["syncToken"] = sync_token
+        if page_token:
+            params["pageToken"] = page_token
+
+        try:
+            return await self.execute(self.service.events().list(**params))
+        except HttpError as error:
+            if error.resp.status == 410:
+                raise SyncTokenExpiredError(google_calendar_id) from error
+            raise
+
+    async def watch_events(
+        self,
+        channel_id: str,
+        address: str,
+        token: str,
+        google_calendar_id: Optional[str] = None,
+        ttl: Optional[int] = None,
+    ) -> WatchChannel:
+        """일정이 바뀌면 `address` 로 알림을 보내는 채널을 연다. `ttl` 은 초 단위 희망 유효 기간."""
+        google_calendar_id = google_calendar_id or self.default_google_calendar_id
+        body: dict[str, Any] = {
+            "id": channel_id,
+            "type": "web_hook",
+            "address": address,
+            "token": token,
+        }
+        if ttl:
+            body["params"] = {"ttl": str(ttl)}
+        return await self.execute(self.service.events().watch(calendarId=google_calendar_id, body=body))
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> bool:
+        """채널을 닫는다. 이미 만료됐거나 없는 채널이면 False 를 반환한다."""
+        try:
+            await self.execute(self.service.channels().stop(body={"id": channel_id, "resourceId": resource_id}))
+            return True
+        except HttpError as error:
+            if error.resp.status == 404:
+                return False
+            raise
 
     async def delete_event(
         self,
         event_id: str,
         google_calendar_id: Optional[str] = None,
     ) -> bool:
-        google_calendar_id = google_calendar_id or self.default_google_calendar_id
         try:
-            self.service.events().delete(
-                calendarId=google_calendar_id, eventId=event_id
-            ).execute()
+            await self.execute(self.delete_event_request(event_id, google_calendar_id))
             return True
         except HttpError as error:
             print(f"An error occurred: {error}")
@@ -168,9 +411,11 @@ class GoogleCalendarService:
         timezone: Optional[str] = "Asia/Seoul",
         send_update: Literal["all", "externalOnly", "none"] = "all",
     ) -> bool:
-        event = self.make_event_body(
+        request = self.update_event_request(
+            event_id,
             start_datetime,
             end_datetime,
+            google_calendar_id,
             summary=summary,
             conference=conference,
             location=location,
@@ -179,14 +424,8 @@ class GoogleCalendarService:
             timezone=timezone,
             send_update=send_update,
         )
-       
-        google_calendar_id = google_calendar_id or self.default_google_calendar_id
         try:
-            self.service.events().update(
-                calendarId=google_calendar_id,
-                eventId=event_id,
-                body=event,
-            ).execute()
+            await self.execute(request)
             return True
         except HttpError as error:
             print(f"An error occurred: {error}")
@@ -199,9 +438,9 @@ class GoogleCalendarService:
     ) -> CalendarEvent | None:
         google_calendar_id = google_calendar_id or self.default_google_calendar_id
         try:
-            return self.service.events().get(
-                calendarId=google_calendar_id, eventId=event_id
-            ).execute()
+            return await self.execute(
+                self.service.events().get(calendarId=google_calendar_id, eventId=event_id)
+            )
         except HttpError as error:
             print(f"An error occurred: {error}")
             return None
@@ -0,0 +1,30 @@
+"""Prometheus 텍스트 형식으로 내보내는 지표"""
+from dataclasses import dataclass
+from typing import Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class Gauge:
+    name: str
+    help: str
+    value: float
+
+
+def render_gauges(gauges: Iterable[Gauge]) -> str:
+    """
+    >>> print(render_gauges([Gauge("outbox_depth", "대기 중인 작업 수", 3), Gauge("outbox_lag_seconds", "대기 시간", 1.5)]), end="")
+    # HELP outbox_depth 대기 중인 작업 수
+    # TYPE outbox_depth gauge
+    outbox_depth 3
+    # HELP outbox_lag_seconds 대기 시간
+    # TYPE outbox_lag_seconds gauge
+    outbox_lag_seconds 1.5
+    """
+    lines = []
+    for gauge in gauges:
+        lines.append(f"# HELP {gauge.name} {gauge.help}")
+        lines.append(f"# TYPE {gauge.name} gauge")
+        lines.append(f"{gauge.name} {gauge.value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,61 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Sequence
+
+from sqlalchemy import ColumnElement, literal, tuple_
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    keyset 페이지네이션의 마지막 행 값을 불투명한 커서 문자열로 만든다.
+
+    >>> from datetime import date
+    >>> cursor = encode_cursor(date(2024, 12, 3), 10)
+    >>> cursor
+    'WyIyMDI0LTEyLTAzIiwxMF0'
+    >>> decode_cursor(cursor)
+    ['2024-12-03', 10]
+    """
+    payload = [
+        value.isoformat() if isinstance(value, (date, datetime)) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """
+    >>> decode_cursor("invalid!")
+    Traceback (most recent call last):
+    ...
+    ValueError: 유효하지 않은 커서입니다: invalid!
+    """
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f"유효하지 않은 커서입니다: {cursor}") from exc
+
+    if not isinstance(values, list):
+        raise ValueError(f"유효하지 않은 커서입니다: {cursor}")
+    return values
+
+
+def keyset_before(columns: Sequence[InstrumentedAttribute], values: Sequence[Any]) -> ColumnElement[bool]:
+    """내림차순 정렬에서 커서 다음 행들을 고르는 `(c1, c2, ...) < (v1, v2, ...)` 조건.
+
+    컬럼은 함수로 감싸지 않아야 인덱스를 탄다. 커서 값은 컬럼 타입으로 바인딩해서 저장된 값과
+    같은 형식으로 비교한다. SQLite 의 DATETIME 은 문자열로 비교하므로, 컬럼 값도 SQLAlchemy 가
+    저장한 형식이어야 한다.
+    """
+    return tuple_(*columns) < tuple_(
+        *[literal(value, type_=column.expression.type) for column, value in zip(columns, values)]
+    )
+
+
+def keyset_order_by(columns: Sequence[InstrumentedAttribute]) -> list[ColumnElement]:
+    return [column.desc() for column in columns]
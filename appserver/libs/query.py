@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import Select, select, literal_column, text, exists
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from typing import Any, Literal, Type
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.types import JSON
 from sqlalchemy import cast, func
@@ -47,3 +48,13 @@ def exact_match_list_json(
         return exists(subquery).select()
     
     raise ValueError(f"Unsupported database: {dialect_name}")
+
+
+def upsert_insert(session: AsyncSession, model: Type) -> postgresql.Insert | sqlite.Insert:
+    """`on_conflict_do_update` 를 쓸 수 있는 DBMS 별 INSERT 문."""
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert(model)
+    if dialect_name == "sqlite":
+        return sqlite.insert(model)
+    raise ValueError(f"Unsupported database: {dialect_name}")
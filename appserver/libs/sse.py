@@ -0,0 +1,53 @@
+"""Server-Sent Events(text/event-stream) 메시지 형식"""
+
+# 연결이 끊기지 않도록 보내는 주석 줄. EventSource 는 주석을 메시지로 전달하지 않는다.
+HEARTBEAT = ": keep-alive\n\n"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # nginx 같은 프록시가 응답을 모았다가 보내지 않게 한다.
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_event(
+    data: str | None = None,
+    *,
+    event: str | None = None,
+    id: str | None = None,
+    retry: int | None = None,
+) -> str:
+    """
+    메시지 하나. `data` 가 없으면 설정(`retry` 등)만 보내고 메시지는 전달되지 않는다.
+    `event` 가 없으면 EventSource 의 `onmessage` 로, 있으면 그 이름의 리스너로 전달된다.
+
+    >>> format_event('{"id": 1}', id="1")
+    'id: 1\\ndata: {"id": 1}\\n\\n'
+    >>> format_event("첫 줄\\n둘째 줄", event="partial")
+    'event: partial\\ndata: 첫 줄\\ndata: 둘째 줄\\n\\n'
+    >>> format_event(retry=3000)
+    'retry: 3000\\n\\n'
+    """
+    lines = []
+    if event is not None:
+        lines.append(f"event: {event}")
+    if id is not None:
+        lines.append(f"id: {id}")
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    if data is not None:
+        lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_last_event_id(value: str | None) -> int:
+    """
+    재연결할 때 받은 `Last-Event-ID` 를 위치로 바꾼다. 없거나 알아볼 수 없으면 처음부터 보낸다.
+
+    >>> parse_last_event_id("12"), parse_last_event_id(None), parse_last_event_id("abc")
+    (12, 0, 0)
+    """
+    try:
+        return max(int(value), 0) if value else 0
+    except ValueError:
+        return 0
@@ -0,0 +1,127 @@
+"""대역 Google Calendar 서버를 띄우고 예약 흐름의 Google 호출을 네트워크 없이 측정한다.
+
+예약마다 일정을 만들고(개별 호출 / batch), 한 달 일정을 조회하고, 절반을 취소한다.
+지연, 오류 비율, 초당 한도를 바꿔 가며 재시도와 동시 실행의 효과를 볼 수 있다.
+
+    python -m benchmarks.google_calendar_fake --bookings 200 --latency 0.05 --concurrency 8
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import uvicorn
+
+from tests.support.fake_google_calendar import FakeGoogleCalendar
+from appserver.libs.google.calendar.registry import GoogleCalendarServiceRegistry
+
+GOOGLE_CALENDAR_ID = "benchmark@example.com"
+
+
+def _start_server(calendar: FakeGoogleCalendar) -> tuple[uvicorn.Server, threading.Thread, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(calendar.app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, f"http://127.0.0.1:{port}/"
+
+
+def _slot(index: int) -> tuple[datetime, datetime]:
+    start = datetime(2024, 12, 1, 9, tzinfo=timezone.utc) + timedelta(hours=index % 10, days=index // 10 % 28)
+    return start, start + timedelta(minutes=30)
+
+
+async def _timed(latencies: list[float], coro) -> bool:
+    started = time.perf_counter()
+    try:
+        await coro
+        return True
+    except Exception:
+        return False
+    finally:
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(endpoint: str, bookings: int, concurrency: int) -> dict:
+    services = GoogleCalendarServiceRegistry(
+        default_google_calendar_id=GOOGLE_CALENDAR_ID,
+        max_workers=concurrency,
+        api_endpoint=endpoint,
+    )
+    service = services.get()
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async def create(index: int) -> bool:
+        async with semaphore:
+            request = service.insert_event_request(f"booking {index}", *_slot(index), event_id=f"single{index}")
+            return await _timed(latencies, service.execute(request))
+
+    latencies: list[float] = []
+    started = time.perf_counter()
+    succeeded = sum(await asyncio.gather(*[create(index) for index in range(bookings)]))
+    results["create"] = (time.perf_counter() - started, succeeded, list(latencies))
+
+    started = time.perf_counter()
+    batch = service.batch()
+    for index in range(bookings):
+        batch.create_event(str(index), f"booking {index}", *_slot(index), event_id=f"batch{index}")
+    batch_results = await batch.execute()
+    succeeded = sum(result.ok for result in batch_results.values())
+    results["batch create"] = (time.perf_counter() - started, succeeded, [])
+
+    latencies = []
+    started = time.perf_counter()
+    ok = await _timed(latencies, service.event_list(
+        datetime(2024, 12, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+    ))
+    results["month list"] = (time.perf_counter() - started, int(ok), latencies)
+
+    async def cancel(index: int) -> bool:
+        async with semaphore:
+            return await _timed(latencies, service.execute(service.delete_event_request(f"single{index}")))
+
+    latencies = []
+    started = time.perf_counter()
+    succeeded = sum(await asyncio.gather(*[cancel(index) for index in range(0, bookings, 2)]))
+    results["cancel"] = (time.perf_counter() - started, succeeded, list(latencies))
+
+    services.close()
+    return results
+
+
+def main(bookings: int, concurrency: int, latency: float, error_rate: float, quota: float | None) -> None:
+    calendar = FakeGoogleCalendar(latency=latency, error_rate=error_rate, quota_per_second=quota, seed=0, notify=None)
+    server, thread, endpoint = _start_server(calendar)
+    try:
+        results = asyncio.run(run(endpoint, bookings, concurrency))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    for name, (elapsed, succeeded, latencies) in results.items():
+        line = f"{name:<13} {elapsed * 1000:9.1f} ms  ok={succeeded}"
+        if len(latencies) > 1:
+            quantiles = statistics.quantiles(latencies, n=20)
+            line += f"  p50={quantiles[9] * 1000:.1f} ms  p95={quantiles[18] * 1000:.1f} ms"
+        print(line)
+    print(f"fake server operations: {calendar.request_count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--quota", type=float, default=None)
+    args = parser.parse_args()
+    main(args.bookings, args.concurrency, args.latency, args.error_rate, args.quota)
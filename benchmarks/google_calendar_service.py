@@ -0,0 +1,73 @@
+"""요청마다 GoogleCalendarService 를 만드는 경우와 워커 단위 레지스트리를 재사용하는 경우 비교.
+
+임시 서비스 계정 키로 인증 정보와 discovery 클라이언트만 만들고 API 는 호출하지 않는다.
+
+    python -m benchmarks.google_calendar_service --requests 200
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from appserver.libs.google.calendar.registry import GoogleCalendarServiceRegistry
+from appserver.libs.google.calendar.services import GoogleCalendarService
+
+
+def _write_credentials(path: Path) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path.write_text(json.dumps({
+        "type": "service_account",
+        "project_id": "benchmark",
+        "private_key_id": "benchmark",
+        "private_key": private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(),
+        "client_email": "benchmark@benchmark.iam.gserviceaccount.com",
+        "client_id": "1",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }))
+
+
+def run(credentials_path: Path, requests: int) -> dict:
+    google_calendar_id = "benchmark@example.com"
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        GoogleCalendarService(google_calendar_id, credentials_path=credentials_path)
+    per_request = time.perf_counter() - started
+
+    services = GoogleCalendarServiceRegistry(credentials_path, default_google_calendar_id=google_calendar_id)
+    started = time.perf_counter()
+    for _ in range(requests):
+        services.get()
+    registry = time.perf_counter() - started
+    services.close()
+
+    return {
+        "per_request_ms": per_request / requests * 1000,
+        "registry_ms": registry / requests * 1000,
+    }
+
+
+def main(requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        credentials_path = Path(tmpdir) / "service-account.json"
+        _write_credentials(credentials_path)
+        result = run(credentials_path, requests)
+
+    print(f"per-request build: {result['per_request_ms']:.3f} ms/request")
+    print(f"registry:          {result['registry_ms']:.3f} ms/request")
+    print(f"saving:            {result['per_request_ms'] - result['registry_ms']:.3f} ms/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    main(args.requests)
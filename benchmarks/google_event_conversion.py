@@ -0,0 +1,70 @@
+"""구글 캘린더 일정을 응답으로 바꾸는 비용 비교.
+
+`GoogleCalendarEventOut` 으로 검증/직렬화하는 경우와 `GoogleEventSlot` 으로 한 번만 파싱해
+바로 직렬화하는 경우를 같은 일정 목록으로 잰다.
+
+    python -m benchmarks.google_event_conversion --events 3000 --repeat 20
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from appserver.apps.calendar.google_events import convert_google_events
+from appserver.apps.calendar.schemas import GoogleCalendarEventOut
+
+
+def make_events(count: int) -> list[dict]:
+    base = datetime(2024, 12, 1, 9, tzinfo=timezone(timedelta(hours=9)))
+    events = []
+    for index in range(count):
+        if index % 10 == 0:
+            day = (base + timedelta(days=index % 28)).date()
+            events.append({
+                "id": f"event{index}",
+                "start": {"date": day.isoformat()},
+                "end": {"date": (day + timedelta(days=1)).isoformat()},
+            })
+            continue
+        start = base + timedelta(days=index % 28, minutes=30 * (index % 16))
+        events.append({
+            "id": f"event{index}",
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": (start + timedelta(minutes=30)).isoformat()},
+        })
+    return events
+
+
+def _model(events: list[dict]) -> list[str]:
+    return [GoogleCalendarEventOut.model_validate(event).model_dump_json() for event in events]
+
+
+def _fast(events: list[dict]) -> list[str]:
+    return [slot.to_json() for slot in convert_google_events(events)]
+
+
+def run(events: list[dict], repeat: int) -> dict[str, float]:
+    assert _model(events) == _fast(events)
+    results = {}
+    for name, convert in (("model", _model), ("fast path", _fast)):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            convert(events)
+            best = min(best, time.perf_counter() - started)
+        results[name] = best
+    return results
+
+
+def main(count: int, repeat: int) -> None:
+    results = run(make_events(count), repeat)
+    for name, elapsed in results.items():
+        print(f"{name:<10} {elapsed * 1000:8.2f} ms  {elapsed / count * 1e6:6.2f} us/event")
+    print(f"speedup:   {results['model'] / results['fast path']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.events, args.repeat)
@@ -0,0 +1,96 @@
+"""SQLite 성능 설정(WAL 등) 유무에 따른 읽기/쓰기 처리량 비교.
+
+    python -m benchmarks.sqlite_pragmas --writers 8 --readers 8 --operations 200
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from appserver.db import DatabaseSettings, create_engine
+
+
+async def _prepare(dsn: str, settings: DatabaseSettings) -> None:
+    engine = create_engine(dsn, settings)
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE bookings (id INTEGER PRIMARY KEY, guest_id INTEGER, topic TEXT)"
+        ))
+    await engine.dispose()
+
+
+async def _writer(engine, operations: int, guest_id: int, errors: list[int]) -> None:
+    for _ in range(operations):
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text("INSERT INTO bookings (guest_id, topic) VALUES (:guest_id, 'benchmark')"),
+                    {"guest_id": guest_id},
+                )
+        except OperationalError:
+            errors.append(guest_id)
+
+
+async def _reader(engine, operations: int, guest_id: int, errors: list[int]) -> None:
+    for _ in range(operations):
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(
+                    text("SELECT count(*) FROM bookings WHERE guest_id = :guest_id"),
+                    {"guest_id": guest_id},
+                )
+        except OperationalError:
+            errors.append(guest_id)
+
+
+async def run(tuning: bool, writers: int, readers: int, operations: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dsn = f"sqlite+aiosqlite:///{Path(tmpdir) / 'benchmark.db'}"
+        settings = DatabaseSettings(dsn=dsn, sqlite_tuning=tuning)
+        await _prepare(dsn, settings)
+
+        engine = create_engine(dsn, settings)
+        write_errors: list[int] = []
+        read_errors: list[int] = []
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[_writer(engine, operations, i, write_errors) for i in range(writers)],
+            *[_reader(engine, operations, i, read_errors) for i in range(readers)],
+        )
+        elapsed = time.perf_counter() - started
+        await engine.dispose()
+
+    total = (writers + readers) * operations
+    return {
+        "tuning": tuning,
+        "elapsed": elapsed,
+        "ops_per_sec": total / elapsed,
+        "write_errors": len(write_errors),
+        "read_errors": len(read_errors),
+    }
+
+
+async def main(writers: int, readers: int, operations: int) -> None:
+    for tuning in (False, True):
+        result = await run(tuning, writers, readers, operations)
+        print(
+            f"tuning={result['tuning']!s:5} "
+            f"elapsed={result['elapsed']:.3f}s "
+            f"ops/s={result['ops_per_sec']:.1f} "
+            f"write_errors={result['write_errors']} "
+            f"read_errors={result['read_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.writers, args.readers, args.operations))
@@ -1,7 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import func, select
 from fastapi.testclient import TestClient
 from fastapi import status
 from appserver.apps.account.models import User
+from appserver.apps.calendar.counters import reconcile_booking_counters
+from appserver.apps.calendar.enums import BookingCounterScope
+from appserver.apps.calendar.models import Booking, BookingCounter
 
 
 async def test_회원탈퇴_시_유저가_삭제되어야_한다(
@@ -17,3 +21,27 @@ async def test_회원탈퇴_시_유저가_삭제되어야_한다(
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert await db_session.get(User, user_id) is None
+
+
+async def test_게스트가_탈퇴하면_예약을_지우고_호스트_캘린더의_예약_수에서_뺀다(
+    client_with_guest_auth: TestClient,
+    guest_user: User,
+    host_bookings: list[Booking],
+    db_session: AsyncSession,
+):
+    calendar_id = host_bookings[0].calendar_id
+    await reconcile_booking_counters(db_session)
+
+    response = client_with_guest_auth.delete("/account/unregister")
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    result = await db_session.execute(select(func.count()).select_from(Booking).where(Booking.guest_id == guest_user.id))
+    assert result.scalar_one() == 0
+    stmt = (
+        select(BookingCounter.booking_count)
+        .where(BookingCounter.scope == BookingCounterScope.CALENDAR.value)
+        .where(BookingCounter.owner_id == calendar_id)
+        .execution_options(populate_existing=True)
+    )
+    result = await db_session.execute(stmt)
+    assert result.scalar_one() == 0
@@ -1,28 +1,42 @@
+import asyncio
 import calendar
-from datetime import date
-import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
 
 import pytest
 from pytest_lazy_fixtures import lf
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from appserver.apps.calendar import endpoints
+from appserver.apps.calendar.endpoints import PARTIAL_BOOKINGS_HEADER
 from appserver.apps.calendar.enums import AttendanceStatus
-from appserver.apps.calendar.schemas import BookingOut
+from appserver.apps.calendar.schemas import BookingOut, GoogleCalendarEventOut, SimpleBookingOut
 from appserver.apps.account.models import User
 from appserver.apps.calendar.models import Booking, TimeSlot
+from appserver.apps.calendar.outbox import OutboxWorker
+from appserver.db import create_session
 from appserver.libs.datetime.calendar import get_next_weekday
-from appserver.libs.google.calendar.services import GoogleCalendarService
+from appserver.libs.google.calendar.cache import google_events_cache
+from appserver.libs.google.calendar.deps import get_google_calendar_service
+from appserver.libs.google.calendar.resilience import CircuitOpenError
+from appserver.libs.google.calendar.services import GoogleCalendarService, build_calendar_client
 
 
 @pytest.fixture()
-def calendar_id() -> str:
-    return os.getenv("GOOGLE_CALENDAR_ID")
+def google_calendar_service(fake_google_calendar_endpoint: str):
+    """대역 Google Calendar 서버를 부르는 서비스. 아웃박스 워커와 검증에 함께 쓴다."""
+    client = build_calendar_client(None, api_endpoint=fake_google_calendar_endpoint)
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield GoogleCalendarService("host@example.com", service=client, executor=executor, max_retries=0)
+    executor.shutdown()
 
 
-@pytest.fixture()
-def google_calendar_service(calendar_id: str) -> GoogleCalendarService:
-    return GoogleCalendarService(default_google_calendar_id=calendar_id)
+async def drain_outbox(db_session: AsyncSession, service: GoogleCalendarService) -> int:
+    worker = OutboxWorker(create_session(db_session.bind), lambda google_calendar_id: service, concurrency=1)
+    return await worker.run_once()
 
 
 @pytest.fixture()
@@ -189,6 +203,223 @@ async def test_게스트는_호스트의_캘린더의_예약_내역을_월_단
     assert all([item["when"] in booking_dates for item in data])
  
 
+class UnavailableGoogleCalendarService:
+    async def event_list(self, *args, **kwargs):
+        raise CircuitOpenError("Google Calendar circuit is open")
+
+
+async def test_구글_캘린더를_쓸_수_없으면_예약만_담아_부분_응답_표시를_한다(
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_bookings: list[Booking],
+    host_user: User,
+):
+    fastapi_app.dependency_overrides[get_google_calendar_service] = UnavailableGoogleCalendarService
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings",
+        params={"year": 2024, "month": 12},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Bookings-Partial"] == "google_calendar"
+    assert len(response.json()) == len([booking for booking in host_bookings if booking.when.month == 12])
+
+
+def _google_event(event_id: str) -> dict:
+    return {
+        "id": event_id,
+        "summary": "개인 일정",
+        "start": {"dateTime": "2024-12-03T10:00:00+09:00"},
+        "end": {"dateTime": "2024-12-03T11:00:00+09:00"},
+    }
+
+
+class SlowEventListing:
+    def __init__(self, pages: list[list[dict]], delay: float):
+        self._pages = pages
+        self.delay = delay
+
+    async def pages(self):
+        for page in self._pages:
+            await asyncio.sleep(self.delay)
+            yield page
+
+    async def all(self) -> list[dict]:
+        return [event async for page in self.pages() for event in page]
+
+    def __await__(self):
+        return self.all().__await__()
+
+
+class SlowGoogleCalendarService:
+    def __init__(self, delay: float = 0.0, pages: list[list[dict]] | None = None):
+        self.delay = delay
+        self._pages = pages or [[_google_event("google-event")]]
+
+    def event_list(self, *args, **kwargs):
+        return SlowEventListing(self._pages, self.delay)
+
+
+@pytest.mark.usefixtures("host_bookings")
+async def test_예약과_구글_캘린더_일정을_함께_읽어_합친다(
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_user: User,
+):
+    google_events_cache.clear()
+    fastapi_app.dependency_overrides[get_google_calendar_service] = lambda: SlowGoogleCalendarService(0.1)
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings",
+        params={"year": 2024, "month": 12},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert PARTIAL_BOOKINGS_HEADER not in response.headers
+    assert response.json()[-1]["id"] == "google-event"
+
+
+@pytest.mark.usefixtures("host_bookings")
+async def test_직접_만든_월별_예약_응답은_응답_모델과_같은_모양이다(
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_user: User,
+):
+    google_events_cache.clear()
+    events = [
+        _google_event("timed"),
+        {"id": "all-day", "start": {"date": "2024-12-07"}, "end": {"date": "2024-12-08"}},
+    ]
+    fastapi_app.dependency_overrides[get_google_calendar_service] = lambda: SlowGoogleCalendarService(pages=[events])
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings",
+        params={"year": 2024, "month": 12},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    bookings = [item for item in data if isinstance(item["id"], int)]
+    google_items = [item for item in data if isinstance(item["id"], str)]
+    assert bookings
+    assert all(SimpleBookingOut.model_validate(item).model_dump(mode="json") == item for item in bookings)
+    assert google_items == [GoogleCalendarEventOut.model_validate(event).model_dump(mode="json") for event in events]
+
+
+@pytest.mark.usefixtures("host_bookings")
+async def test_구글_캘린더_일정이_기한을_넘기면_예약만_담아_부분_응답_표시를_한다(
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    google_events_cache.clear()
+    monkeypatch.setattr(endpoints, "GOOGLE_EVENTS_DEADLINE", 0.05)
+    fastapi_app.dependency_overrides[get_google_calendar_service] = lambda: SlowGoogleCalendarService(0.5)
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings/stream",
+        params={"year": 2024, "month": 12},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1] == {"partial": True, "missing": "google_calendar"}
+    assert all("when" in line for line in lines[:-1])
+
+
+@pytest.mark.usefixtures("host_bookings")
+async def test_스트림은_구글_캘린더_일정을_페이지가_도착하는_대로_보낸다(
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_user: User,
+):
+    google_events_cache.clear()
+    pages = [[_google_event("first-1"), _google_event("first-2")], [_google_event("second-1")]]
+    fastapi_app.dependency_overrides[get_google_calendar_service] = lambda: SlowGoogleCalendarService(0.01, pages)
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings/stream",
+        params={"year": 2024, "month": 12},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines[-3:]] == ["first-1", "first-2", "second-1"]
+    # 모든 페이지를 받은 뒤 캐시에 넣는다.
+    assert len(google_events_cache) == 1
+
+
+def parse_sse(body: str) -> list[dict]:
+    messages = []
+    for block in body.strip().split("\n\n"):
+        message = {}
+        for line in block.split("\n"):
+            field, _, value = line.partition(": ")
+            message[field] = message[field] + "\n" + value if field in message else value
+        messages.append(message)
+    return messages
+
+
+@pytest.mark.usefixtures("host_bookings")
+async def test_SSE_로_예약과_구글_캘린더_일정을_보내고_완료를_알린다(
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_user: User,
+):
+    google_events_cache.clear()
+    pages = [[_google_event("first-1")], [_google_event("second-1")]]
+    fastapi_app.dependency_overrides[get_google_calendar_service] = lambda: SlowGoogleCalendarService(0.01, pages)
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings/events",
+        params={"year": 2024, "month": 12},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = parse_sse(response.text)
+    assert messages[0] == {"retry": "3000"}
+    items = [message for message in messages if "id" in message]
+    assert [message["id"] for message in items] == [str(position) for position in range(1, len(items) + 1)]
+    assert [json.loads(message["data"])["id"] for message in items[-2:]] == ["first-1", "second-1"]
+    assert json.loads(messages[-1]["data"]) == {"type": "complete"}
+
+    # 재연결하면 마지막으로 받은 메시지 다음부터 보낸다.
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings/events",
+        params={"year": 2024, "month": 12},
+        headers={"Last-Event-ID": items[-2]["id"]},
+    )
+    resumed = [message for message in parse_sse(response.text) if "id" in message]
+    assert resumed == items[-1:]
+
+
+@pytest.mark.usefixtures("host_bookings")
+async def test_SSE_는_구글_캘린더_일정을_기다리는_동안_keep_alive_를_보내고_못_받으면_부분_응답을_알린다(
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    google_events_cache.clear()
+    monkeypatch.setattr(endpoints, "SSE_HEARTBEAT_INTERVAL", 0.02)
+    monkeypatch.setattr(endpoints, "GOOGLE_EVENTS_DEADLINE", 0.2)
+    fastapi_app.dependency_overrides[get_google_calendar_service] = lambda: SlowGoogleCalendarService(1)
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings/events",
+        params={"year": 2024, "month": 12},
+    )
+
+    assert ": keep-alive\n\n" in response.text
+    messages = parse_sse(response.text)
+    assert messages[-2] == {"event": "partial", "data": '{"partial":true,"missing":"google_calendar"}'}
+    assert json.loads(messages[-1]["data"]) == {"type": "complete"}
+
+
 async def test_게스트는_자신의_캘린더의_예약_내역을_페이지_단위로_받는다(
     client_with_guest_auth: TestClient,
     host_bookings: list[Booking],
@@ -204,6 +435,96 @@ async def test_게스트는_자신의_캘린더의_예약_내역을_페이지_
     assert all([item["id"] in id_set for item in data])
 
 
+async def test_게스트는_커서로_자신의_예약_내역을_중복_없이_끝까지_받는다(
+    client_with_guest_auth: TestClient,
+    host_bookings: list[Booking],
+    charming_host_bookings: list[Booking],
+):
+    expected_ids = [booking.id for booking in host_bookings + charming_host_bookings]
+    received = []
+    cursor = ""
+    while cursor is not None:
+        response = client_with_guest_auth.get(
+            "/guest-calendar/bookings",
+            params={"page_size": 2, "cursor": cursor},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["bookings"]) <= 2
+        assert data["total_count"] == len(expected_ids)
+        received.extend(data["bookings"])
+        cursor = data["next_cursor"]
+
+    assert sorted(item["id"] for item in received) == sorted(expected_ids)
+    whens = [item["when"] for item in received]
+    assert whens == sorted(whens, reverse=True)
+
+
+@pytest.mark.usefixtures("charming_host_bookings")
+async def test_호스트는_커서로_자신에게_예약된_부킹_목록을_받는다(
+    client_with_auth: TestClient,
+    host_bookings: list[Booking],
+):
+    response = client_with_auth.get("/bookings", params={"page_size": 3, "cursor": ""})
+    assert response.status_code == status.HTTP_200_OK
+    first_page = response.json()
+    assert len(first_page["bookings"]) == 3
+    assert first_page["next_cursor"] is not None
+
+    response = client_with_auth.get("/bookings", params={"page_size": 3, "cursor": first_page["next_cursor"]})
+    assert response.status_code == status.HTTP_200_OK
+    second_page = response.json()
+    assert second_page["next_cursor"] is None
+
+    ids = [item["id"] for item in first_page["bookings"] + second_page["bookings"]]
+    assert sorted(ids) == sorted(booking.id for booking in host_bookings)
+
+
+async def test_when_과_정각의_created_at_이_같은_예약도_커서로_빠짐없이_받는다(
+    db_session: AsyncSession,
+    client_with_guest_auth: TestClient,
+    guest_user: User,
+    time_slot_tuesday: TimeSlot,
+):
+    created_at = datetime(2024, 12, 1, 9, tzinfo=timezone.utc)
+    bookings = [
+        Booking(
+            when=date(2024, 12, 3),
+            topic="test",
+            description="test",
+            time_slot_id=time_slot_tuesday.id,
+            calendar_id=time_slot_tuesday.calendar_id,
+            guest_id=guest_user.id,
+            created_at=created_at,
+        )
+        for _ in range(3)
+    ]
+    db_session.add_all(bookings)
+    await db_session.commit()
+
+    received = []
+    cursor = ""
+    while cursor is not None:
+        response = client_with_guest_auth.get("/guest-calendar/bookings", params={"page_size": 1, "cursor": cursor})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        received.extend(item["id"] for item in data["bookings"])
+        cursor = data["next_cursor"]
+
+    assert received == sorted((booking.id for booking in bookings), reverse=True)
+
+
+async def test_유효하지_않은_커서로_요청하면_HTTP_422_응답을_한다(
+    client_with_guest_auth: TestClient,
+):
+    response = client_with_guest_auth.get(
+        "/guest-calendar/bookings",
+        params={"page_size": 2, "cursor": "not-a-cursor"},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.parametrize(
     "client, expected_status_code",
     [
@@ -402,6 +723,28 @@ async def test_게스트는_자신의_부킹을_취소만_할_수_있다(
     assert response.status_code == expected_status_code
 
 
+@pytest.mark.usefixtures("host_user_calendar")
+async def test_예약을_생성하거나_취소하면_게스트의_전체_예약_수에_반영된다(
+    host_user: User,
+    client_with_guest_auth: TestClient,
+    valid_booking_payload: dict,
+    host_bookings: list[Booking],
+):
+    response = client_with_guest_auth.post(f"/bookings/{host_user.username}", json=valid_booking_payload)
+    assert response.status_code == status.HTTP_201_CREATED
+    booking_id = response.json()["id"]
+
+    response = client_with_guest_auth.get("/guest-calendar/bookings", params={"page": 1, "page_size": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_count"] == len(host_bookings) + 1
+
+    response = client_with_guest_auth.delete(f"/guest-bookings/{booking_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = client_with_guest_auth.get("/guest-calendar/bookings", params={"page": 1, "page_size": 1})
+    assert response.json()["total_count"] == len(host_bookings) + 1
+
+
 async def test_게스트는_자신이_신청한_부킹에_파일을_업로드할_수_있다(
     client_with_guest_auth: TestClient,
     host_bookings: list[Booking],
@@ -428,15 +771,13 @@ async def test_게스트는_자신이_신청한_부킹에_파일을_업로드할
     assert file_names == ["file1.txt", "file2.txt", "file3.txt"]
 
 
-@pytest.mark.skipif(
-    os.getenv("GOOGLE_CALENDAR_ID") is None,
-    reason="GOOGLE_CALENDAR_ID is not set",
-)
 @pytest.mark.usefixtures("host_user_calendar")
 async def test_부킹을_생성하면_호스트의_구글_캘린더에_일정을_생성한다(
+    db_session: AsyncSession,
     host_user: User,
     client_with_guest_auth: TestClient,
     valid_booking_payload: dict,
+    google_calendar_service: GoogleCalendarService,
 ):
     response = client_with_guest_auth.post(
         f"/bookings/{host_user.username}",
@@ -444,15 +785,23 @@ async def test_부킹을_생성하면_호스트의_구글_캘린더에_일정을
     )
     assert response.status_code == status.HTTP_201_CREATED
     data = response.json()
+    # 구글 캘린더에는 응답한 뒤 아웃박스 워커가 반영한다.
+    assert data["google_event_id"] is None
+
+    assert await drain_outbox(db_session, google_calendar_service) == 1
+
+    response = client_with_guest_auth.get(f"/bookings/{data['id']}")
+    data = response.json()
     assert data["google_event_id"] is not None
 
+    event = await google_calendar_service.get_event(data["google_event_id"])
+    assert event["summary"] == valid_booking_payload["topic"]
+    assert event["status"] == "confirmed"
+
 
-@pytest.mark.skipif(
-    os.getenv("GOOGLE_CALENDAR_ID") is None,
-    reason="GOOGLE_CALENDAR_ID is not set",
-)
 @pytest.mark.usefixtures("host_user_calendar")
 async def test_부킹을_변경하면_호스트의_구글_캘린더에_일정을_반영한다(
+    db_session: AsyncSession,
     host_user: User,
     client_with_guest_auth: TestClient,
     valid_booking_payload: dict,
@@ -463,11 +812,11 @@ async def test_부킹을_변경하면_호스트의_구글_캘린더에_일정을
         json=valid_booking_payload,
     )
     assert response.status_code == status.HTTP_201_CREATED
-    data = response.json()
-    assert data["google_event_id"] is not None
+    booking_id = response.json()["id"]
+    assert await drain_outbox(db_session, google_calendar_service) == 1
 
     response = client_with_guest_auth.patch(
-        f"/guest-bookings/{data['id']}",
+        f"/guest-bookings/{booking_id}",
         json={
             "description": "변경한 설명",
         },
@@ -476,15 +825,15 @@ async def test_부킹을_변경하면_호스트의_구글_캘린더에_일정을
     data = response.json()
     assert data["google_event_id"] is not None
 
+    assert await drain_outbox(db_session, google_calendar_service) == 1
+
     event = await google_calendar_service.get_event(data["google_event_id"])
     assert event["description"] == "변경한 설명"
 
 
-@pytest.mark.skipif(
-    os.getenv("GOOGLE_CALENDAR_ID") is None,
-    reason="GOOGLE_CALENDAR_ID is not set",
-)
+@pytest.mark.usefixtures("host_user_calendar")
 async def test_부킹을_삭제하면_호스트의_구글_캘린더에_일정을_삭제한다(
+    db_session: AsyncSession,
     host_user: User,
     client_with_guest_auth: TestClient,
     google_calendar_service: GoogleCalendarService,
@@ -495,13 +844,19 @@ async def test_부킹을_삭제하면_호스트의_구글_캘린더에_일정을
         json=valid_booking_payload,
     )
     assert response.status_code == status.HTTP_201_CREATED
-    data = response.json()
-    assert data["google_event_id"] is not None
+    booking_id = response.json()["id"]
+    assert await drain_outbox(db_session, google_calendar_service) == 1
+
+    response = client_with_guest_auth.get(f"/bookings/{booking_id}")
+    google_event_id = response.json()["google_event_id"]
+    assert google_event_id is not None
 
-    response = client_with_guest_auth.delete(f"/guest-bookings/{data['id']}")
+    response = client_with_guest_auth.delete(f"/guest-bookings/{booking_id}")
     assert response.status_code == status.HTTP_204_NO_CONTENT
 
-    event = await google_calendar_service.get_event(data["google_event_id"])
+    assert await drain_outbox(db_session, google_calendar_service) == 1
+
+    event = await google_calendar_service.get_event(google_event_id)
     assert event["status"] == "cancelled"
 
 
@@ -0,0 +1,152 @@
+import asyncio
+import calendar
+import logging
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar import endpoints
+from appserver.apps.calendar.booking_events import BookingEvent, InMemoryBookingEventBus
+from appserver.apps.calendar.deps import get_booking_event_bus
+from appserver.apps.calendar.exceptions import HostNotFoundError
+from appserver.apps.calendar.models import TimeSlot
+from appserver.libs.datetime.calendar import get_next_weekday
+
+
+class RecordingBookingEventBus(InMemoryBookingEventBus):
+    def __init__(self):
+        super().__init__()
+        self.published: list[BookingEvent] = []
+
+    async def publish(self, event: BookingEvent) -> None:
+        self.published.append(event)
+        await super().publish(event)
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+def _event(host_id: int, booking_id: int = 1) -> BookingEvent:
+    return BookingEvent(type="created", booking_id=booking_id, host_id=host_id, when="2024-12-03")
+
+
+@pytest.fixture()
+def booking_event_bus(fastapi_app) -> RecordingBookingEventBus:
+    bus = RecordingBookingEventBus()
+    fastapi_app.dependency_overrides[get_booking_event_bus] = lambda: bus
+    return bus
+
+
+async def test_구독한_호스트의_알림만_받는다():
+    bus = InMemoryBookingEventBus()
+
+    async with bus.subscribe(1) as queue, bus.subscribe(2) as other_queue:
+        await bus.publish(_event(1))
+
+        assert (await asyncio.wait_for(queue.get(), 1)).host_id == 1
+        assert other_queue.empty()
+
+
+async def test_구독을_끝내면_구독자에서_빠진다():
+    bus = InMemoryBookingEventBus()
+
+    async with bus.subscribe(1):
+        assert bus.subscriber_count(1) == 1
+
+    assert bus.subscriber_count(1) == 0
+    await bus.publish(_event(1))
+
+
+async def test_구독자가_알림을_가져가지_않으면_오래된_알림부터_버린다():
+    bus = InMemoryBookingEventBus(max_queue_size=2)
+
+    async with bus.subscribe(1) as queue:
+        for booking_id in range(1, 4):
+            await bus.publish(_event(1, booking_id))
+
+        assert [queue.get_nowait().booking_id for _ in range(queue.qsize())] == [2, 3]
+
+
+async def test_리스너가_실패해도_로그를_남기고_구독자에게_알림을_전달한다(caplog: pytest.LogCaptureFixture):
+    bus = InMemoryBookingEventBus()
+
+    def broken_listener(event: BookingEvent) -> None:
+        raise RuntimeError("boom")
+
+    bus.add_listener(broken_listener)
+
+    with caplog.at_level(logging.ERROR, logger="appserver.apps.calendar.booking_events"):
+        async with bus.subscribe(1) as queue:
+            await bus.publish(_event(1))
+
+            assert (await asyncio.wait_for(queue.get(), 1)).host_id == 1
+
+    assert [record.exc_info[0] for record in caplog.records] == [RuntimeError]
+
+
+@pytest.mark.usefixtures("host_user_calendar")
+async def test_예약을_만들고_취소하면_커밋한_뒤_호스트에게_알린다(
+    host_user: User,
+    time_slot_tuesday: TimeSlot,
+    client_with_guest_auth: TestClient,
+    booking_event_bus: RecordingBookingEventBus,
+):
+    when = get_next_weekday(calendar.TUESDAY).isoformat()
+    response = client_with_guest_auth.post(
+        f"/bookings/{host_user.username}",
+        json={"when": when, "topic": "test", "description": "test", "time_slot_id": time_slot_tuesday.id},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    booking_id = response.json()["id"]
+
+    response = client_with_guest_auth.delete(f"/guest-bookings/{booking_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert [(event.type, event.booking_id, event.host_id, event.when) for event in booking_event_bus.published] == [
+        ("created", booking_id, host_user.id, when),
+        ("cancelled", booking_id, host_user.id, when),
+    ]
+
+
+@pytest.mark.usefixtures("host_user_calendar")
+async def test_SSE_로_구독한_호스트의_예약_변경을_보내고_연결이_끊기면_구독을_끝낸다(
+    db_session: AsyncSession,
+    host_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(endpoints, "SSE_HEARTBEAT_INTERVAL", 0.02)
+    await db_session.refresh(host_user, ["calendar"])
+    bus = InMemoryBookingEventBus()
+    request = FakeRequest()
+
+    response = await endpoints.host_booking_events(host_user, bus, request)
+    body = response.body_iterator
+
+    assert await anext(body) == "retry: 3000\n\n"
+    assert await anext(body) == ": keep-alive\n\n"
+    assert bus.subscriber_count(host_user.id) == 1
+
+    await bus.publish(_event(host_user.id, 7))
+    assert await anext(body) == f"data: {_event(host_user.id, 7).to_json()}\n\n"
+
+    request.disconnected = True
+    with pytest.raises(StopAsyncIteration):
+        await anext(body)
+    assert bus.subscriber_count(host_user.id) == 0
+
+
+async def test_호스트가_아니면_예약_변경_SSE_를_구독할_수_없다(
+    client_with_guest_auth: TestClient,
+    booking_event_bus: RecordingBookingEventBus,
+):
+    response = client_with_guest_auth.get("/booking-events")
+
+    assert response.status_code == HostNotFoundError().status_code
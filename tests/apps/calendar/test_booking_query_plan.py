@@ -0,0 +1,62 @@
+import re
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlmodel import select
+
+from appserver.apps.calendar.endpoints import bookings_after_cursor_stmt, host_month_bookings_stmt
+from appserver.apps.calendar.models import Booking, Calendar
+from appserver.libs.pagination import encode_cursor
+
+
+def table_steps(plan: list[str], table: str) -> list[str]:
+    return [step for step in plan if re.search(rf"\b(TABLE )?{table}\b", step)]
+
+
+@pytest.mark.parametrize("year, month", [(2024, 12), (2025, 1)])
+async def test_호스트의_월_단위_예약_조회는_when_인덱스를_사용한다(
+    query_plan,
+    host_user_calendar: Calendar,
+    year: int,
+    month: int,
+):
+    plan = await query_plan(host_month_bookings_stmt(host_user_calendar.id, year, month))
+
+    steps = table_steps(plan, "bookings")
+    assert steps, plan
+    assert all(re.search(r"USING (COVERING )?INDEX", step) for step in steps), plan
+    assert not any(re.search(r"SCAN (TABLE )?bookings\b", step) for step in plan), plan
+
+
+async def test_호스트의_예약_목록은_시간대를_거치지_않고_calendar_id_인덱스로_조회한다(
+    query_plan,
+    host_user_calendar: Calendar,
+):
+    plan = await query_plan(host_month_bookings_stmt(host_user_calendar.id, 2024, 12))
+
+    assert any("ix_bookings_calendar_id_when_created_at_id" in step for step in table_steps(plan, "bookings")), plan
+    assert not any("CORRELATED" in step for step in plan), plan
+
+
+@pytest.mark.parametrize(
+    "where, index_name",
+    [
+        (Booking.guest_id == 1, "ix_bookings_guest_id_when_created_at_id"),
+        (Booking.calendar_id == 1, "ix_bookings_calendar_id_when_created_at_id"),
+    ],
+)
+@pytest.mark.parametrize(
+    "cursor",
+    ["", encode_cursor(date(2024, 12, 3), datetime(2024, 12, 1, 9, tzinfo=timezone.utc), 10)],
+)
+async def test_커서_페이지네이션은_인덱스_순서대로_읽고_따로_정렬하지_않는다(
+    query_plan,
+    where,
+    index_name: str,
+    cursor: str,
+):
+    plan = await query_plan(bookings_after_cursor_stmt(select(Booking).where(where), cursor, 10))
+
+    steps = table_steps(plan, "bookings")
+    assert steps and all(index_name in step for step in steps), plan
+    assert not any("USE TEMP B-TREE" in step for step in plan), plan
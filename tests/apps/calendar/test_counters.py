@@ -0,0 +1,112 @@
+from datetime import date
+
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar.counters import delete_bookings, reconcile_booking_counters, update_booking_counters
+from appserver.apps.calendar.enums import AttendanceStatus, BookingCounterScope
+from appserver.apps.calendar.models import Booking, BookingCounter
+
+
+async def get_counter(db_session: AsyncSession, scope: BookingCounterScope, owner_id: int) -> BookingCounter | None:
+    stmt = (
+        select(BookingCounter)
+        .where(BookingCounter.scope == scope.value)
+        .where(BookingCounter.owner_id == owner_id)
+        .execution_options(populate_existing=True)
+    )
+    result = await db_session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def test_집계_행이_없으면_실제_예약_수로_만들고_이후에는_변화량만_더한다(
+    db_session: AsyncSession,
+    guest_user: User,
+    host_bookings: list[Booking],
+):
+    calendar_id = host_bookings[0].calendar_id
+
+    await update_booking_counters(db_session, guest_id=guest_user.id, calendar_id=calendar_id, booking_delta=1)
+    await db_session.commit()
+
+    counter = await get_counter(db_session, BookingCounterScope.GUEST, guest_user.id)
+    assert counter.booking_count == len(host_bookings)
+    assert counter.cancelled_count == 0
+
+    host_bookings[-1].attendance_status = AttendanceStatus.CANCELLED.value
+    await update_booking_counters(db_session, guest_id=guest_user.id, calendar_id=calendar_id, cancelled_delta=1)
+    await db_session.commit()
+
+    for scope, owner_id in [
+        (BookingCounterScope.GUEST, guest_user.id),
+        (BookingCounterScope.CALENDAR, calendar_id),
+    ]:
+        counter = await get_counter(db_session, scope, owner_id)
+        assert counter.booking_count == len(host_bookings)
+        assert counter.cancelled_count == 1
+
+
+async def test_집계를_재계산하면_실제_예약_수로_맞춘다(
+    db_session: AsyncSession,
+    guest_user: User,
+    host_bookings: list[Booking],
+    charming_host_bookings: list[Booking],
+):
+    db_session.add(BookingCounter(scope=BookingCounterScope.GUEST, owner_id=guest_user.id, booking_count=100))
+    db_session.add(BookingCounter(scope=BookingCounterScope.GUEST, owner_id=guest_user.id + 1000, booking_count=3))
+    await db_session.commit()
+
+    await reconcile_booking_counters(db_session)
+
+    counter = await get_counter(db_session, BookingCounterScope.GUEST, guest_user.id)
+    assert counter.booking_count == len(host_bookings) + len(charming_host_bookings)
+
+    counter = await get_counter(db_session, BookingCounterScope.CALENDAR, charming_host_bookings[0].calendar_id)
+    assert counter.booking_count == len(charming_host_bookings)
+
+    counter = await get_counter(db_session, BookingCounterScope.GUEST, guest_user.id + 1000)
+    assert counter.booking_count == 0
+
+
+async def test_ORM_으로_예약을_지우면_집계에서_뺀다(
+    db_session: AsyncSession,
+    guest_user: User,
+    host_bookings: list[Booking],
+):
+    calendar_id = host_bookings[0].calendar_id
+    host_bookings[0].attendance_status = AttendanceStatus.CANCELLED.value
+    await db_session.commit()
+    await reconcile_booking_counters(db_session)
+
+    await db_session.delete(host_bookings[0])
+    await db_session.commit()
+
+    for scope, owner_id in [
+        (BookingCounterScope.GUEST, guest_user.id),
+        (BookingCounterScope.CALENDAR, calendar_id),
+    ]:
+        counter = await get_counter(db_session, scope, owner_id)
+        assert counter.booking_count == len(host_bookings) - 1
+        assert counter.cancelled_count == 0
+
+
+async def test_예약을_한꺼번에_지우면_캘린더별로_집계에서_뺀다(
+    db_session: AsyncSession,
+    guest_user: User,
+    host_bookings: list[Booking],
+    charming_host_bookings: list[Booking],
+):
+    await reconcile_booking_counters(db_session)
+
+    deleted = await delete_bookings(db_session, Booking.guest_id == guest_user.id, Booking.when < date(2024, 12, 6))
+    await db_session.commit()
+
+    # 12월 3일(host), 4일·5일(charming host) 예약
+    assert deleted == 3
+    counter = await get_counter(db_session, BookingCounterScope.GUEST, guest_user.id)
+    assert counter.booking_count == len(host_bookings) + len(charming_host_bookings) - 3
+    counter = await get_counter(db_session, BookingCounterScope.CALENDAR, host_bookings[0].calendar_id)
+    assert counter.booking_count == len(host_bookings) - 1
+    counter = await get_counter(db_session, BookingCounterScope.CALENDAR, charming_host_bookings[0].calendar_id)
+    assert counter.booking_count == len(charming_host_bookings) - 2
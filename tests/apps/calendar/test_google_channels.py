@@ -0,0 +1,202 @@
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from appserver.apps.calendar import google_channels
+from appserver.apps.calendar.google_sync import sync_google_calendar
+from appserver.apps.calendar.models import Calendar, GoogleCalendarChannel, GoogleEventMirror
+from appserver.libs.google.calendar.cache import google_events_cache
+from appserver.libs.google.calendar.registry import google_calendar_services
+
+
+WEBHOOK_URL = "https://example.com/google-calendar/notifications"
+
+
+class FakeChannelService:
+    def __init__(self):
+        self.watched: list[str] = []
+        self.stopped: list[str] = []
+        self.sync_pages = {None: {"items": [], "nextSyncToken": "t1"}}
+
+    async def watch_events(self, channel_id, address, token, google_calendar_id=None, ttl=None):
+        self.watched.append(google_calendar_id)
+        expiration = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        return {"id": channel_id, "resourceId": f"resource-{google_calendar_id}", "expiration": str(int(expiration.timestamp() * 1000))}
+
+    async def stop_channel(self, channel_id, resource_id):
+        if resource_id.startswith("resource-broken"):
+            raise HttpError(httplib2.Response({"status": 500}), b"{}")
+        self.stopped.append(resource_id)
+        return True
+
+    async def list_nothing(self):
+        return []
+
+    async def sync_events(self, google_calendar_id=None, *, sync_token=None, page_token=None):
+        return self.sync_pages[sync_token]
+
+
+@pytest.fixture()
+def fake_service(monkeypatch: pytest.MonkeyPatch) -> FakeChannelService:
+    service = FakeChannelService()
+    monkeypatch.setattr(google_channels, "GOOGLE_CALENDAR_WEBHOOK_URL", WEBHOOK_URL)
+    monkeypatch.setattr(google_calendar_services, "get", lambda google_calendar_id=None: service)
+    return service
+
+
+async def get_channels(db_session: AsyncSession) -> list[GoogleCalendarChannel]:
+    result = await db_session.execute(
+        select(GoogleCalendarChannel).execution_options(populate_existing=True)
+    )
+    return result.scalars().all()
+
+
+async def test_구글_캘린더_ID_를_바꾸면_이전_채널을_닫고_새_채널을_연다(
+    db_session: AsyncSession,
+    client_with_auth: TestClient,
+    host_user_calendar: Calendar,
+    fake_service: FakeChannelService,
+):
+    previous_google_calendar_id = host_user_calendar.google_calendar_id
+    await google_channels.open_channel(db_session, fake_service, previous_google_calendar_id, WEBHOOK_URL)
+
+    response = client_with_auth.patch("/calendar", json={"google_calendar_id": "new@group.calendar.google.com"})
+    assert response.status_code == status.HTTP_200_OK
+
+    assert fake_service.stopped == [f"resource-{previous_google_calendar_id}"]
+    channels = await get_channels(db_session)
+    assert [channel.google_calendar_id for channel in channels] == ["new@group.calendar.google.com"]
+
+
+async def test_알림_채널이_없어도_구글_캘린더_ID_를_바꾸면_이전_캘린더의_캐시를_지운다(
+    client_with_auth: TestClient,
+    host_user_calendar: Calendar,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(google_channels, "GOOGLE_CALENDAR_WEBHOOK_URL", None)
+    google_events_cache.clear()
+
+    async def list_nothing():
+        return []
+
+    await google_events_cache.get_or_fetch((host_user_calendar.google_calendar_id, 2024, 12), list_nothing)
+
+    response = client_with_auth.patch("/calendar", json={"google_calendar_id": "new@group.calendar.google.com"})
+    assert response.status_code == status.HTTP_200_OK
+
+    assert len(google_events_cache) == 0
+
+
+async def test_알림이_오면_그_캘린더의_캐시를_지우고_미러를_증분_동기화한다(
+    db_session: AsyncSession,
+    client: TestClient,
+    host_user_calendar: Calendar,
+    fake_service: FakeChannelService,
+):
+    google_calendar_id = host_user_calendar.google_calendar_id
+    channel = await google_channels.open_channel(db_session, fake_service, google_calendar_id, WEBHOOK_URL)
+    await sync_google_calendar(db_session, fake_service, google_calendar_id)
+    await google_events_cache.get_or_fetch((google_calendar_id, 2024, 12), fake_service.list_nothing)
+    fake_service.sync_pages["t1"] = {
+        "items": [{
+            "id": "changed",
+            "status": "confirmed",
+            "start": {"dateTime": "2024-12-24T10:00:00+09:00"},
+            "end": {"dateTime": "2024-12-24T11:00:00+09:00"},
+        }],
+        "nextSyncToken": "t2",
+    }
+    headers = {
+        "X-Goog-Channel-ID": channel.channel_id,
+        "X-Goog-Channel-Token": channel.token,
+        "X-Goog-Resource-ID": channel.resource_id,
+        "X-Goog-Resource-State": "exists",
+    }
+
+    response = client.post("/google-calendar/notifications", headers=headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert len(google_events_cache) == 0
+    result = await db_session.execute(select(GoogleEventMirror.event_id))
+    assert result.scalars().all() == ["changed"]
+
+    response = client.post(
+        "/google-calendar/notifications",
+        headers={**headers, "X-Goog-Channel-Token": "wrong"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_곧_만료되는_채널은_새_채널로_바꾸고_쓰지_않는_채널은_닫는다(
+    db_session: AsyncSession,
+    host_user_calendar: Calendar,
+    fake_service: FakeChannelService,
+):
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        GoogleCalendarChannel(
+            google_calendar_id=host_user_calendar.google_calendar_id,
+            channel_id="expiring",
+            resource_id="resource-expiring",
+            token="token",
+            expires_at=now + timedelta(hours=1),
+        ),
+        GoogleCalendarChannel(
+            google_calendar_id="removed@group.calendar.google.com",
+            channel_id="orphan",
+            resource_id="resource-orphan",
+            token="token",
+            expires_at=now + timedelta(days=7),
+        ),
+    ])
+    await db_session.commit()
+
+    opened = await google_channels.renew_channels(db_session, google_calendar_services.get, WEBHOOK_URL, now)
+
+    assert opened == 1
+    assert sorted(fake_service.stopped) == ["resource-expiring", "resource-orphan"]
+    channels = await get_channels(db_session)
+    assert [channel.google_calendar_id for channel in channels] == [host_user_calendar.google_calendar_id]
+    assert channels[0].expires_at > now + google_channels.RENEW_BEFORE
+
+
+async def test_채널_하나를_닫지_못해도_나머지_채널은_갱신하고_실패한_채널은_다음에_다시_닫는다(
+    db_session: AsyncSession,
+    host_user_calendar: Calendar,
+    fake_service: FakeChannelService,
+):
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        GoogleCalendarChannel(
+            google_calendar_id="removed@group.calendar.google.com",
+            channel_id="broken",
+            resource_id="resource-broken",
+            token="token",
+            expires_at=now + timedelta(days=7),
+        ),
+        GoogleCalendarChannel(
+            google_calendar_id="removed@group.calendar.google.com",
+            channel_id="orphan",
+            resource_id="resource-orphan",
+            token="token",
+            expires_at=now + timedelta(days=7),
+        ),
+    ])
+    await db_session.commit()
+
+    opened = await google_channels.renew_channels(db_session, google_calendar_services.get, WEBHOOK_URL, now)
+
+    assert opened == 1
+    assert fake_service.stopped == ["resource-orphan"]
+    channels = await get_channels(db_session)
+    assert sorted(channel.google_calendar_id for channel in channels) == [
+        host_user_calendar.google_calendar_id,
+        "removed@group.calendar.google.com",
+    ]
+    assert [channel.channel_id for channel in channels if channel.google_calendar_id.startswith("removed")] == ["broken"]
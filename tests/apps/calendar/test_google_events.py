@@ -0,0 +1,33 @@
+import pytest
+
+from appserver.apps.calendar.google_events import GoogleEventSlot, convert_google_events
+from appserver.apps.calendar.schemas import GoogleCalendarEventOut
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        {"id": "timed", "start": {"dateTime": "2024-12-03T10:00:00+09:00"}, "end": {"dateTime": "2024-12-03T11:00:00+09:00"}},
+        {"id": "utc", "start": {"dateTime": "2024-12-31T23:30:00Z"}, "end": {"dateTime": "2025-01-01T00:15:30Z"}},
+        {"id": "micro", "start": {"dateTime": "2024-12-03T10:00:00.250000"}, "end": {"dateTime": "2024-12-03T10:30:00"}},
+        {"id": "종일\"event", "start": {"date": "2024-12-07"}, "end": {"date": "2024-12-08"}},
+    ],
+)
+def test_빠른_변환은_응답_모델과_같은_JSON_을_만든다(event: dict):
+    model = GoogleCalendarEventOut.model_validate(event)
+    slot = GoogleEventSlot.from_event(event)
+
+    assert slot.to_json() == model.model_dump_json()
+    assert slot.to_dict() == model.model_dump(mode="json")
+
+
+def test_일정은_한_번만_파싱해서_slots_객체로_들고_있는다():
+    events = [
+        {"id": str(index), "start": {"date": "2024-12-07"}, "end": {"date": "2024-12-08"}}
+        for index in range(3)
+    ]
+
+    slots = convert_google_events(events)
+
+    assert [slot.id for slot in slots] == ["0", "1", "2"]
+    assert not hasattr(slots[0], "__dict__")
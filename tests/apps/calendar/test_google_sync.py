@@ -0,0 +1,168 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import insert, select
+
+from appserver.apps.account.models import User
+from appserver import db
+from appserver.apps.calendar import google_sync
+from appserver.apps.calendar.google_sync import list_mirrored_events, sync_google_calendar
+from appserver.apps.calendar.models import Booking, Calendar, GoogleCalendarSyncState, GoogleEventMirror
+from appserver.libs.google.calendar.deps import get_google_calendar_service
+from appserver.libs.google.calendar.registry import google_calendar_services
+from appserver.libs.google.calendar.services import SyncTokenExpiredError
+
+
+GOOGLE_CALENDAR_ID = "host@example.com"
+
+
+def make_event(event_id: str, start: str, end: str) -> dict:
+    return {"id": event_id, "status": "confirmed", "start": {"dateTime": start}, "end": {"dateTime": end}}
+
+
+class FakeSyncService:
+    """sync_token 별로 준비한 페이지를 돌려준다. 등록하지 않은 토큰은 만료(410)로 본다."""
+
+    def __init__(self, pages: dict[str | None, list[dict]]):
+        self.pages = pages
+        self.calls: list[tuple[str | None, str | None]] = []
+
+    async def sync_events(self, google_calendar_id=None, *, sync_token=None, page_token=None):
+        self.calls.append((sync_token, page_token))
+        if sync_token not in self.pages:
+            raise SyncTokenExpiredError(google_calendar_id)
+        return self.pages[sync_token][int(page_token or 0)]
+
+    async def event_list(self, *args, **kwargs):
+        raise AssertionError("미러가 있으면 Google 을 호출하지 않아야 한다")
+
+
+async def mirrored_event_ids(db_session: AsyncSession) -> set[str]:
+    result = await db_session.execute(select(GoogleEventMirror.event_id))
+    return set(result.scalars().all())
+
+
+async def test_처음에는_전체_목록을_페이지별로_읽고_이후에는_바뀐_일정만_반영한다(db_session: AsyncSession):
+    service = FakeSyncService({
+        None: [
+            {"items": [make_event("a", "2024-12-03T10:00:00+09:00", "2024-12-03T11:00:00+09:00")], "nextPageToken": "1"},
+            {"items": [make_event("b", "2024-12-10T10:00:00+09:00", "2024-12-10T11:00:00+09:00")], "nextSyncToken": "t1"},
+        ],
+        "t1": [
+            {
+                "items": [
+                    {"id": "a", "status": "cancelled"},
+                    make_event("b", "2024-12-11T10:00:00+09:00", "2024-12-11T11:00:00+09:00"),
+                ],
+                "nextSyncToken": "t2",
+            },
+        ],
+    })
+
+    assert await sync_google_calendar(db_session, service, GOOGLE_CALENDAR_ID) == 2
+    assert await mirrored_event_ids(db_session) == {"a", "b"}
+
+    assert await sync_google_calendar(db_session, service, GOOGLE_CALENDAR_ID) == 2
+    assert service.calls == [(None, None), (None, "1"), ("t1", None)]
+    assert await mirrored_event_ids(db_session) == {"b"}
+
+    events = await list_mirrored_events(db_session, GOOGLE_CALENDAR_ID, 2024, 12)
+    assert events == [{
+        "id": "b",
+        "start": {"dateTime": "2024-12-11T10:00:00+09:00"},
+        "end": {"dateTime": "2024-12-11T11:00:00+09:00"},
+    }]
+
+    result = await db_session.execute(select(GoogleCalendarSyncState.sync_token))
+    assert result.scalar_one() == "t2"
+
+
+async def test_sync_token_이_만료되면_미러를_비우고_전체_동기화를_다시_한다(db_session: AsyncSession):
+    db_session.add(GoogleCalendarSyncState(google_calendar_id=GOOGLE_CALENDAR_ID, sync_token="expired"))
+    await db_session.commit()
+    service = FakeSyncService({
+        None: [{"items": [make_event("c", "2024-12-17T10:00:00+09:00", "2024-12-17T11:00:00+09:00")], "nextSyncToken": "t1"}],
+    })
+
+    await sync_google_calendar(db_session, service, GOOGLE_CALENDAR_ID)
+
+    assert service.calls == [("expired", None), (None, None)]
+    assert await mirrored_event_ids(db_session) == {"c"}
+
+
+async def test_동기화하지_않은_캘린더는_미러에서_읽지_않는다(db_session: AsyncSession):
+    assert await list_mirrored_events(db_session, GOOGLE_CALENDAR_ID, 2024, 12) is None
+
+
+async def test_마지막_동기화가_오래된_미러는_읽지_않는다(db_session: AsyncSession):
+    service = FakeSyncService({
+        None: [{"items": [make_event("a", "2024-12-03T10:00:00+09:00", "2024-12-03T11:00:00+09:00")], "nextSyncToken": "t1"}],
+    })
+    await sync_google_calendar(db_session, service, GOOGLE_CALENDAR_ID)
+    now = datetime.now(timezone.utc)
+
+    assert await list_mirrored_events(db_session, GOOGLE_CALENDAR_ID, 2024, 12, now) is not None
+    later = now + timedelta(seconds=google_sync.MIRROR_MAX_AGE + 1)
+    assert await list_mirrored_events(db_session, GOOGLE_CALENDAR_ID, 2024, 12, later) is None
+
+
+async def test_동기화_위치를_만들_때_이미_있으면_충돌하지_않고_그_행을_쓴다(db_session: AsyncSession):
+    service = FakeSyncService({
+        None: [{"items": [], "nextSyncToken": "t1"}],
+    })
+    # 동시에 시작한 다른 동기화가 먼저 만든 행. 이 세션의 식별자 맵에는 없다.
+    await db_session.execute(insert(GoogleCalendarSyncState).values(google_calendar_id=GOOGLE_CALENDAR_ID))
+
+    await sync_google_calendar(db_session, service, GOOGLE_CALENDAR_ID)
+
+    result = await db_session.execute(select(GoogleCalendarSyncState.sync_token))
+    assert result.scalars().all() == ["t1"]
+
+
+async def test_주기_동기화에서_실패한_캘린더는_예외를_로그로_남긴다(
+    db_session: AsyncSession,
+    host_user_calendar: Calendar,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+):
+    class BrokenSyncService:
+        async def sync_events(self, google_calendar_id=None, *, sync_token=None, page_token=None):
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(db, "async_session_factory", db.create_session(db_session.bind))
+    monkeypatch.setattr(google_calendar_services, "get", lambda google_calendar_id=None: BrokenSyncService())
+
+    with caplog.at_level(logging.ERROR, logger="appserver.apps.calendar.google_sync"):
+        assert await google_sync.sync_all_calendars() == 0
+
+    assert [(record.getMessage(), record.exc_info[0]) for record in caplog.records] == [
+        (f"google calendar sync failed: {host_user_calendar.google_calendar_id}", RuntimeError),
+    ]
+
+
+async def test_동기화한_캘린더의_월별_예약_조회는_미러의_일정을_함께_반환한다(
+    db_session: AsyncSession,
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_user: User,
+    host_user_calendar: Calendar,
+    host_bookings: list[Booking],
+):
+    service = FakeSyncService({
+        None: [{"items": [make_event("d", "2024-12-24T10:00:00+09:00", "2024-12-24T11:00:00+09:00")], "nextSyncToken": "t1"}],
+    })
+    await sync_google_calendar(db_session, service, host_user_calendar.google_calendar_id)
+    fastapi_app.dependency_overrides[get_google_calendar_service] = lambda: service
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings",
+        params={"year": 2024, "month": 12},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    event_ids = [item["id"] for item in response.json() if isinstance(item["id"], str)]
+    assert event_ids == ["d"]
@@ -0,0 +1,112 @@
+import re
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar.loaders import stream_bookings, with_booking_profile
+from appserver.apps.calendar.models import Booking
+from appserver.libs.google.calendar.cache import google_events_cache
+from appserver.libs.google.calendar.deps import get_google_calendar_service
+from appserver.libs.google.calendar.services import GoogleCalendarService
+
+
+def booking_selects(statements: list[str]) -> list[str]:
+    return [statement for statement in statements if re.match(r"\s*SELECT .*\sFROM bookings\b", statement, re.S)]
+
+
+def tables_of(statement: str) -> set[str]:
+    return set(re.findall(r"\b(?:FROM|JOIN) (\w+)", statement))
+
+
+class EmptyCalendarClient:
+    """구글 캘린더에 일정이 없다고 답하는 discovery 클라이언트 대역"""
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        return self
+
+    def execute(self, http=None):
+        return {"items": []}
+
+
+async def test_simple_프로필은_시간대만_함께_읽는다(
+    fastapi_app,
+    client_with_guest_auth: TestClient,
+    host_user: User,
+    host_bookings: list[Booking],
+    sql_statements: list[str],
+):
+    google_events_cache.clear()
+    fastapi_app.dependency_overrides[get_google_calendar_service] = lambda: GoogleCalendarService(
+        "host@example.com",
+        service=EmptyCalendarClient(),
+    )
+
+    response = client_with_guest_auth.get(
+        f"/calendar/{host_user.username}/bookings",
+        params={"year": 2024, "month": 12},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    selects = booking_selects(sql_statements)
+    assert len(selects) == 1, selects
+    assert tables_of(selects[0]) == {"bookings", "time_slots"}
+    assert "bookings.description" not in selects[0]
+    assert not any("booking_files" in statement for statement in sql_statements)
+
+
+async def test_detail_프로필은_호스트까지_조인하고_첨부파일은_따로_읽는다(
+    client_with_guest_auth: TestClient,
+    host_bookings: list[Booking],
+    sql_statements: list[str],
+):
+    response = client_with_guest_auth.get(f"/bookings/{host_bookings[0].id}")
+    assert response.status_code == status.HTTP_200_OK
+
+    selects = booking_selects(sql_statements)
+    assert len(selects) == 1, selects
+    assert tables_of(selects[0]) >= {"bookings", "time_slots", "calendars", "users"}
+    assert "booking_files" not in selects[0]
+    assert any(re.search(r"FROM booking_files\b", statement) for statement in sql_statements)
+
+
+@pytest.mark.usefixtures("host_bookings")
+async def test_프로필에_없는_관계에_접근하면_쿼리를_보내지_않고_예외를_일으킨다(db_session: AsyncSession):
+    db_session.expunge_all()
+
+    stmt = with_booking_profile(select(Booking), "simple")
+    result = await db_session.execute(stmt)
+    booking = result.scalars().first()
+
+    assert booking.time_slot is not None
+    with pytest.raises(InvalidRequestError):
+        booking.files
+    with pytest.raises(InvalidRequestError):
+        booking.description
+
+
+async def test_스트리밍은_한_쿼리를_배치로_나눠_읽고_넘긴_배치는_세션에서_뗀다(
+    db_session: AsyncSession,
+    host_bookings: list[Booking],
+    sql_statements: list[str],
+):
+    db_session.expunge_all()
+
+    batches = []
+    async for bookings in stream_bookings(db_session, select(Booking), "simple", batch_size=2):
+        assert all(booking in db_session for booking in bookings)
+        batches.append(bookings)
+
+    assert [len(bookings) for bookings in batches[:-1]] == [2] * (len(batches) - 1)
+    assert sorted(booking.id for bookings in batches for booking in bookings) == sorted(
+        booking.id for booking in host_bookings
+    )
+    assert not any(booking in db_session for bookings in batches for booking in bookings)
+    assert len(booking_selects(sql_statements)) == 1
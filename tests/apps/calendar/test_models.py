@@ -0,0 +1,63 @@
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar.models import Booking, TimeSlot
+
+
+async def test_calendar_id_없이_예약을_만들면_타임슬롯의_캘린더로_채운다(
+    db_session: AsyncSession,
+    guest_user: User,
+    time_slot_tuesday: TimeSlot,
+):
+    booking = Booking(
+        when=date(2024, 12, 24),
+        topic="test",
+        description="test",
+        time_slot_id=time_slot_tuesday.id,
+        guest_id=guest_user.id,
+    )
+    db_session.add(booking)
+    await db_session.commit()
+
+    result = await db_session.execute(select(Booking.calendar_id).where(Booking.id == booking.id))
+    assert result.scalar_one() == time_slot_tuesday.calendar_id
+
+
+async def test_예약의_타임슬롯을_바꾸면_calendar_id_도_따라_바뀐다(
+    db_session: AsyncSession,
+    host_bookings: list[Booking],
+    time_slot_friday: TimeSlot,
+):
+    booking = host_bookings[0]
+    booking.time_slot_id = time_slot_friday.id
+    await db_session.commit()
+
+    result = await db_session.execute(select(Booking.calendar_id).where(Booking.id == booking.id))
+    assert result.scalar_one() == time_slot_friday.calendar_id
+
+
+async def test_타임슬롯을_저장하면_요일_비트마스크를_함께_저장한다(
+    db_session: AsyncSession,
+    time_slot_wednesday_thursday: TimeSlot,
+):
+    result = await db_session.execute(
+        select(TimeSlot.weekday_mask).where(TimeSlot.id == time_slot_wednesday_thursday.id)
+    )
+
+    assert result.scalar_one() == 0b0001100
+    assert time_slot_wednesday_thursday.is_available_on(date(2024, 12, 4)) is True
+    assert time_slot_wednesday_thursday.is_available_on(date(2024, 12, 6)) is False
+
+
+async def test_타임슬롯의_요일을_바꾸면_비트마스크도_바뀐다(
+    db_session: AsyncSession,
+    time_slot_tuesday: TimeSlot,
+):
+    time_slot_tuesday.weekdays = [0, 6]
+    await db_session.commit()
+
+    result = await db_session.execute(select(TimeSlot.weekday_mask).where(TimeSlot.id == time_slot_tuesday.id))
+    assert result.scalar_one() == 0b1000001
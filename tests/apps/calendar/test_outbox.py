@@ -0,0 +1,237 @@
+import calendar
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from googleapiclient.errors import HttpError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from appserver.apps.account.models import User
+from appserver.apps.calendar import outbox
+from appserver.apps.calendar.booking_events import InMemoryBookingEventBus, invalidate_google_events
+from appserver.apps.calendar.enums import OutboxAction, OutboxStatus
+from appserver.apps.calendar.models import Booking, GoogleCalendarOutbox, TimeSlot
+from appserver.db import create_session
+from appserver.libs.datetime.calendar import get_next_weekday
+from appserver.libs.google.calendar.batch import BatchResult
+from appserver.libs.google.calendar.cache import google_events_cache
+
+
+def http_error(status_code: int) -> HttpError:
+    return HttpError(httplib2.Response({"status": status_code}), b"{}")
+
+
+class FakeOutboxService:
+    def __init__(self):
+        self.calls: list[tuple] = []
+        self.errors: list[HttpError] = []
+        self.batches: list[FakeOutboxBatch] = []
+
+    def insert_event_request(self, summary, start_datetime, end_datetime, *, google_calendar_id=None, event_id=None, **options):
+        return ("insert", event_id, summary)
+
+    def update_event_request(self, event_id, start_datetime, end_datetime, google_calendar_id=None, **options):
+        return ("update", event_id, options.get("summary"))
+
+    def delete_event_request(self, event_id, google_calendar_id=None):
+        return ("delete", event_id, None)
+
+    def batch(self) -> "FakeOutboxBatch":
+        batch = FakeOutboxBatch(self)
+        self.batches.append(batch)
+        return batch
+
+
+class FakeOutboxBatch:
+    """항목마다 준비한 오류를 차례로 돌려준다."""
+
+    def __init__(self, service: FakeOutboxService):
+        self.service = service
+        self.requests: list[tuple[str, tuple]] = []
+        self.results: dict[str, BatchResult] = {}
+
+    def keys(self) -> list[str]:
+        return [key for key, _ in self.requests]
+
+    def add(self, key: str, request: tuple) -> None:
+        self.requests.append((key, request))
+
+    async def execute(self) -> dict[str, BatchResult]:
+        for key, request in self.requests:
+            self.service.calls.append(request)
+            if self.service.errors:
+                self.results[key] = BatchResult(key, error=self.service.errors.pop(0))
+            else:
+                self.results[key] = BatchResult(key, response={"id": request[1]})
+        return self.results
+
+
+@pytest.fixture()
+def service() -> FakeOutboxService:
+    return FakeOutboxService()
+
+
+async def get_entries(db_session: AsyncSession) -> list[GoogleCalendarOutbox]:
+    stmt = select(GoogleCalendarOutbox).order_by(GoogleCalendarOutbox.id).execution_options(populate_existing=True)
+    result = await db_session.execute(stmt)
+    return result.scalars().all()
+
+
+async def drain(
+    db_session: AsyncSession,
+    service: FakeOutboxService,
+    bus: InMemoryBookingEventBus | None = None,
+) -> int:
+    worker = outbox.OutboxWorker(
+        create_session(db_session.bind),
+        lambda google_calendar_id: service,
+        concurrency=1,
+        bus=bus,
+    )
+    return await worker.run_once()
+
+
+@pytest.mark.usefixtures("host_user_calendar")
+async def test_예약을_만들면_같은_트랜잭션에_작업을_기록하고_워커가_일정을_만든다(
+    db_session: AsyncSession,
+    host_user: User,
+    client_with_guest_auth: TestClient,
+    time_slot_tuesday: TimeSlot,
+    service: FakeOutboxService,
+):
+    response = client_with_guest_auth.post(
+        f"/bookings/{host_user.username}",
+        json={
+            "when": get_next_weekday(calendar.TUESDAY).isoformat(),
+            "topic": "test",
+            "description": "test",
+            "time_slot_id": time_slot_tuesday.id,
+        },
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    booking_id = response.json()["id"]
+
+    entries = await get_entries(db_session)
+    assert [(entry.booking_id, entry.action) for entry in entries] == [(booking_id, OutboxAction.CREATE)]
+    assert service.calls == []
+
+    assert await drain(db_session, service) == 1
+
+    booking = await db_session.get(Booking, booking_id, populate_existing=True)
+    assert booking.google_event_id == entries[0].event_id
+    assert await get_entries(db_session) == []
+
+
+async def test_같은_예약의_작업은_앞선_작업이_끝난_뒤에_처리한다(
+    db_session: AsyncSession,
+    host_bookings: list[Booking],
+    service: FakeOutboxService,
+):
+    booking = host_bookings[0]
+    await outbox.enqueue_google_event(db_session, OutboxAction.CREATE, booking, "host@example.com")
+    await outbox.enqueue_google_event(db_session, OutboxAction.UPDATE, booking, "host@example.com")
+    await db_session.commit()
+    service.errors.append(http_error(500))
+
+    assert await drain(db_session, service) == 0
+    create, update = await get_entries(db_session)
+    assert create.attempts == 1
+    assert update.attempts == 0
+    assert [call[0] for call in service.calls] == ["insert"]
+
+    # 앞선 시도에서 이미 만들어졌으면(409) 정해 둔 ID 를 그대로 쓴다.
+    service.errors.append(http_error(409))
+    for entry in (create, update):
+        entry.available_at = datetime.now(timezone.utc)
+    await db_session.commit()
+    assert await drain(db_session, service) == 2
+
+    assert [call[0] for call in service.calls] == ["insert", "insert", "update"]
+    assert service.calls[-1][1] == create.event_id
+    assert await get_entries(db_session) == []
+
+
+async def test_실패하면_지수_백오프로_다시_시도하고_횟수를_넘기면_포기한다(
+    db_session: AsyncSession,
+    host_bookings: list[Booking],
+    service: FakeOutboxService,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(outbox, "MAX_ATTEMPTS", 2)
+    booking = host_bookings[0]
+    booking.google_event_id = "event1"
+    await outbox.enqueue_google_event(db_session, OutboxAction.DELETE, booking, "host@example.com")
+    await db_session.commit()
+    service.errors.extend([http_error(500), http_error(500)])
+
+    now = datetime.now(timezone.utc)
+    await drain(db_session, service)
+    (entry,) = await get_entries(db_session)
+    assert entry.status == OutboxStatus.PENDING
+    assert entry.available_at >= now + outbox.retry_delay(1)
+
+    stats = await outbox.outbox_stats(db_session, now + timedelta(seconds=30))
+    assert stats.depth == 1
+    assert stats.lag_seconds >= 30
+
+    entry.available_at = now
+    await db_session.commit()
+    await drain(db_session, service)
+    (entry,) = await get_entries(db_session)
+    assert entry.status == OutboxStatus.FAILED
+    assert entry.attempts == 2
+
+    stats = await outbox.outbox_stats(db_session, now)
+    assert (stats.depth, stats.failed) == (0, 1)
+
+
+async def test_아웃박스_지표를_Prometheus_형식으로_보낸다(
+    db_session: AsyncSession,
+    host_bookings: list[Booking],
+    client: TestClient,
+):
+    booking = host_bookings[0]
+    booking.google_event_id = "event1"
+    await outbox.enqueue_google_event(db_session, OutboxAction.DELETE, booking, "host@example.com")
+    entry = await outbox.enqueue_google_event(db_session, OutboxAction.DELETE, booking, "host@example.com")
+    entry.status = OutboxStatus.FAILED.value
+    await db_session.commit()
+
+    response = client.get("/google-calendar/outbox/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    values = dict(line.split(" ") for line in response.text.splitlines() if not line.startswith("#"))
+    assert values["google_calendar_outbox_depth"] == "1"
+    assert values["google_calendar_outbox_failed"] == "1"
+    assert float(values["google_calendar_outbox_lag_seconds"]) >= 0
+
+
+async def test_구글_캘린더에_반영하면_알림을_보내_받은_워커마다_일정_캐시를_지운다(
+    db_session: AsyncSession,
+    host_user: User,
+    host_bookings: list[Booking],
+    service: FakeOutboxService,
+):
+    google_events_cache.clear()
+    bus = InMemoryBookingEventBus()
+    bus.add_listener(invalidate_google_events)
+    booking = host_bookings[0]
+    await outbox.enqueue_google_event(db_session, OutboxAction.CREATE, booking, "host@example.com")
+    await db_session.commit()
+    # 아웃박스 워커는 반영한 달(2024-12)만 지운다. 다른 달의 캐시는 알림을 받아야 지워진다.
+    await google_events_cache.get_or_fetch(("host@example.com", 2025, 1), _no_events)
+
+    async with bus.subscribe(host_user.id) as queue:
+        assert await drain(db_session, service, bus) == 1
+
+        event = queue.get_nowait()
+    assert (event.type, event.booking_id, event.google_calendar_id) == ("google_synced", booking.id, "host@example.com")
+    assert len(google_events_cache) == 0
+
+
+async def _no_events() -> list[dict]:
+    return []
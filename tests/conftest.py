@@ -1,20 +1,28 @@
 import calendar
+from contextlib import asynccontextmanager
 from datetime import date, time
 import os
+import socket
+import threading
+import time as time_module
 
 from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
 import pytest
+import uvicorn
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import SQLModel
 
-from appserver.db import create_engine, create_session, use_session
+from appserver.db import create_engine, create_session, use_read_session, use_session, use_session_factory
 from appserver.app import include_routers
 from appserver.apps.account import models as account_models
 from appserver.apps.calendar import models as calendar_models
 from appserver.apps.account.utils import hash_password
 from appserver.apps.account.schemas import LoginPayload
 from appserver.libs.datetime.datetime import utcnow
+from appserver.libs.google.calendar.cache import google_events_cache
+from tests.support.fake_google_calendar import FakeGoogleCalendar
 
 
 @pytest.fixture(autouse=True)
@@ -36,6 +44,35 @@ async def db_session():
     await engine.dispose()
 
 
+@pytest.fixture()
+def query_plan(db_session: AsyncSession):
+    """SQLite 의 EXPLAIN QUERY PLAN 결과에서 각 단계의 설명만 모아 반환한다."""
+
+    async def _explain(stmt) -> list[str]:
+        conn = await db_session.connection()
+        compiled = stmt.compile(dialect=conn.dialect)
+        # 실행 계획은 바인딩 값에 영향을 받지 않는다.
+        params = tuple(None for _ in compiled.positiontup or ())
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        return [row[-1] for row in result.all()]
+
+    return _explain
+
+
+@pytest.fixture()
+def sql_statements(db_session: AsyncSession):
+    """테스트 중에 실행한 SQL 문을 모은다. 엔드포인트가 어떤 쿼리를 보내는지 확인할 때 쓴다."""
+    statements: list[str] = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _collect)
+    yield statements
+    event.remove(sync_engine, "before_cursor_execute", _collect)
+
+
 @pytest.fixture()
 def fastapi_app(db_session: AsyncSession):
     app = FastAPI()
@@ -44,11 +81,18 @@ def fastapi_app(db_session: AsyncSession):
     async def override_use_session():
         yield db_session
 
+    @asynccontextmanager
+    async def open_test_session():
+        yield db_session
+
     def override_utcnow():
         return utcnow().replace(year=2024, month=12, day=5)
 
     app.dependency_overrides[use_session] = override_use_session
+    app.dependency_overrides[use_read_session] = override_use_session
+    app.dependency_overrides[use_session_factory] = lambda: open_test_session
     app.dependency_overrides[utcnow] = override_utcnow
+    google_events_cache.clear()
     return app
 
 
@@ -293,6 +337,7 @@ async def host_bookings(
             topic="test",
             description="test",
             time_slot_id=time_slot_tuesday.id,
+            calendar_id=time_slot_tuesday.calendar_id,
             guest_id=guest_user.id,
         )
         db_session.add(booking)
@@ -314,6 +359,7 @@ async def charming_host_bookings(
             topic="test",
             description="test",
             time_slot_id=time_slot_wednesday_thursday.id,
+            calendar_id=time_slot_wednesday_thursday.calendar_id,
             guest_id=guest_user.id,
         )
         db_session.add(booking)
@@ -321,3 +367,25 @@ async def charming_host_bookings(
 
     await db_session.commit()
     return bookings
+
+
+@pytest.fixture()
+def fake_google_calendar() -> FakeGoogleCalendar:
+    return FakeGoogleCalendar(notify=None)
+
+
+@pytest.fixture()
+def fake_google_calendar_endpoint(fake_google_calendar: FakeGoogleCalendar):
+    """대역 Google Calendar 서버를 띄우고 주소를 넘긴다."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(fake_google_calendar.app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time_module.sleep(0.01)
+    yield f"http://127.0.0.1:{port}/"
+    server.should_exit = True
+    thread.join()
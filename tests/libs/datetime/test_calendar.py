@@ -1,7 +1,10 @@
 import pytest
+from datetime import date
+
 from appserver.libs.datetime.calendar import (
     get_start_weekday_of_month,
     get_last_day_of_month,
+    get_month_range,
     get_range_days_of_month,
 )
 
@@ -24,6 +27,19 @@ def test_get_last_day_of_month(year, month, expected):
     assert get_last_day_of_month(year, month) == expected
 
 
+@pytest.mark.parametrize("year, month, expected_start, expected_end", [
+    (2024, 2, date(2024, 2, 1), date(2024, 3, 1)),
+    (2024, 11, date(2024, 11, 1), date(2024, 12, 1)),
+    (2024, 12, date(2024, 12, 1), date(2025, 1, 1)),
+])
+def test_get_month_range(year, month, expected_start, expected_end):
+    start, end = get_month_range(year, month)
+
+    assert start == expected_start
+    assert end == expected_end
+    assert (end - start).days == get_last_day_of_month(year, month)
+
+
 @pytest.mark.parametrize("year, month, expected_padding_count, expected_total_count", [
     # 2024년 3월: 금요일(5)에 시작, 31일까지
     (2024, 3, 5, 36),
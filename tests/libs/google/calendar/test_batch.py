@@ -0,0 +1,125 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+import pytest
+from googleapiclient.discovery import build_from_document
+
+from appserver.libs.google.calendar import batch as batch_module
+from appserver.libs.google.calendar.services import GoogleCalendarService, load_calendar_discovery_document
+
+
+class FakeBatchHttp:
+    """batch 요청의 각 항목에 응답한다.
+
+    이벤트 ID 가 `missing` 으로 시작하면 404, `flaky` 로 시작하면 처음 한 번만 503 으로 응답한다.
+    """
+
+    def __init__(self):
+        self.batch_sizes: list[int] = []
+        self.event_ids: list[list[str]] = []
+        self._flaky_seen: set[str] = set()
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        body = body.decode() if isinstance(body, bytes) else body
+        parts = re.findall(r"Content-ID: <(.+?)>.*?\n\n(\w+) (\S+) HTTP/1.1", body, re.S)
+        self.batch_sizes.append(len(parts))
+
+        chunks = []
+        self.event_ids.append([])
+        for content_id, request_method, path in parts:
+            event_id = path.split("?")[0].rstrip("/").split("/")[-1]
+            self.event_ids[-1].append(event_id)
+            if event_id.startswith("missing"):
+                status_line, payload = "404 Not Found", '{"error": {"code": 404, "message": "Not Found"}}'
+            elif event_id.startswith("flaky") and event_id not in self._flaky_seen:
+                self._flaky_seen.add(event_id)
+                status_line, payload = "503 Service Unavailable", '{"error": {"code": 503, "message": "Backend Error"}}'
+            elif request_method == "POST":
+                status_line, payload = "200 OK", '{"id": "created-%s"}' % content_id.split("+")[-1]
+            elif request_method == "DELETE":
+                status_line, payload = "204 No Content", ""
+            else:
+                status_line, payload = "200 OK", '{"id": "%s"}' % event_id
+            chunks.append(
+                "--batch_boundary\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status_line}\r\n"
+                "Content-Type: application/json\r\n\r\n"
+                f"{payload}\r\n"
+            )
+        content = "".join(chunks) + "--batch_boundary--\r\n"
+        response = httplib2.Response({"status": "200", "content-type": "multipart/mixed; boundary=batch_boundary"})
+        return response, content.encode()
+
+
+@pytest.fixture()
+def http() -> FakeBatchHttp:
+    return FakeBatchHttp()
+
+
+@pytest.fixture()
+def service(http: FakeBatchHttp):
+    client = build_from_document(load_calendar_discovery_document(), http=http)
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield GoogleCalendarService("host@example.com", service=client, executor=executor)
+    executor.shutdown()
+
+
+async def test_50개씩_나눠_보내고_결과를_이벤트_ID_로_찾는다(service: GoogleCalendarService, http: FakeBatchHttp):
+    event_ids = [f"event{index}" for index in range(120)] + ["missing1"]
+
+    async with service.batch() as batch:
+        for event_id in event_ids:
+            batch.delete_event(event_id)
+
+    assert sorted(http.batch_sizes) == [21, 50, 50]
+    assert set(batch.results) == set(event_ids)
+    assert all(batch.results[event_id].ok for event_id in event_ids[:-1])
+    assert batch.results["missing1"].error.resp.status == 404
+
+
+async def test_생성은_호출한_쪽이_준_키로_결과를_찾는다(service: GoogleCalendarService, http: FakeBatchHttp):
+    start = datetime(2024, 12, 3, 10, tzinfo=timezone.utc)
+
+    async with service.batch() as batch:
+        batch.create_event("booking-1", "첫 번째", start, start + timedelta(hours=1), event_id="booking1")
+        batch.update_event("event2", start, start + timedelta(hours=1), summary="두 번째")
+
+    assert http.batch_sizes == [2]
+    assert batch.results["booking-1"].response["id"].startswith("created-")
+    assert batch.results["event2"].response == {"id": "event2"}
+
+
+async def test_같은_키를_두_번_넣을_수_없다(service: GoogleCalendarService):
+    batch = service.batch()
+    batch.delete_event("event1")
+
+    with pytest.raises(ValueError):
+        batch.delete_event("event1")
+
+
+async def test_429_와_5xx_로_실패한_항목만_다시_보낸다(
+    service: GoogleCalendarService,
+    http: FakeBatchHttp,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(batch_module, "backoff_delay", lambda attempt: 0)
+
+    async with service.batch() as batch:
+        for event_id in ["event1", "flaky1", "missing1"]:
+            batch.delete_event(event_id)
+
+    assert http.event_ids == [["event1", "flaky1", "missing1"], ["flaky1"]]
+    assert batch.results["flaky1"].ok
+    assert batch.results["missing1"].error.resp.status == 404
+
+
+async def test_일정_ID_를_정하지_않은_생성_요청은_batch_에_넣을_수_없다(service: GoogleCalendarService):
+    start = datetime(2024, 12, 3, 10, tzinfo=timezone.utc)
+    batch = service.batch()
+
+    with pytest.raises(ValueError):
+        batch.add("booking-1", service.insert_event_request("상담", start, start + timedelta(hours=1)))
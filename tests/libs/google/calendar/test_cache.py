@@ -0,0 +1,147 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from appserver.libs.google.calendar.cache import EventListCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeEventSource:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self) -> list[dict]:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return [{"id": f"event-{self.calls}"}]
+
+
+KEY = ("host@example.com", 2024, 12)
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture()
+def cache(clock: FakeClock) -> EventListCache:
+    return EventListCache(ttl=10, stale_ttl=20, max_entries=2, clock=clock)
+
+
+async def test_TTL_안에서는_다시_조회하지_않는다(cache: EventListCache, clock: FakeClock):
+    fetch = FakeEventSource()
+
+    assert await cache.get_or_fetch(KEY, fetch) == [{"id": "event-1"}]
+    clock.now = 9
+    assert await cache.get_or_fetch(KEY, fetch) == [{"id": "event-1"}]
+    assert fetch.calls == 1
+
+
+async def test_TTL_이_지나면_기존_값을_돌려주고_백그라운드에서_새로_읽는다(cache: EventListCache, clock: FakeClock):
+    fetch = FakeEventSource()
+    await cache.get_or_fetch(KEY, fetch)
+
+    clock.now = 15
+    assert await cache.get_or_fetch(KEY, fetch) == [{"id": "event-1"}]
+    await asyncio.sleep(0.01)
+
+    assert fetch.calls == 2
+    assert await cache.get_or_fetch(KEY, fetch) == [{"id": "event-2"}]
+
+
+async def test_stale_기간도_지나면_새로_읽을_때까지_기다린다(cache: EventListCache, clock: FakeClock):
+    fetch = FakeEventSource()
+    await cache.get_or_fetch(KEY, fetch)
+
+    clock.now = 30
+    assert await cache.get_or_fetch(KEY, fetch) == [{"id": "event-2"}]
+
+
+async def test_같은_키를_동시에_요청하면_한_번만_읽는다(cache: EventListCache):
+    fetch = FakeEventSource()
+
+    results = await asyncio.gather(*[cache.get_or_fetch(KEY, fetch) for _ in range(5)])
+
+    assert fetch.calls == 1
+    assert all(result == [{"id": "event-1"}] for result in results)
+
+
+async def test_최대_개수를_넘으면_가장_오래_쓰지_않은_항목을_버린다(cache: EventListCache):
+    fetch = FakeEventSource()
+    december, january, february = KEY, ("host@example.com", 2025, 1), ("host@example.com", 2025, 2)
+
+    await cache.get_or_fetch(december, fetch)
+    await cache.get_or_fetch(january, fetch)
+    await cache.get_or_fetch(december, fetch)
+    await cache.get_or_fetch(february, fetch)
+
+    assert len(cache) == 2
+    calls = fetch.calls
+    await cache.get_or_fetch(december, fetch)
+    assert fetch.calls == calls
+    await cache.get_or_fetch(january, fetch)
+    assert fetch.calls == calls + 1
+
+
+async def test_예약이_바뀐_달만_무효화한다(cache: EventListCache):
+    fetch = FakeEventSource()
+    january = ("host@example.com", 2025, 1)
+    await cache.get_or_fetch(KEY, fetch)
+    await cache.get_or_fetch(january, fetch)
+
+    cache.invalidate_dates("host@example.com", date(2024, 12, 17))
+
+    await cache.get_or_fetch(january, fetch)
+    assert fetch.calls == 2
+    assert await cache.get_or_fetch(KEY, fetch) == [{"id": "event-3"}]
+
+
+async def test_조회_중에_무효화되면_그_결과는_저장하지_않는다(cache: EventListCache):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _slow_fetch():
+        started.set()
+        await release.wait()
+        return [{"id": "before-invalidate"}]
+
+    task = asyncio.create_task(cache.get_or_fetch(KEY, _slow_fetch))
+    await started.wait()
+    cache.invalidate("host@example.com")
+    release.set()
+
+    assert await task == [{"id": "before-invalidate"}]
+    assert len(cache) == 0
+
+
+async def test_무효화한_뒤에_온_요청은_그_전에_시작한_조회를_기다리지_않고_새로_읽는다(cache: EventListCache):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _slow_fetch():
+        started.set()
+        await release.wait()
+        return [{"id": "before-invalidate"}]
+
+    async def _fresh_fetch():
+        return [{"id": "after-invalidate"}]
+
+    task = asyncio.create_task(cache.get_or_fetch(KEY, _slow_fetch))
+    await started.wait()
+    cache.invalidate("host@example.com")
+
+    # 무효화 전에 시작한 조회를 함께 기다리면 release 전까지 끝나지 않는다.
+    assert await asyncio.wait_for(cache.get_or_fetch(KEY, _fresh_fetch), 1) == [{"id": "after-invalidate"}]
+
+    release.set()
+    assert await task == [{"id": "before-invalidate"}]
+    assert await cache.get_or_fetch(KEY, _slow_fetch) == [{"id": "after-invalidate"}]
@@ -0,0 +1,135 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from tests.support.fake_google_calendar import FakeGoogleCalendar
+from appserver.libs.google.calendar.resilience import GoogleCalendarUnavailableError
+from appserver.libs.google.calendar.services import (
+    GoogleCalendarService,
+    SyncTokenExpiredError,
+    build_calendar_client,
+)
+
+CALENDAR_ID = "host@example.com"
+
+
+@pytest.fixture()
+def service(fake_google_calendar_endpoint: str):
+    client = build_calendar_client(None, api_endpoint=fake_google_calendar_endpoint)
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield GoogleCalendarService(CALENDAR_ID, service=client, executor=executor, max_retries=0)
+    executor.shutdown()
+
+
+def _slot(hour: int) -> tuple[datetime, datetime]:
+    start = datetime(2024, 12, 3, hour, tzinfo=timezone.utc)
+    return start, start + timedelta(hours=1)
+
+
+async def test_실제_서비스로_일정을_만들고_조회하고_지운다(service: GoogleCalendarService):
+    event = await service.create_event("상담", *_slot(10), description="첫 상담")
+    assert event["summary"] == "상담"
+
+    fetched = await service.get_event(event["id"])
+    assert fetched["description"] == "첫 상담"
+
+    events = await service.event_list(
+        time_min=datetime(2024, 12, 1, tzinfo=timezone.utc),
+        time_max=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    assert [item["id"] for item in events] == [event["id"]]
+
+    assert await service.delete_event(event["id"])
+    assert (await service.get_event(event["id"]))["status"] == "cancelled"
+
+
+async def test_일정_목록은_페이지를_따라_읽고_필요한_필드만_받는다(service: GoogleCalendarService):
+    for hour in (10, 11, 12):
+        await service.execute(service.insert_event_request("상담", *_slot(hour), description="긴 설명"))
+    time_min = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    time_max = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    pages = [page async for page in service.event_list(time_min, time_max, page_size=2).pages()]
+    assert [len(page) for page in pages] == [2, 1]
+    assert set(pages[0][0]) == {"id", "status", "summary", "start", "end"}
+
+    events = await service.event_list(time_min, time_max, page_size=2, fields=None)
+    assert [event["description"] for event in events] == ["긴 설명"] * 3
+
+
+async def test_syncToken_으로_바뀐_일정만_받고_만료되면_알린다(
+    service: GoogleCalendarService,
+    fake_google_calendar: FakeGoogleCalendar,
+):
+    first = await service.create_event("첫 번째", *_slot(10))
+    page = await service.sync_events()
+    assert [item["id"] for item in page["items"]] == [first["id"]]
+
+    second = await service.create_event("두 번째", *_slot(11))
+    await service.delete_event(first["id"])
+    page = await service.sync_events(sync_token=page["nextSyncToken"])
+    assert {item["id"]: item["status"] for item in page["items"]} == {
+        first["id"]: "cancelled",
+        second["id"]: "confirmed",
+    }
+
+    fake_google_calendar.expire_sync_tokens()
+    with pytest.raises(SyncTokenExpiredError):
+        await service.sync_events(sync_token=page["nextSyncToken"])
+
+
+async def test_batch_요청을_항목별로_처리한다(service: GoogleCalendarService, fake_google_calendar: FakeGoogleCalendar):
+    existing = await service.create_event("기존", *_slot(9))
+
+    async with service.batch() as batch:
+        batch.create_event("new", "새 일정", *_slot(10), event_id="new1")
+        batch.update_event(existing["id"], *_slot(12), summary="옮김")
+        batch.delete_event("missing")
+
+    assert batch.results["new"].ok
+    assert batch.results[existing["id"]].response["summary"] == "옮김"
+    assert batch.results["missing"].error.resp.status == 404
+    assert len(fake_google_calendar.events[CALENDAR_ID]) == 2
+
+
+async def test_초당_한도를_넘으면_429_로_거절한다(service: GoogleCalendarService, fake_google_calendar: FakeGoogleCalendar):
+    fake_google_calendar.quota_per_second = 2
+    fake_google_calendar._tokens = 2
+
+    assert await service.create_event("하나", *_slot(10))
+    assert await service.create_event("둘", *_slot(11))
+    with pytest.raises(GoogleCalendarUnavailableError) as exc_info:
+        await service.execute(service.insert_event_request("셋", *_slot(12)))
+    assert exc_info.value.__cause__.resp.status == 429
+
+
+async def test_같은_ID_로_다시_만들면_409_로_거절한다(service: GoogleCalendarService):
+    await service.execute(service.insert_event_request("상담", *_slot(10), event_id="booking1"))
+
+    with pytest.raises(HttpError) as exc_info:
+        await service.execute(service.insert_event_request("상담", *_slot(10), event_id="booking1"))
+    assert exc_info.value.resp.status == 409
+
+
+async def test_감시_채널을_열면_바뀔_때마다_알린다():
+    notifications = []
+
+    async def notify(channel, state, message_number):
+        notifications.append((channel["id"], state, message_number))
+
+    fake_calendar = FakeGoogleCalendar(notify=notify)
+    channel = fake_calendar.watch(CALENDAR_ID, {"id": "channel-1", "address": "https://example.com/hook"})
+    fake_calendar.insert_event(CALENDAR_ID, {"summary": "상담", **_event_times(10)})
+    await asyncio.sleep(0)
+
+    assert channel["resourceId"]
+    assert notifications == [("channel-1", "sync", 1), ("channel-1", "exists", 2)]
+
+
+def _event_times(hour: int) -> dict:
+    start, end = _slot(hour)
+    return {"start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}}
+
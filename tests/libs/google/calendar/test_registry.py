@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from appserver.libs.google.calendar import registry as registry_module
+from appserver.libs.google.calendar.registry import GoogleCalendarServiceRegistry
+
+
+@pytest.fixture()
+def credentials_path(tmp_path: Path) -> Path:
+    """네트워크 없이 discovery 클라이언트를 만들 수 있는 가짜 서비스 계정 인증 파일"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path = tmp_path / "service-account.json"
+    path.write_text(json.dumps({
+        "type": "service_account",
+        "project_id": "test",
+        "private_key_id": "test",
+        "private_key": private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(),
+        "client_email": "booking@test.iam.gserviceaccount.com",
+        "client_id": "1",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }))
+    return path
+
+
+def test_discovery_클라이언트는_한_번만_만들고_캘린더마다_서비스를_재사용한다(
+    monkeypatch: pytest.MonkeyPatch,
+    credentials_path: Path,
+):
+    calls = []
+    build_calendar_client = registry_module.build_calendar_client
+
+    def _build(*args, **kwargs):
+        calls.append(args)
+        return build_calendar_client(*args, **kwargs)
+
+    monkeypatch.setattr(registry_module, "build_calendar_client", _build)
+    services = GoogleCalendarServiceRegistry(credentials_path, default_google_calendar_id="host@example.com")
+
+    service = services.get()
+    assert services.get("host@example.com") is service
+    assert services.get("other@example.com").service is service.service
+    assert service.default_google_calendar_id == "host@example.com"
+    assert len(calls) == 1
+
+    services.close()
+    services.get()
+    assert len(calls) == 2
+
+
+def test_인증_파일이_없으면_미리_만들지_않는다(tmp_path: Path):
+    services = GoogleCalendarServiceRegistry(tmp_path / "missing.json", default_google_calendar_id="host@example.com")
+
+    assert services.warm_up() is False
+    with pytest.raises(FileNotFoundError):
+        services.get()
+
+
+def test_캘린더_ID_가_없으면_오류를_일으킨다(credentials_path: Path):
+    services = GoogleCalendarServiceRegistry(credentials_path)
+
+    with pytest.raises(ValueError):
+        services.get()
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from appserver.libs.google.calendar import services
+from appserver.libs.google.calendar.resilience import CircuitBreaker, CircuitOpenError, GoogleCalendarUnavailableError
+from appserver.libs.google.calendar.services import GoogleCalendarService
+
+
+class SlowRequest:
+    def __init__(self, threads: list[str]):
+        self.threads = threads
+
+    def execute(self, http=None):
+        time.sleep(0.2)
+        self.threads.append(threading.current_thread().name)
+        return {"items": []}
+
+
+class SlowCalendarClient:
+    def __init__(self):
+        self.threads: list[str] = []
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        return SlowRequest(self.threads)
+
+
+async def test_구글_API_호출은_스레드_풀에서_실행해서_이벤트_루프를_막지_않는다():
+    client = SlowCalendarClient()
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="google-calendar")
+    service = GoogleCalendarService("host@example.com", service=client, executor=executor)
+    now = datetime.now(timezone.utc)
+
+    ticks = 0
+
+    async def _tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(_tick())
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(service.event_list(now, now), service.event_list(now, now))
+    finally:
+        ticker.cancel()
+        executor.shutdown()
+    elapsed = time.perf_counter() - started
+
+    assert results == [[], []]
+    assert ticks >= 5
+    assert elapsed < 0.35
+    assert all(name.startswith("google-calendar") for name in client.threads)
+
+
+class PagedCalendarClient:
+    def __init__(self, pages: int):
+        self.pages = pages
+        self.calls: list[dict] = []
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        self.calls.append(kwargs)
+        index = int(kwargs.get("pageToken", "0"))
+        result = {"items": [{"id": f"event-{index}"}]}
+        if index + 1 < self.pages:
+            result["nextPageToken"] = str(index + 1)
+        return FakeRequest(result)
+
+
+class FakeRequest:
+    def __init__(self, result: dict):
+        self.result = result
+
+    def execute(self, http=None):
+        return self.result
+
+
+async def test_일정_목록은_필요한_만큼만_다음_페이지를_읽는다():
+    client = PagedCalendarClient(pages=3)
+    service = GoogleCalendarService("host@example.com", service=client)
+    now = datetime.now(timezone.utc)
+
+    async for event in service.event_list(now, now):
+        break
+    assert event == {"id": "event-0"}
+    assert len(client.calls) == 1
+    assert client.calls[0]["fields"] == "nextPageToken,items(id,status,summary,start,end)"
+
+    assert [event["id"] for event in await service.event_list(now, now)] == ["event-0", "event-1", "event-2"]
+    assert [call.get("pageToken") for call in client.calls[1:]] == [None, "1", "2"]
+
+
+class FlakyRequest:
+    def __init__(self, outcomes: list):
+        self.outcomes = outcomes
+        self.calls = 0
+
+    def execute(self, http=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, float):
+            time.sleep(outcome)
+            return {}
+        return outcome
+
+
+def http_error(status_code: int) -> HttpError:
+    return HttpError(httplib2.Response({"status": status_code}), b"{}")
+
+
+@pytest.fixture()
+def no_backoff(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(services, "backoff_delay", lambda attempt: 0)
+
+
+@pytest.mark.usefixtures("no_backoff")
+async def test_429_와_5xx_는_다시_시도하고_그_밖의_오류는_바로_올린다():
+    service = GoogleCalendarService("host@example.com", service=object(), max_retries=2)
+
+    request = FlakyRequest([http_error(503), http_error(429), {"id": "event1"}])
+    assert await service.execute(request) == {"id": "event1"}
+    assert request.calls == 3
+
+    request = FlakyRequest([http_error(404)])
+    with pytest.raises(HttpError):
+        await service.execute(request)
+    assert request.calls == 1
+
+
+@pytest.mark.usefixtures("no_backoff")
+async def test_제한_시간을_넘기면_포기하고_연속으로_실패하면_회로를_열어_바로_실패한다():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    service = GoogleCalendarService(
+        "host@example.com",
+        service=object(),
+        timeout=0.05,
+        max_retries=0,
+        circuit_breaker=breaker,
+    )
+
+    for _ in range(2):
+        with pytest.raises(GoogleCalendarUnavailableError):
+            await service.execute(FlakyRequest([0.2]))
+    assert breaker.is_open
+
+    request = FlakyRequest([{}])
+    with pytest.raises(CircuitOpenError):
+        await service.execute(request)
+    assert request.calls == 0
+
+
+@pytest.mark.usefixtures("no_backoff")
+async def test_연결_오류도_다시_시도하고_계속_실패하면_회로를_연다():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    service = GoogleCalendarService("host@example.com", service=object(), max_retries=2, circuit_breaker=breaker)
+
+    request = FlakyRequest([ConnectionRefusedError(), httplib2.ServerNotFoundError("dns"), {"id": "event1"}])
+    assert await service.execute(request) == {"id": "event1"}
+    assert request.calls == 3
+
+    request = FlakyRequest([ConnectionResetError()] * 3)
+    with pytest.raises(GoogleCalendarUnavailableError) as exc_info:
+        await service.execute(request)
+    assert isinstance(exc_info.value.__cause__, ConnectionResetError)
+    assert breaker.is_open
+
+
+@pytest.mark.usefixtures("no_backoff")
+async def test_시험_호출이_연결_오류나_예상하지_못한_오류로_끝나도_다음에_다시_시험한다():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+    service = GoogleCalendarService("host@example.com", service=object(), max_retries=0, circuit_breaker=breaker)
+    breaker.record_failure()
+
+    for error in [ConnectionError("down"), RuntimeError("bug")]:
+        now[0] += 31
+        assert breaker.state == "half_open"
+        with pytest.raises((GoogleCalendarUnavailableError, RuntimeError)):
+            await service.execute(FlakyRequest([error]))
+        assert breaker.is_open
+
+    now[0] += 31
+    assert await service.execute(FlakyRequest([{"id": "event1"}])) == {"id": "event1"}
+    assert breaker.state == "closed"
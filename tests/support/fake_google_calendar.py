@@ -0,0 +1,402 @@
+"""오프라인 테스트와 벤치마크용 Google Calendar v3 대역 서버.
+
+일정 insert/list/get/update/patch/delete, syncToken 증분 목록, batch, events.watch/channels.stop 을
+메모리에서 흉내 낸다. 응답 지연, 오류 비율, 초당 호출 한도(quota)를 정할 수 있다.
+
+    python -m tests.support.fake_google_calendar --port 8089 --latency 0.05
+    GOOGLE_CALENDAR_API_ENDPOINT=http://127.0.0.1:8089/ uvicorn appserver.app:app
+"""
+import argparse
+import asyncio
+import email.parser
+import email.policy
+import json
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import httpx
+from fastapi import FastAPI, Request, Response
+
+DEFAULT_PAGE_SIZE = 250
+MAX_PAGE_SIZE = 2500
+
+Notifier = Callable[[dict, str, int], Awaitable[None]]
+
+logger = logging.getLogger(__name__)
+
+
+class FakeCalendarError(Exception):
+    def __init__(self, status_code: int, reason: str, message: str | None = None):
+        super().__init__(message or reason)
+        self.status_code = status_code
+        self.reason = reason
+
+    def body(self) -> dict:
+        return {
+            "error": {
+                "code": self.status_code,
+                "message": str(self),
+                "errors": [{"domain": "global", "reason": self.reason, "message": str(self)}],
+            }
+        }
+
+
+def _event_start(event: dict) -> datetime:
+    return _parse_time(event.get("start", {}))
+
+
+def _event_end(event: dict) -> datetime:
+    return _parse_time(event.get("end", {}))
+
+
+def _parse_time(value: dict) -> datetime:
+    """
+    >>> _parse_time({"date": "2024-12-03"})
+    datetime.datetime(2024, 12, 3, 0, 0, tzinfo=datetime.timezone.utc)
+    >>> _parse_time({"dateTime": "2024-12-03T10:00:00+09:00"})
+    datetime.datetime(2024, 12, 3, 1, 0, tzinfo=datetime.timezone.utc)
+    """
+    if value.get("date"):
+        return datetime.fromisoformat(value["date"]).replace(tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(value["dateTime"])
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_fields(fields: str) -> dict:
+    """partial response 마스크를 필드 트리로 바꾼다. `a/b` 경로 표기는 지원하지 않는다.
+
+    >>> parse_fields("nextPageToken,items(id,start,end)")
+    {'nextPageToken': {}, 'items': {'id': {}, 'start': {}, 'end': {}}}
+    """
+    tree: dict = {}
+    stack = [tree]
+    name = ""
+    for char in fields + ",":
+        if char in ",()":
+            if name.strip():
+                stack[-1][name.strip()] = {}
+            if char == "(":
+                stack.append(stack[-1][name.strip()])
+            elif char == ")":
+                stack.pop()
+            name = ""
+        else:
+            name += char
+    return tree
+
+
+def select_fields(value: Any, tree: dict) -> Any:
+    """
+    >>> select_fields({"items": [{"id": "a", "attendees": []}], "etag": "1"}, parse_fields("items(id)"))
+    {'items': [{'id': 'a'}]}
+    """
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [select_fields(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: select_fields(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
+
+
+async def post_notification(channel: dict, state: str, message_number: int) -> None:
+    headers = {
+        "X-Goog-Channel-ID": channel["id"],
+        "X-Goog-Channel-Token": channel.get("token") or "",
+        "X-Goog-Resource-ID": channel["resourceId"],
+        "X-Goog-Resource-State": state,
+        "X-Goog-Message-Number": str(message_number),
+    }
+    async with httpx.AsyncClient(timeout=5) as client:
+        await client.post(channel["address"], headers=headers)
+
+
+class FakeGoogleCalendar:
+    """메모리에 일정을 보관하는 Calendar v3 대역.
+
+    - `latency`: HTTP 요청마다 기다리는 시간(초)
+    - `error_rate`: 작업마다 503(backendError)으로 실패할 확률
+    - `quota_per_second`: 초당 처리할 작업 수. 넘으면 429(rateLimitExceeded)
+    - `notify`: 감시 중인 캘린더가 바뀌면 호출한다. None 이면 알림을 보내지 않는다.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        quota_per_second: float | None = None,
+        seed: int | None = None,
+        notify: Notifier | None = post_notification,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.quota_per_second = quota_per_second
+        self.notify = notify
+        self.clock = clock
+        self.random = random.Random(seed)
+        self.events: dict[str, dict[str, dict]] = {}
+        self.channels: dict[str, dict] = {}
+        self.request_count = 0
+        self._sequence = 0
+        self._sequences: dict[tuple[str, str], int] = {}
+        # 만료시키면 올린다. 이전 세대의 syncToken 은 받지 않는다.
+        self._sync_generation = 0
+        self._tokens = quota_per_second or 0.0
+        self._refilled_at = clock()
+        self._message_numbers: dict[str, int] = {}
+        self._notifications: set[asyncio.Task] = set()
+
+    def expire_sync_tokens(self) -> None:
+        """지금까지 발급한 syncToken 을 모두 만료시킨다. 다음 증분 목록은 410 이 된다."""
+        self._sync_generation += 1
+
+    def app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+        async def _handle(path: str, request: Request) -> Response:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            body = await request.body()
+            if path.startswith("batch/"):
+                content, content_type = await self.handle_batch(request.headers.get("content-type", ""), body)
+                return Response(content, media_type=content_type)
+            status_code, payload = await self.handle(request.method, request.url.path, dict(request.query_params), body)
+            return _json_response(status_code, payload)
+
+        return app
+
+    def _check_limits(self) -> None:
+        self.request_count += 1
+        if self.quota_per_second:
+            now = self.clock()
+            self._tokens = min(
+                self.quota_per_second,
+                self._tokens + (now - self._refilled_at) * self.quota_per_second,
+            )
+            self._refilled_at = now
+            if self._tokens < 1:
+                raise FakeCalendarError(429, "rateLimitExceeded", "Rate Limit Exceeded")
+            self._tokens -= 1
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise FakeCalendarError(503, "backendError", "Backend Error")
+
+    async def handle(self, method: str, path: str, query: dict[str, str], body: bytes) -> tuple[int, dict | None]:
+        try:
+            self._check_limits()
+            status_code, payload = await self._route(
+                method, [unquote(part) for part in path.strip("/").split("/")], query, body
+            )
+        except FakeCalendarError as error:
+            return error.status_code, error.body()
+        if payload is not None and query.get("fields"):
+            payload = select_fields(payload, parse_fields(query["fields"]))
+        return status_code, payload
+
+    async def _route(self, method: str, parts: list[str], query: dict[str, str], body: bytes) -> tuple[int, dict | None]:
+        payload = json.loads(body) if body else {}
+        match parts:
+            case ["calendar", "v3", "calendars", calendar_id, "events"] if method == "GET":
+                return 200, self.list_events(calendar_id, query)
+            case ["calendar", "v3", "calendars", calendar_id, "events"] if method == "POST":
+                return 200, self.insert_event(calendar_id, payload)
+            case ["calendar", "v3", "calendars", calendar_id, "events", "watch"] if method == "POST":
+                return 200, self.watch(calendar_id, payload)
+            case ["calendar", "v3", "calendars", calendar_id, "events", event_id] if method == "GET":
+                return 200, self._get(calendar_id, event_id)
+            case ["calendar", "v3", "calendars", calendar_id, "events", event_id] if method in ("PUT", "PATCH"):
+                return 200, self.update_event(calendar_id, event_id, payload, replace=method == "PUT")
+            case ["calendar", "v3", "calendars", calendar_id, "events", event_id] if method == "DELETE":
+                self.delete_event(calendar_id, event_id)
+                return 204, None
+            case ["calendar", "v3", "channels", "stop"] if method == "POST":
+                if self.channels.pop(payload.get("id"), None) is None:
+                    raise FakeCalendarError(404, "notFound", "Channel not found")
+                return 204, None
+        raise FakeCalendarError(404, "notFound", "Not Found")
+
+    def _get(self, calendar_id: str, event_id: str) -> dict:
+        event = self.events.get(calendar_id, {}).get(event_id)
+        if event is None:
+            raise FakeCalendarError(404, "notFound", "Not Found")
+        return event
+
+    def _touch(self, calendar_id: str, event: dict) -> None:
+        self._sequence += 1
+        self._sequences[(calendar_id, event["id"])] = self._sequence
+        event["updated"] = datetime.now(timezone.utc).isoformat()
+        event["etag"] = f'"{self._sequence}"'
+        self._notify(calendar_id)
+
+    def insert_event(self, calendar_id: str, body: dict) -> dict:
+        events = self.events.setdefault(calendar_id, {})
+        event_id = body.get("id") or uuid.uuid4().hex
+        if event_id in events:
+            raise FakeCalendarError(409, "duplicate", "The requested identifier already exists.")
+        event = {
+            **body,
+            "kind": "calendar#event",
+            "id": event_id,
+            "status": "confirmed",
+            "htmlLink": f"https://calendar.example.com/event?eid={event_id}",
+            "created": datetime.now(timezone.utc).isoformat(),
+        }
+        events[event_id] = event
+        self._touch(calendar_id, event)
+        return event
+
+    def update_event(self, calendar_id: str, event_id: str, body: dict, replace: bool = True) -> dict:
+        event = self._get(calendar_id, event_id)
+        kept = {key: event[key] for key in ("kind", "id", "htmlLink", "created", "status")}
+        event = {**body, **kept} if replace else {**event, **body, **kept}
+        self.events[calendar_id][event_id] = event
+        self._touch(calendar_id, event)
+        return event
+
+    def delete_event(self, calendar_id: str, event_id: str) -> None:
+        event = self._get(calendar_id, event_id)
+        if event["status"] == "cancelled":
+            raise FakeCalendarError(410, "deleted", "Resource has been deleted")
+        event["status"] = "cancelled"
+        self._touch(calendar_id, event)
+
+    def list_events(self, calendar_id: str, query: dict[str, str]) -> dict:
+        events = list(self.events.get(calendar_id, {}).values())
+        sync_token = query.get("syncToken")
+        if sync_token:
+            generation, _, since = sync_token.partition("-")
+            if generation != str(self._sync_generation):
+                raise FakeCalendarError(410, "fullSyncRequired", "Sync token is no longer valid, a full sync is required.")
+            events = [event for event in events if self._sequences[(calendar_id, event["id"])] > int(since)]
+        else:
+            if query.get("showDeleted") != "true":
+                events = [event for event in events if event["status"] != "cancelled"]
+            if query.get("timeMin"):
+                time_min = datetime.fromisoformat(query["timeMin"])
+                events = [event for event in events if _event_end(event) > time_min]
+            if query.get("timeMax"):
+                time_max = datetime.fromisoformat(query["timeMax"])
+                events = [event for event in events if _event_start(event) < time_max]
+
+        if query.get("orderBy") == "startTime":
+            events.sort(key=_event_start)
+        else:
+            events.sort(key=lambda event: self._sequences[(calendar_id, event["id"])])
+
+        page_size = min(int(query.get("maxResults", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        offset = int(query.get("pageToken", "0"))
+        page = {"kind": "calendar#events", "items": events[offset:offset + page_size]}
+        if offset + page_size < len(events):
+            page["nextPageToken"] = str(offset + page_size)
+        else:
+            page["nextSyncToken"] = f"{self._sync_generation}-{self._sequence}"
+        return page
+
+    def watch(self, calendar_id: str, body: dict) -> dict:
+        ttl = int(body.get("params", {}).get("ttl", 7 * 24 * 60 * 60))
+        expiration = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        channel = {
+            "kind": "api#channel",
+            "id": body["id"],
+            "resourceId": f"resource-{uuid.uuid4().hex}",
+            "resourceUri": f"calendar/v3/calendars/{calendar_id}/events",
+            "token": body.get("token"),
+            "expiration": str(int(expiration.timestamp() * 1000)),
+            "address": body["address"],
+            "calendar_id": calendar_id,
+        }
+        self.channels[channel["id"]] = channel
+        self._send(channel, "sync")
+        return {key: value for key, value in channel.items() if key not in ("address", "calendar_id")}
+
+    def _notify(self, calendar_id: str) -> None:
+        for channel in self.channels.values():
+            if channel["calendar_id"] == calendar_id:
+                self._send(channel, "exists")
+
+    def _send(self, channel: dict, state: str) -> None:
+        if self.notify is None:
+            return
+        message_number = self._message_numbers.get(channel["id"], 0) + 1
+        self._message_numbers[channel["id"]] = message_number
+
+        async def _deliver():
+            try:
+                await self.notify(channel, state, message_number)
+            except Exception:
+                logger.exception("fake google calendar notification failed: %s", channel["id"])
+
+        task = asyncio.get_running_loop().create_task(_deliver())
+        self._notifications.add(task)
+        task.add_done_callback(self._notifications.discard)
+
+    async def handle_batch(self, content_type: str, body: bytes) -> tuple[bytes, str]:
+        """multipart/mixed batch 요청의 항목을 차례로 처리하고 같은 형식으로 응답한다."""
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        boundary = f"batch_{uuid.uuid4().hex}"
+        chunks = []
+        for part in message.iter_parts():
+            content_id = part["Content-ID"].strip("<>")
+            raw = part.get_payload(decode=True) or part.get_content().encode()
+            head, _, item_body = raw.replace(b"\r\n", b"\n").partition(b"\n\n")
+            request_line = head.split(b"\n", 1)[0].decode()
+            method, target, _ = request_line.split(" ", 2)
+            url = urlsplit(target)
+            status_code, payload = await self.handle(method, url.path, dict(parse_qsl(url.query)), item_body.strip())
+            chunks.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status_code} {_reason(status_code)}\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(payload) if payload is not None else ''}\r\n"
+            )
+        content = "".join(chunks) + f"--{boundary}--\r\n"
+        return content.encode(), f"multipart/mixed; boundary={boundary}"
+
+
+def _reason(status_code: int) -> str:
+    return {200: "OK", 204: "No Content", 404: "Not Found", 409: "Conflict", 410: "Gone",
+            429: "Too Many Requests", 503: "Service Unavailable"}.get(status_code, "")
+
+
+def _json_response(status_code: int, payload: dict | None) -> Response:
+    if payload is None:
+        return Response(status_code=status_code)
+    return Response(json.dumps(payload), status_code=status_code, media_type="application/json")
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청마다 기다리는 시간(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 으로 실패할 확률(0~1)")
+    parser.add_argument("--quota", type=float, default=None, help="초당 처리할 작업 수")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    calendar = FakeGoogleCalendar(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        quota_per_second=args.quota,
+        seed=args.seed,
+    )
+    uvicorn.run(calendar.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()